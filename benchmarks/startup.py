@@ -0,0 +1,96 @@
+# Benchmark of the cold start of main.py: wall time from launching the interpreter to the first paint
+# Also breaks the import time down per module with python -X importtime
+# The launched interpreters run this module with --probe, which starts the app like main.py and quits on the first paint
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TARGET = 0.5  # seconds to first paint
+
+
+def probe() -> int:
+    """Start the app like main.py, print "first_paint <epoch seconds>" on its first paint and quit"""
+    sys.path.insert(0, ROOT)
+    import main
+    app, window = main.create_window(sys.argv[:1])
+    window.first_painted.connect(lambda: (print(f"first_paint {time.time():.6f}", flush=True), app.quit()))
+    window.show()
+    return app.exec()
+
+
+def launch(extra_args=(), env=None) -> subprocess.CompletedProcess:
+    """Run probe() in a fresh interpreter"""
+    env = {**os.environ, **(env or {})}
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    return subprocess.run([sys.executable, *extra_args, "-m", "benchmarks.startup", "--probe"], capture_output=True,
+                          text=True, env=env, cwd=ROOT, timeout=60)
+
+
+def time_to_first_paint() -> float:
+    """Seconds from starting a new interpreter on main.py to its first paint"""
+    start = time.time()
+    proc = launch()
+    for line in proc.stdout.splitlines():
+        if line.startswith("first_paint "):
+            return float(line.split()[1]) - start
+    raise RuntimeError(f"main.py did not report its first paint:\n{proc.stderr}")
+
+
+def import_breakdown() -> list[tuple[str, int, int]]:
+    """(module, self us, cumulative us) of every import made by main.py, in import order"""
+    proc = launch(("-X", "importtime"))
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def group_of(module:str) -> str:
+    top = module.split(".")[0]
+    if top in ("PySide6", "shiboken6", "shibokensupport"):
+        return "Qt (PySide6, shiboken6)"
+    if top in ("ui", "widget_containers", "simulation"):
+        return top
+    if top in ("main", "benchmarks"):
+        return "entry point and probe"
+    return "standard library and others"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cold start time of main.py to the first paint")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to time")
+    parser.add_argument("--target", type=float, default=TARGET, help="seconds the median must stay under")
+    parser.add_argument("--top", type=int, default=15, help="slowest modules to list")
+    parser.add_argument("--probe", action="store_true", help=argparse.SUPPRESS)  # inside a launched interpreter
+    args = parser.parse_args(argv)
+    if args.probe:
+        return probe()
+
+    rows = import_breakdown()
+    groups = {}
+    for name, self_us, _ in rows:
+        groups[group_of(name)] = groups.get(group_of(name), 0) + self_us
+    print(f"imports: {sum(groups.values()) / 1000:.1f} ms")
+    for group, us in sorted(groups.items(), key=lambda item: -item[1]):
+        print(f"  {group:30} {us / 1000:7.1f} ms")
+    print(f"slowest modules (self time):")
+    for name, self_us, cumulative_us in sorted(rows, key=lambda row: -row[1])[:args.top]:
+        print(f"  {name:50} {self_us / 1000:7.1f} ms  (with imports {cumulative_us / 1000:.1f} ms)")
+
+    times = [time_to_first_paint() for _ in range(args.runs)]
+    median = statistics.median(times)
+    print(f"first paint: median {median * 1000:.0f} ms, best {min(times) * 1000:.0f} ms over {args.runs} runs"
+          f" (target {args.target * 1000:.0f} ms)")
+    return 0 if median <= args.target else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+# Benchmark of restyling every sender-receiver pair, as the panel does on each ACK
+# Compares rebuilding stylesheet strings (the old approach) with the precompiled per-state styles
+
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6 import QtWidgets as qtw
+
+from widget_containers.SenderReciever import (SenderReciever, PairStates, SenderState, RecieverState,
+                                              SENDER_COLORS, RECIEVER_COLORS, apply_state)
+
+
+def legacy_style(name:str, color:str) -> str:
+    """Stylesheet string the rows used to rebuild and set on every state change"""
+    return (u"QPushButton#" + name + " {\n"
+"    background-color: " + color + ";\n"
+"    border-style: outset;\n"
+"    border-width: 2px;\n"
+"    border-radius: 10px;\n"
+"    border-color: beige;\n"
+"    font: bold 14px;\n"
+"    min-width: 10em;\n"
+"    padding: 6px;\n"
+"}\n")
+
+
+def restyle_legacy(rows:list, sender:SenderState, reciever:RecieverState):
+    for row in rows:
+        row.pb_sender.setStyleSheet(legacy_style("pb_sender", SENDER_COLORS[sender]))
+        row.pb_reciever.setStyleSheet(legacy_style("pb_reciever", RECIEVER_COLORS[reciever]))
+
+
+def restyle_states(rows:list, sender:SenderState, reciever:RecieverState):
+    for row in rows:
+        apply_state(row.pb_sender, sender)
+        apply_state(row.pb_reciever, reciever)
+
+
+def time_acks(app, container, rows, restyle, toggle:bool) -> float:
+    """Average ms per ACK to restyle the acknowledged rows and let Qt repaint
+
+    Args:
+        toggle: worst case, every ACK flips all rows between two states. Otherwise
+            ACK k acknowledges row k and every row up to k is set to done again,
+            as SenderRecieverPanel.on_ACK_arrived does
+    """
+    app.processEvents()
+    acks = len(rows)
+    start = time.perf_counter()
+    for ack in range(acks):
+        if toggle:
+            state = (SenderState.DONE, RecieverState.DONE) if ack % 2 else (SenderState.READY, RecieverState.ACKED)
+            restyle(rows, *state)
+        else:
+            restyle(rows[:ack + 1], SenderState.DONE, RecieverState.DONE)
+        app.processEvents()
+    return (time.perf_counter() - start) * 1000 / acks
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-ACK restyle cost of the sender-receiver rows")
+    parser.add_argument("--rows", type=int, default=200, help="pairs in the run, one ACK per pair")
+    args = parser.parse_args(argv)
+
+    app = qtw.QApplication.instance() or qtw.QApplication(sys.argv)
+
+    def build():
+        """A shown container of freshly bound rows, one per method so styles never mix"""
+        container = qtw.QWidget()
+        layout = qtw.QVBoxLayout(container)
+        rows = []
+        states = PairStates(args.rows)
+        for i in range(args.rows):
+            row = SenderReciever()
+            row.bind(i + 1, states)
+            layout.addWidget(row)
+            rows.append(row)
+        container.show()
+        return container, rows
+
+    print(f"{args.rows} pairs, ms per ACK")
+    for label, toggle in (("cumulative ACKs", False), ("every row changes", True)):
+        legacy = time_acks(app, *build(), restyle_legacy, toggle)
+        states = time_acks(app, *build(), restyle_states, toggle)
+        print(f"  {label:18}  stylesheet strings {legacy:8.3f}  precompiled states {states:8.3f}  ({legacy / states:.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+# Benchmark suite of the engine and GUI hot paths on the offscreen Qt platform
+# Every run is appended to a JSON Lines history and compared with earlier runs to catch regressions
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import PySide6
+from PySide6 import QtCore as qtc
+from PySide6 import QtWidgets as qtw
+
+from simulation.MultiFlow import MultiFlowSimulator
+from simulation.SimConfig import SimConfig
+from simulation.Simulator import Simulator
+from widget_containers.SenderRecieverPanel import SenderRecieverPanel
+
+HISTORY = os.path.join(os.path.dirname(__file__), "history.jsonl")
+BENCHMARKS = {} # name -> (function, unit, lower_is_better), in registration order
+
+
+def benchmark(name:str, unit:str, lower_is_better:bool = True):
+    """Register a benchmark, called as function(app, scale) and returning one measurement in `unit`"""
+    def register(function):
+        BENCHMARKS[name] = (function, unit, lower_is_better)
+        return function
+    return register
+
+
+def make_panel(app, num_packets:int, window_size:int = 10) -> SenderRecieverPanel:
+    """A shown panel with `num_packets` pairs and a frozen clock, so nothing runs behind the benchmark"""
+    panel = SenderRecieverPanel()
+    panel.resize(900, 600)
+    panel.changeSliders(20, 50, 0, window_size, num_packets)
+    panel.setPackets()
+    panel.show()
+    panel.clock.set_speed(0)
+    app.processEvents()
+    return panel
+
+
+@benchmark("set_packets", "ms")
+def bench_set_packets(app, scale:float) -> float:
+    """Building the pairs of a large K from an empty panel"""
+    panel = make_panel(app, 1)
+    panel.changeSliders(20, 50, 0, 10, int(200000 * scale))
+    start = time.perf_counter()
+    panel.setPackets()
+    app.processEvents()
+    elapsed = (time.perf_counter() - start) * 1000
+    panel.deleteLater()
+    return elapsed
+
+
+@benchmark("draw_window", "us")
+def bench_draw_window(app, scale:float) -> float:
+    """Placing the sliding window overlay, per call"""
+    panel = make_panel(app, 1000)
+    calls = int(20000 * scale)
+    start = time.perf_counter()
+    for i in range(calls):
+        panel.draw_window(i % 990)
+    elapsed = (time.perf_counter() - start) * 1e6 / calls
+    panel.deleteLater()
+    return elapsed
+
+
+@benchmark("ack_arrived", "us")
+def bench_ack_arrived(app, scale:float) -> float:
+    """on_ACK_arrived for consecutive cumulative ACKs, including the restyling of acknowledged pairs"""
+    num_packets = int(2000 * scale)
+    panel = make_panel(app, num_packets)
+    panel.start_run(seed=1)
+    start = time.perf_counter()
+    for ack in range(1, num_packets + 1):
+        panel.on_ACK_arrived(ack, ack)
+    app.processEvents()
+    elapsed = (time.perf_counter() - start) * 1e6 / num_packets
+    panel.deleteLater()
+    return elapsed
+
+
+@benchmark("packet_spawn", "us")
+def bench_packet_spawn(app, scale:float) -> float:
+    """Launching a packet on the overlay, per packet"""
+    panel = make_panel(app, 100)
+    count = int(5000 * scale)
+    start = time.perf_counter()
+    for i in range(count):
+        panel.packets.spawn(f"Packet#{i + 1}", qtc.QPoint(10, i % 500), qtc.QPoint(700, i % 500), 2000)
+    elapsed = (time.perf_counter() - start) * 1e6 / count
+    panel.clear_active_packets()
+    panel.deleteLater()
+    return elapsed
+
+
+@benchmark("packet_frame", "ms")
+def bench_packet_frame(app, scale:float) -> float:
+    """One animation frame (move and repaint) with 2000 packets in flight"""
+    panel = make_panel(app, 100)
+    view = panel.packets
+    for i in range(2000):
+        view.spawn(f"Packet#{i + 1}", qtc.QPoint(10, i % 500), qtc.QPoint(700, i % 500), 1e9)
+    panel.clock.set_speed(1.0)
+    frames = int(200 * scale)
+    start = time.perf_counter()
+    for _ in range(frames):
+        view.advance()
+        view.viewport().repaint()
+    elapsed = (time.perf_counter() - start) * 1000 / frames
+    panel.clear_active_packets()
+    panel.deleteLater()
+    return elapsed
+
+
+@benchmark("headless_events", "events/s", lower_is_better=False)
+def bench_headless(app, scale:float) -> float:
+    """Events per second of a Simulator run with 10% loss"""
+    simulator = Simulator(SimConfig(num_packets=int(50000 * scale), window_size=7, per_pkt_loss=10), seed=1)
+    start = time.perf_counter()
+    result = simulator.run()
+    return result.events / (time.perf_counter() - start)
+
+
+@benchmark("multi_flow", "s")
+def bench_multi_flow(app, scale:float) -> float:
+    """Seconds to run 10,000 flows of 10 packets sharing a 100 MB/s link with 2% loss"""
+    config = SimConfig(num_packets=10, window_size=4, per_pkt_loss=2, prop_delay=0.05, re_timer=0.5,
+                       bandwidth=1e8, queue_limit=200)
+    simulator = MultiFlowSimulator(config, int(10000 * scale), seed=1, start_spread=1.0)
+    start = time.perf_counter()
+    simulator.run()
+    return time.perf_counter() - start
+
+
+def load_history(path:str) -> list[dict]:
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(__file__), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def regressions(results:dict, history:list[dict], scale:float, threshold:float, baseline_runs:int) -> list[str]:
+    """Benchmarks slower than the median of their last `baseline_runs` recorded values by more than `threshold`"""
+    failed = []
+    for name, value in results.items():
+        _, unit, lower_is_better = BENCHMARKS[name]
+        previous = [entry["results"][name] for entry in history
+                    if entry.get("scale") == scale and name in entry.get("results", {})][-baseline_runs:]
+        if not previous:
+            continue
+        baseline = statistics.median(previous)
+        change = (value - baseline) / baseline if lower_is_better else (baseline - value) / baseline
+        if change > threshold:
+            failed.append(f"{name}: {value:.4g} {unit} against a baseline of {baseline:.4g} {unit} ({change:+.0%} slower)")
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the engine and GUI hot paths and check them for regressions")
+    parser.add_argument("names", nargs="*", help=f"benchmarks to run, all by default ({', '.join(BENCHMARKS)})")
+    parser.add_argument("--history", default=HISTORY, help="JSON Lines file the results are appended to")
+    parser.add_argument("--threshold", type=float, default=0.25, help="relative slowdown that counts as a regression")
+    parser.add_argument("--baseline-runs", type=int, default=5, help="recorded runs the baseline is the median of")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per benchmark, the best one is kept")
+    parser.add_argument("--quick", action="store_true", help="smaller workloads, compared only with other quick runs")
+    parser.add_argument("--no-save", action="store_true", help="compare without appending to the history")
+    args = parser.parse_args(argv)
+    unknown = set(args.names) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    app = qtw.QApplication.instance() or qtw.QApplication(sys.argv)
+    scale = 0.1 if args.quick else 1.0
+    results = {}
+    for name in args.names or BENCHMARKS:
+        function, unit, lower_is_better = BENCHMARKS[name]
+        runs = [function(app, scale) for _ in range(args.repeat)]
+        results[name] = min(runs) if lower_is_better else max(runs)
+        print(f"  {name:16} {results[name]:12.4g} {unit}")
+
+    history = load_history(args.history)
+    failed = regressions(results, history, scale, args.threshold, args.baseline_runs)
+    if not args.no_save:
+        entry = {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "commit": git_commit(), "scale": scale,
+                 "python": platform.python_version(), "pyside6": PySide6.__version__, "machine": platform.node(),
+                 "units": {name: BENCHMARKS[name][1] for name in results}, "results": results}
+        with open(args.history, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+    for line in failed:
+        print("REGRESSION " + line)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+# Benchmark of the UDP transport: real bytes through the protocol state machines over localhost
+# Reports the achieved MB/s and packets per second for a range of window sizes, of random bytes or of a real file
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+
+from simulation.Protocols import PROTOCOLS
+from transport.Checksums import CHECKSUMS
+from transport.FileTransfer import send_file
+from transport.UdpTransport import transfer
+
+WINDOWS = (1, 2, 4, 8, 16, 32, 64)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Throughput of the asyncio UDP transport over localhost")
+    parser.add_argument("--size", type=float, default=8, help="MB transferred per window size")
+    parser.add_argument("--packet-size", type=int, default=1024, help="payload bytes per packet")
+    parser.add_argument("--windows", type=int, nargs="+", default=WINDOWS, help="window sizes to time")
+    parser.add_argument("--protocol", choices=tuple(PROTOCOLS), default="gbn")
+    parser.add_argument("--seq-bits", type=int, default=0, help="bits of the wire sequence numbers, 0 for 32")
+    parser.add_argument("--loss", type=float, default=0.0, help="percentage of datagrams the proxy drops")
+    parser.add_argument("--delay", type=float, default=0.0, help="one-way delay in seconds added by the proxy")
+    parser.add_argument("--re-timer", type=float, default=0.05, help="retransmission timeout in seconds")
+    parser.add_argument("--seed", type=int, default=1, help="seed of the payload and the proxy's losses")
+    parser.add_argument("--timeout", type=float, default=120, help="wall seconds after which a transfer fails")
+    parser.add_argument("--file", help="transfer this file instead of random bytes, memory-mapped at both ends")
+    parser.add_argument("--output", help="where --file is written, default FILE.received")
+    parser.add_argument("--checksum", choices=CHECKSUMS, default="crc32", help="checksum of every --file packet")
+    parser.add_argument("--corrupt", type=float, default=0.0, help="percentage of data packets the proxy flips a bit of")
+    args = parser.parse_args(argv)
+    if args.file:
+        return send_files(args)
+
+    data = random.Random(args.seed).randbytes(int(args.size * 1e6))
+    print(f"{args.size:g} MB in {args.packet_size} B packets, {PROTOCOLS[args.protocol].name},"
+          f" loss {args.loss:g}%, delay {args.delay * 1000:g} ms")
+    print(f"{'window':>6} {'MB/s':>8} {'pkt/s':>9} {'sent':>9} {'resent':>8} {'timeouts':>8} {'intact':>6}")
+    failed = False
+    for window_size in args.windows:
+        try:
+            result = asyncio.run(transfer(data, window_size, args.packet_size, args.re_timer, args.protocol,
+                                          args.seq_bits, args.loss, args.delay, args.seed, args.timeout))
+        except (ValueError, asyncio.TimeoutError) as e:
+            print(f"{window_size:6} failed: {e or 'timed out'}")
+            failed = True
+            continue
+        failed |= not result.intact
+        print(f"{window_size:6} {result.mb_per_s:8.2f} {result.packets_per_s:9.0f} {result.transmissions:9}"
+              f" {result.retransmissions:8} {result.timeouts:8} {'yes' if result.intact else 'NO':>6}")
+    return 1 if failed else 0
+
+
+def send_files(args) -> int:
+    """Copy args.file once per window size and check every copy, end-to-end MB/s include mapping and checksums"""
+    output = args.output or args.file + ".received"
+    print(f"{args.file} ({os.path.getsize(args.file) / 1e6:g} MB) in {args.packet_size} B packets with {args.checksum},"
+          f" {PROTOCOLS[args.protocol].name}, loss {args.loss:g}%, corrupt {args.corrupt:g}%,"
+          f" delay {args.delay * 1000:g} ms")
+    print(f"{'window':>6} {'MB/s':>8} {'e2e MB/s':>8} {'sent':>9} {'resent':>8} {'corrupt':>8} {'identical':>9}")
+    failed = False
+    for window_size in args.windows:
+        try:
+            result = asyncio.run(send_file(args.file, output, window_size, args.packet_size, args.re_timer,
+                                           args.protocol, args.seq_bits, args.checksum, args.loss, args.delay,
+                                           args.corrupt, args.seed, args.timeout))
+        except (ValueError, OSError, asyncio.TimeoutError) as e:
+            print(f"{window_size:6} failed: {e or 'timed out'}")
+            failed = True
+            continue
+        failed |= not result.identical
+        counts = result.transfer
+        print(f"{window_size:6} {counts.mb_per_s:8.2f} {result.mb_per_s:8.2f} {counts.transmissions:9}"
+              f" {counts.retransmissions:8} {counts.corrupted:8} {'yes' if result.identical else 'NO':>9}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+# Headless entry point: runs scenario files without the GUI and prints or writes their metrics
+# Only simulation is imported, never PySide6, so it starts quickly on servers and in CI
+
+import argparse
+import csv
+import json
+import sys
+
+from simulation.Scenario import CONFIG_KEYS, load_scenarios, run_scenarios
+from simulation.Simulator import SimResult
+
+RESULT_KEYS = tuple(name for name in SimResult.__dataclass_fields__ if name != "num_packets") + ("goodput",)
+
+
+def write_rows(rows:list[dict], path:str):
+    """Write results as .json (a list), .jsonl (one run per line) or .csv (parameters and results, no metrics)"""
+    with open(path, "w", newline="") as f:
+        if path.endswith(".csv"):
+            writer = csv.DictWriter(f, fieldnames=("name", "source", "seed") + CONFIG_KEYS + RESULT_KEYS)
+            writer.writeheader()
+            for row in rows:
+                writer.writerow({"name": row["name"], "source": row["source"], "seed": row["seed"],
+                                 **row["config"], **{key: row["result"][key] for key in RESULT_KEYS}})
+        elif path.endswith(".jsonl"):
+            for row in rows:
+                f.write(json.dumps(row) + "\n")
+        else:
+            json.dump(rows, f, indent=2)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run Go-Back-N scenario files headless, in parallel")
+    parser.add_argument("scenarios", nargs="+", help=".json or .toml scenario files")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes, every core by default")
+    parser.add_argument("-o", "--output", help="write the results to a .json, .jsonl or .csv file")
+    parser.add_argument("--metrics", action="store_true", help="include RTT, occupancy and drop metrics in the output")
+    parser.add_argument("--seed", help="seed of scenarios that do not set one")
+    parser.add_argument("--quiet", action="store_true", help="do not print the summary table")
+    args = parser.parse_args(argv)
+
+    scenarios = []
+    try:
+        for path in args.scenarios:
+            scenarios.extend(load_scenarios(path))
+    except (OSError, ValueError, ImportError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    if args.seed is not None:
+        for scenario in scenarios:
+            if scenario.seed is None:
+                scenario.seed = f"{args.seed}:{scenario.source}:{scenario.name}"
+
+    if not args.quiet:
+        print(f"{'scenario':<24} {'protocol':>8} {'K':>7} {'R':>4} {'completed':>9} {'time (s)':>10}"
+              f" {'sent':>8} {'resent':>8} {'timeouts':>8} {'goodput':>9}")
+    rows = []
+    failed = 0
+    for row in run_scenarios(scenarios, args.jobs, args.metrics):
+        if "error" in row:
+            print(f"error: {row['error']}", file=sys.stderr, flush=True)
+            failed += 1
+            continue
+        rows.append(row)
+        if not args.quiet:
+            config, result = row["config"], row["result"]
+            print(f"{row['name'][:24]:<24} {config['protocol']:>8} {config['num_packets']:7} {config['window_size']:4}"
+                  f" {'yes' if result['completed'] else 'no':>9} {result['completion_time']:10.2f}"
+                  f" {result['transmissions']:8} {result['retransmissions']:8} {result['timeouts']:8}"
+                  f" {result['goodput']:9.3f}", flush=True)
+    if args.output:
+        write_rows(rows, args.output)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,18 +2,24 @@
 # This file initializes the PySide6 application and displays the main window
 
 import sys
-from PySide6 import QtCore as qtc
+
 from PySide6 import QtWidgets as qtw
-from PySide6 import QtGui as qtg
 
 from widget_containers.MainWidget import MainWidget
 
-# Create the main Qt application instance
-app = qtw.QApplication(sys.argv)
 
-# Create and display the main window containing the Go-Back-N simulation
-window = MainWidget()
-window.show()
+def create_window(argv:list) -> tuple[qtw.QApplication, MainWidget]:
+    """Create the Qt application instance and the main window containing the Go-Back-N simulation"""
+    app = qtw.QApplication(argv)
+    return app, MainWidget()
+
+
+def main() -> int:
+    app, window = create_window(sys.argv)
+    window.show()
+    # Start the application event loop and exit when closed
+    return app.exec()
+
 
-# Start the application event loop and exit when closed
-sys.exit(app.exec())
\ No newline at end of file
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+# Analytics predicts Go-Back-N goodput and retransmission cost from a small Markov model of the window
+# Predictions are cached per parameter set and compared against the Metrics of a run to flag divergence
+
+import functools
+from dataclasses import dataclass
+
+from simulation.SimConfig import SimConfig
+
+_SLIDE, _LOST, _STUCK = range(3)  # what the ACKs of a sent window do to the base, see _outcomes()
+
+
+@dataclass(frozen=True)
+class Prediction:
+    """Expected steady-state behaviour of one configuration"""
+
+    goodput: float        # packets acknowledged per second
+    efficiency: float     # goodput as a fraction of the lossless goodput
+    transmissions: float  # data packets sent per acknowledged packet
+    timeouts: float       # timer expiries per acknowledged packet
+    failure: float        # packets per acknowledged packet that time out at least once as the oldest
+    valid: bool           # the timer outlasts a round trip, as the model assumes
+
+
+def _outcomes(window_size:int, loss:float, gap:int) -> list:
+    """Ways the ACKs of a sent window can move its base, the receiver holding `gap` packets from the base on
+
+    The packets from offset `gap` on are read in the order their ACKs come
+    back. Returns (probability, kind, offset) triples: _SLIDE when an ACK
+    moves the base `offset` packets on, onto a packet whose fate is still
+    open; _LOST when it moves it `offset` packets on, onto a packet that was
+    lost; _STUCK when no ACK moves it and the receiver then holds `offset`
+    packets from the base on.
+    """
+    through = (1 - loss) ** 2 # a packet and its ACK both get through
+    failed = 1 - through
+    outcomes = []
+    reach = 1.0 # packets gap..offset-1 arrived in order and their ACKs were lost
+    for offset in range(gap, window_size):
+        outcomes.append((reach * through, _SLIDE, offset + 1))
+        lost = reach * loss
+        if offset:
+            behind = failed ** (window_size - 1 - offset) # no ACK comes back for any later packet either
+            outcomes.append((lost * (1 - behind), _LOST, offset))
+            outcomes.append((lost * behind, _STUCK, offset))
+        else:
+            outcomes.append((lost, _STUCK, 0)) # later packets only repeat the ACK of the base
+        reach *= (1 - loss) * loss
+        if reach < 1e-12:
+            break
+    outcomes.append((reach, _STUCK, window_size))
+    return outcomes
+
+
+def _failures(window_size:int, loss:float) -> tuple[float, float]:
+    """Failures and timeouts per acknowledged packet
+
+    A Markov chain over the state of the window after each ACK: sliding with
+    the base's fate still open, or timed out with the receiver `gap` packets
+    ahead of the base. A timeout resends the window. The duplicates among
+    the resent packets repeat the receiver's ACK, and the receiver keeps
+    what arrives in order, so one resend can acknowledge several packets.
+    A failure is the first timeout of a base.
+    """
+    failed = 1 - (1 - loss) ** 2
+    # expected (timeouts, failures, packets acknowledged, returns to a timeout with the receiver at the base)
+    # from a timeout at each gap until sliding resumes
+    after = {}
+    for gap in range(window_size, -1, -1):
+        total = [1.0, 0.0, 0.0, 0.0]
+        stay = 0.0
+        duplicates_failed = failed ** gap
+        total[2] += (1 - duplicates_failed) * gap # a duplicate's ACK moves the base up to the receiver
+        for probability, kind, offset in _outcomes(window_size, loss, gap):
+            probability *= duplicates_failed
+            if kind == _SLIDE:
+                total[2] += probability * offset
+            elif kind == _LOST:
+                _accumulate(total, probability, (0, 1, offset, 1))
+            elif offset == gap:
+                stay += probability # the same base times out again
+            else:
+                _accumulate(total, probability, after[offset])
+        after[gap] = [value / (1 - stay) for value in total]
+    # every lost base leads back to a timeout at gap 0, settle those returns once
+    returns = after[0][3]
+    at_base = [value / (1 - returns) for value in after[0][:3]]
+    for gap, values in after.items():
+        _accumulate(values, values[3], at_base)
+
+    total = [0.0, 0.0, 0.0]
+    for probability, kind, offset in _outcomes(window_size, loss, 0):
+        if kind == _SLIDE:
+            total[2] += probability * offset
+        else:
+            _accumulate(total, probability, (0, 1, offset if kind == _LOST else 0))
+            _accumulate(total, probability, at_base if kind == _LOST else after[offset])
+    timeouts, failures, acked = total
+    return failures / acked, timeouts / acked
+
+
+def _accumulate(total:list, probability:float, values):
+    """Add `values` weighted by `probability` to `total`, element by element"""
+    for i, value in enumerate(values[:len(total)]):
+        total[i] += probability * value
+
+
+def _burst_position(window_size:int, failure:float) -> float:
+    """Mean position (1 to R) of a failing packet in its send burst
+
+    Sends keep the bursts a resend starts, R packets per round trip. The next
+    failure comes a geometric number of packets later, `failure` per packet.
+    """
+    weights = [(1 - failure) ** k for k in range(window_size)]
+    return 1 + sum(k * w for k, w in enumerate(weights)) / sum(weights)
+
+
+@functools.lru_cache(maxsize=256)
+def predict(window_size:int, loss:float, re_timer:float, rtt:float, stagger:float = 0.05) -> Prediction:
+    """Go-Back-N model for the timer rules of Simulator and the GUI
+
+    Without loss the window is refilled one packet per ACK, so a packet is
+    acknowledged every rtt/R seconds (or every `stagger`, if the window
+    outlasts a round trip). Packets leave in bursts, `stagger` apart.
+
+    A base fails when its data is lost, or when it arrives but no ACK from it
+    or the packets behind it gets back. Its timer runs out a timer period
+    after the previous base was acknowledged, and the resent window leaves
+    as one burst, which delays every later send. The delay is smaller the
+    later in its burst the failed packet was sent. Each further timeout of
+    the same base adds a timer period. _failures() gives the failures and
+    timeouts per packet.
+
+    The model assumes a FIFO link, data and ACK losses that are independent
+    with the same probability, and re_timer > rtt.
+
+    Args:
+        window_size: R
+        loss: per packet loss probability (0-1), for data packets and ACKs alike
+        re_timer: retransmission timer in seconds
+        rtt: round-trip time in seconds (twice the propagation delay)
+        stagger: gap between packets sent back to back in seconds
+    """
+    slot = max(rtt / window_size, stagger) # seconds per acknowledged packet without loss
+    if loss >= 1:
+        return Prediction(0.0, 0.0, float("inf"), float("inf"), 1.0, re_timer > rtt)
+    failure, timeouts = _failures(window_size, loss) if loss > 0 else (0.0, 0.0)
+    idle = max(rtt - window_size * stagger, 0) # time per round trip the link waits for ACKs
+    stall = re_timer + rtt - stagger - idle / window_size * _burst_position(window_size, failure)
+    per_packet = slot + failure * stall + (timeouts - failure) * re_timer
+    goodput = 1 / per_packet
+    return Prediction(goodput=goodput, efficiency=goodput * slot, transmissions=1 + window_size * timeouts,
+                      timeouts=timeouts, failure=failure, valid=re_timer > rtt)
+
+
+def predict_config(config:SimConfig) -> Prediction:
+    """predict() for the parameters of a SimConfig
+
+    Stop-and-Wait is Go-Back-N with a window of one. Selective Repeat is not
+    modelled and raises ValueError. On a link with a bandwidth the
+    transmission delay takes the place of the stagger and adds to the round
+    trip, queue drops are not modelled. Losses must be independent at
+    per_pkt_loss in both directions, other loss models raise ValueError.
+    """
+    if config.protocol == "sr":
+        raise ValueError("the model only covers Go-Back-N and Stop-and-Wait")
+    if config.data_loss or config.ack_loss:
+        raise ValueError("the model only covers independent losses at per_pkt_loss")
+    window_size = 1 if config.protocol == "sw" else config.window_size
+    if config.bandwidth:
+        return predict(window_size, config.per_pkt_loss / 100, config.re_timer,
+                       2 * config.prop_delay + config.transmission_delay, config.transmission_delay)
+    return predict(window_size, config.per_pkt_loss / 100, config.re_timer,
+                   2 * config.prop_delay, config.stagger)
+
+
+@dataclass
+class Comparison:
+    """Predicted against observed values of a run"""
+
+    predicted: Prediction
+    goodput: float        # observed packets acknowledged per second
+    transmissions: float  # observed data packets sent per acknowledged packet
+    error: float          # relative goodput error of the model, (predicted - observed) / observed
+    settled: bool         # enough packets were acknowledged for the comparison to mean something
+    diverges: bool        # settled and the error is beyond the tolerance, or the model does not apply
+
+
+def compare(config:SimConfig, metrics, tolerance:float = 0.2, min_packets:int = 30) -> Comparison:
+    """Compare a run's simulation.Metrics with the model of its configuration
+
+    Args:
+        tolerance: relative goodput error above which the run is flagged
+        min_packets: acknowledged packets needed before a run is judged
+    """
+    predicted = predict_config(config)
+    goodput = metrics.goodput
+    transmissions = metrics.sends / metrics.base if metrics.base else 0.0
+    error = (predicted.goodput - goodput) / goodput if goodput else 0.0
+    settled = metrics.base >= min(min_packets, config.num_packets)
+    diverges = settled and (abs(error) > tolerance or not predicted.valid)
+    return Comparison(predicted, goodput, transmissions, error, settled, diverges)
@@ -0,0 +1,72 @@
+# Compare runs several ARQ protocols headless on the same seeded loss patterns
+# Every protocol sees the same fate for the n-th transmission of each packet and ACK, so differences come from the protocol alone
+
+import statistics
+from dataclasses import dataclass, replace
+
+from simulation.Protocols import PROTOCOLS
+from simulation.SimConfig import SimConfig
+from simulation.Simulator import KeyedLoss, SimResult, Simulator
+
+
+@dataclass
+class ProtocolRun:
+    """Outcome of one protocol on one seed"""
+
+    protocol: str
+    seed: object
+    result: SimResult
+    packet_size: int  # bytes per data packet
+
+    @property
+    def bytes_sent(self) -> int:
+        return self.result.transmissions * self.packet_size
+
+    @property
+    def bytes_retransmitted(self) -> int:
+        return self.result.retransmissions * self.packet_size
+
+
+def compare_protocols(config:SimConfig, seeds=(0,), protocols=tuple(PROTOCOLS),
+                      max_time:float = 1e6) -> list[ProtocolRun]:
+    """Run every protocol of `protocols` on every seed of `seeds` with identical losses
+
+    Args:
+        config: parameters shared by every run, its protocol field is ignored
+        seeds: one KeyedLoss pattern per seed, applied to every protocol. With a data_loss
+            or ack_loss model the runs share the model's stream of decisions instead, so
+            the n-th transmission of a run meets the same fate whatever the protocol
+        protocols: keys of simulation.Protocols.PROTOCOLS
+        max_time: simulated seconds after which a run is recorded as not completed
+    """
+    runs = []
+    for seed in seeds:
+        for protocol in protocols:
+            run_config = replace(config, protocol=protocol)
+            loss = None if config.data_loss or config.ack_loss else KeyedLoss(seed, config.per_pkt_loss)
+            simulator = Simulator(run_config, seed=seed, loss=loss)
+            runs.append(ProtocolRun(protocol, seed, simulator.run(max_time=max_time), config.packet_size))
+    return runs
+
+
+def report(runs:list[ProtocolRun]) -> str:
+    """Table of mean completion time and bytes retransmitted per protocol, relative to the first protocol"""
+    by_protocol = {}
+    for run in runs:
+        by_protocol.setdefault(run.protocol, []).append(run)
+    lines = [f"{'protocol':18} {'runs':>5} {'completed':>9} {'time (s)':>10} {'vs first':>8}"
+             f" {'retransmitted (B)':>18} {'vs first':>8}"]
+    reference = None
+    for protocol, protocol_runs in by_protocol.items():
+        done = [run for run in protocol_runs if run.result.completed]
+        time = statistics.fmean(run.result.completion_time for run in done) if done else float("nan")
+        resent = statistics.fmean(run.bytes_retransmitted for run in protocol_runs)
+        if reference is None:
+            reference = (time, resent)
+        lines.append(f"{PROTOCOLS[protocol].name:18} {len(protocol_runs):5} {len(done):9} {time:10.2f}"
+                     f" {_ratio(time, reference[0]):>8} {resent:18.0f} {_ratio(resent, reference[1]):>8}")
+    return "\n".join(lines)
+
+
+def _ratio(value:float, reference:float) -> str:
+    return f"{value / reference:.2f}x" if reference else "-"
@@ -0,0 +1,164 @@
+# GoBackNProtocol is the sender/receiver state machine of the Go-Back-N protocol
+# It has no notion of time or drawing, the GUI and the headless simulator both drive it
+
+from simulation.SeqRing import SeqRing
+
+class GoBackNProtocol:
+    """Go-Back-N sender and receiver state shared by every front end
+
+    Sequence numbers are 0-based packet indexes. ACK values are cumulative:
+    an ACK of n acknowledges every packet before n (n is the next packet the
+    receiver expects).
+
+    With seq_bits set, packets and ACKs carry their number modulo
+    2**seq_bits, as in a k-bit header field. Front ends still pass and
+    receive packet indexes, but the receiver and the sender only look at the
+    low seq_bits of the numbers they are given and place them relative to
+    their own window, so the window must fit the sequence space
+    (max_window()). Per-packet state is kept in SeqRings sized to the window,
+    so memory does not grow with num_packets.
+
+    There is a single retransmission timer, on the oldest unacknowledged
+    packet. The protocol does not run it, but tells the caller when to start,
+    restart and stop it (timer_needed) and what to resend when it expires.
+
+    This class is also the interface of the other protocols in simulation.Protocols:
+    front ends only use the methods and attributes below, and run one timer
+    per outstanding packet instead of one per window when per_packet_timers is set.
+    """
+
+    name = "Go-Back-N"
+    per_packet_timers = False  # one timer for the window, timeout() resends everything outstanding
+
+    def __init__(self, num_packets:int, window_size:int, seq_bits:int = 0):
+        self.num_packets = num_packets  # Total packets to transmit (K)
+        self.window_size = window_size  # Sender window size (N in Go-Back-N)
+        self.seq_bits = seq_bits        # Bits of the sequence number field, 0 for unbounded numbers
+        self.reset()
+
+    @classmethod
+    def max_window(cls, seq_bits:int) -> int:
+        """Largest window a seq_bits sequence space can tell apart, None when unbounded
+
+        A Go-Back-N receiver must not mistake a new packet for one a full window older
+        """
+        return 2**seq_bits - 1 if seq_bits else None
+
+    def reset(self):
+        """Return the sender and receiver to their initial state"""
+        limit = self.max_window(self.seq_bits)
+        if limit is not None and self.window_size > limit:
+            raise ValueError(f"a window of {self.window_size} does not fit {self.seq_bits}-bit sequence numbers"
+                             f" ({self.name} allows {limit})")
+        self.modulus = 2**self.seq_bits if self.seq_bits else 0  # size of the sequence space, 0 for unbounded
+        self.base = 0           # oldest unacknowledged packet (left edge of the window)
+        self.expected = 0       # next in-order packet the receiver is waiting for
+        self.next_seq = 0       # one past the highest packet handed out for sending
+        self.in_flight = SeqRing(self.window_size)  # packets handed out and not yet acknowledged
+
+    def resize(self, num_packets:int, window_size:int, seq_bits:int = None):
+        """Change K, N and (unless None) the sequence number bits, resetting the run"""
+        self.num_packets = num_packets
+        self.window_size = window_size
+        if seq_bits is not None:
+            self.seq_bits = seq_bits
+        self.reset()
+
+    def wire(self, seq:int) -> int:
+        """Number carried in the header of packet `seq` (or of an ACK of value `seq`)"""
+        return seq % self.modulus if self.modulus else seq
+
+    def unwrap(self, number:int, reference:int) -> int:
+        """Packet index of wire `number`, taken as the first one at or after `reference`"""
+        if not self.modulus:
+            return number
+        return reference + (number - reference) % self.modulus
+
+    @property
+    def done(self) -> bool:
+        """True once every packet has been acknowledged"""
+        return self.base >= self.num_packets
+
+    def window_bounds(self) -> tuple[int, int]:
+        """First and last packet index of the current sending window
+
+        The window never extends past the last packet, so near the end of the
+        run it stops sliding and already acknowledged packets stay inside it
+        """
+        start = max(0, min(self.base, self.num_packets - self.window_size))
+        end = min(start + self.window_size - 1, self.num_packets - 1)
+        return start, end
+
+    def is_acked(self, seq:int) -> bool:
+        return seq < self.base
+
+    @property
+    def timer_needed(self) -> bool:
+        """True while packets are outstanding, i.e. the retransmission timer must run"""
+        return self.base < self.next_seq
+
+    def sendable(self) -> list[int]:
+        """Packets in the window that are unacknowledged and not already in flight
+
+        The returned packets are marked as in flight, the caller must transmit them
+        """
+        if self.window_size <= 0 or self.done:
+            return []
+        start, end = self.window_bounds()
+        ready = []
+        for seq in range(max(start, self.base), end + 1):
+            if not self.in_flight[seq]:
+                self.in_flight[seq] = True
+                ready.append(seq)
+        if ready:
+            self.next_seq = max(self.next_seq, ready[-1] + 1)
+        return ready
+
+    def abandon_in_flight(self):
+        """Forget every outstanding packet, e.g. when a front end drops its animations
+
+        The packets stay unacknowledged and sendable() hands them out again
+        """
+        for seq in range(self.base, self.next_seq):
+            self.in_flight[seq] = False
+        self.next_seq = self.base
+
+    def packet_arrived(self, seq:int) -> int:
+        """Receiver side: accept a data packet and return the cumulative ACK to send
+
+        Go-Back-N receivers only accept the next in-order packet, anything else
+        is discarded and the last cumulative ACK is repeated
+        """
+        if self.wire(seq) == self.wire(self.expected):
+            self.expected += 1
+        return self.expected
+
+    def has_received(self, seq:int) -> bool:
+        """Receiver side: True once packet `seq` has been accepted"""
+        return seq < self.expected
+
+    def ack_arrived(self, ack:int, seq:int = None) -> range:
+        """Sender side: apply a cumulative ACK and return the newly acknowledged packets
+
+        ACKs come back in order, so a wrapped ACK value lies between base and
+        next_seq, anything else is stale.
+
+        Args:
+            ack: cumulative ACK value, as returned by packet_arrived()
+            seq: packet whose arrival produced the ACK, unused by Go-Back-N
+        """
+        if self.modulus:
+            ack = self.unwrap(self.wire(ack), self.base)
+            if ack > self.next_seq:
+                return range(0)  # older than the window, from before the numbers wrapped
+        if ack <= self.base:
+            return range(0)  # duplicate or stale ACK, window does not move
+        newly_acked = range(self.base, ack)
+        for seq in newly_acked:
+            self.in_flight[seq] = False
+        self.base = ack
+        return newly_acked
+
+    def timeout(self, seq:int = None) -> range:
+        """The retransmission timer expired: go back and return every outstanding packet to resend"""
+        return range(self.base, self.next_seq)
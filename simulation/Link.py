@@ -0,0 +1,112 @@
+# Link models the bottleneck in front of the propagation delay: a FIFO queue served at a fixed bandwidth
+# Packets wait for the ones ahead of them, take packet_size / bandwidth to serialise, and overflow by tail drop or RED
+
+import random
+from collections import deque
+
+QUEUE_POLICIES = ("tail", "red")
+
+# RED thresholds as fractions of the queue limit, drop probability at the upper threshold and averaging weight.
+# The weight is much larger than the classic 0.002 because simulated queues hold tens of packets, not thousands
+RED_MIN = 0.25
+RED_MAX = 0.75
+RED_MAX_P = 0.1
+RED_WEIGHT = 0.2
+
+
+class Link:
+    """Store-and-forward bottleneck shared by every data packet of a run
+
+    Times are in seconds since the start of the run. admit() is called when
+    the sender hands a packet to the link and returns when its transmission
+    starts, or None if the queue drops it. The packet leaves the link
+    transmission_delay seconds after that and then propagates as before.
+    Nothing runs between calls: the queue is the list of transmissions still
+    scheduled, drained lazily.
+
+    Args:
+        bandwidth: link rate in bytes per second
+        packet_size: bytes per data packet
+        queue_limit: packets that may wait behind the one being transmitted, 0 for unbounded
+        policy: "tail" drops arrivals to a full queue, "red" also drops early
+            with a probability growing with the average queue length
+        rng: random.Random for RED's early drops
+    """
+
+    def __init__(self, bandwidth:float, packet_size:int, queue_limit:int = 0, policy:str = "tail",
+                 rng:random.Random = None):
+        if bandwidth <= 0:
+            raise ValueError("bandwidth must be > 0")
+        if policy not in QUEUE_POLICIES:
+            raise ValueError(f"policy must be one of {', '.join(QUEUE_POLICIES)}")
+        if policy == "red" and queue_limit <= 0:
+            raise ValueError("RED needs a queue limit")
+        self.transmission_delay = packet_size / bandwidth
+        self.queue_limit = queue_limit
+        self.policy = policy
+        self.rng = rng or random.Random()
+
+        self._ends = deque()  # end of transmission of every packet still on the link, oldest first
+        self.free_at = 0.0  # time the last scheduled transmission ends
+        self.avg_queue = 0.0  # RED's moving average of the queue length
+        self.busy = 0.0  # seconds of transmission scheduled so far
+        self.sent = 0  # packets admitted
+        self.drops = 0  # packets refused by the queue
+        self.queue_delay = 0.0  # total seconds admitted packets waited
+        self.max_queue_delay = 0.0
+        self.max_queue = 0  # most packets seen waiting at once
+
+    @classmethod
+    def from_config(cls, config, rng:random.Random = None):
+        """The link of a simulation.SimConfig, None when its bandwidth is unlimited"""
+        if not config.bandwidth:
+            return None
+        return cls(config.bandwidth, config.packet_size, config.queue_limit, config.queue_policy, rng)
+
+    def queue_length(self, now:float) -> int:
+        """Packets waiting at `now`, not counting the one being transmitted"""
+        ends = self._ends
+        while ends and ends[0] <= now:
+            ends.popleft()
+        return max(len(ends) - 1, 0)
+
+    def admit(self, now:float):
+        """Queue a packet handed over at `now`, returns its transmission start or None if it is dropped"""
+        waiting = self.queue_length(now)
+        if self.policy == "red" and self._early_drop(now, waiting):
+            self.drops += 1
+            return None
+        if self.queue_limit and waiting >= self.queue_limit:
+            self.drops += 1
+            return None
+        start = max(now, self.free_at)
+        self.free_at = start + self.transmission_delay
+        self._ends.append(self.free_at)
+        self.busy += self.transmission_delay
+        self.sent += 1
+        self.queue_delay += start - now
+        self.max_queue_delay = max(self.max_queue_delay, start - now)
+        self.max_queue = max(self.max_queue, waiting + (start > now))
+        return start
+
+    def _early_drop(self, now:float, waiting:int) -> bool:
+        if now > self.free_at:
+            # the link sat idle, age the average as if empty queues had been sampled meanwhile
+            self.avg_queue *= (1 - RED_WEIGHT) ** ((now - self.free_at) / self.transmission_delay)
+        self.avg_queue += RED_WEIGHT * (waiting - self.avg_queue)
+        low, high = RED_MIN * self.queue_limit, RED_MAX * self.queue_limit
+        if self.avg_queue < low:
+            return False
+        if self.avg_queue >= high:
+            return True
+        return self.rng.random() < RED_MAX_P * (self.avg_queue - low) / (high - low)
+
+    def utilisation(self, now:float) -> float:
+        """Fraction of the time until `now` the link spent transmitting"""
+        if now <= 0:
+            return 0.0
+        return (self.busy - max(self.free_at - now, 0.0)) / now
+
+    @property
+    def mean_queue_delay(self) -> float:
+        return self.queue_delay / self.sent if self.sent else 0.0
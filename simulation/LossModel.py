@@ -0,0 +1,197 @@
+# LossModel decides which transmissions the link loses: independently, in bursts, or as recorded in a file
+# Decisions are generated in bulk with NumPy, so deciding one packet is a single list lookup
+
+import random
+
+CHUNK = 4096  # loss decisions generated at a time
+
+
+class BernoulliLoss:
+    """Every transmission is lost independently with probability `rate`"""
+
+    def __init__(self, rate:float):
+        if not 0 <= rate <= 1:
+            raise ValueError("loss rate must be between 0 and 100%")
+        self.rate = rate
+
+    def chunks(self, rng, size:int):
+        """Endless boolean arrays of `size` decisions (True = lost) drawn from a NumPy Generator"""
+        while True:
+            yield rng.random(size) < self.rate
+
+
+class GilbertElliottLoss:
+    """Two-state Markov loss: a good state losing rarely and a bad state losing in bursts
+
+    The state changes between transmissions, so state sojourns are geometric
+    and are drawn as whole runs, then every transmission is lost with the
+    loss probability of its state.
+
+    Args:
+        p_gb: probability of moving from the good to the bad state after a transmission
+        p_bg: probability of moving from the bad to the good state
+        loss_good: loss probability in the good state
+        loss_bad: loss probability in the bad state
+    """
+
+    def __init__(self, p_gb:float, p_bg:float, loss_good:float = 0.0, loss_bad:float = 1.0):
+        if not (0 < p_gb <= 1 and 0 < p_bg <= 1):
+            raise ValueError("Gilbert-Elliott transition probabilities must be in (0, 1]")
+        if not (0 <= loss_good <= 1 and 0 <= loss_bad <= 1):
+            raise ValueError("Gilbert-Elliott loss probabilities must be between 0 and 100%")
+        self.p_gb = p_gb
+        self.p_bg = p_bg
+        self.loss_good = loss_good
+        self.loss_bad = loss_bad
+
+    @classmethod
+    def from_burst(cls, rate:float, burst_length:float, loss_bad:float = 1.0):
+        """Gilbert model with an average loss `rate` and bad states lasting `burst_length` transmissions on average
+
+        The good state never loses, so `rate` cannot exceed loss_bad. A rate of 0 gives a BernoulliLoss
+        """
+        if burst_length < 1:
+            raise ValueError("mean burst length must be at least one packet")
+        if not 0 <= rate <= loss_bad:
+            raise ValueError("burst loss rate must be between 0 and the loss in the bad state")
+        if rate == 0 or rate == loss_bad:
+            return BernoulliLoss(rate)  # never or always in the bad state
+        bad = rate / loss_bad  # stationary probability of the bad state
+        p_bg = 1 / burst_length
+        return cls(min(p_bg * bad / (1 - bad), 1.0), p_bg, 0.0, loss_bad)
+
+    @property
+    def rate(self) -> float:
+        """Long-run fraction of transmissions lost"""
+        bad = self.p_gb / (self.p_gb + self.p_bg)
+        return bad * self.loss_bad + (1 - bad) * self.loss_good
+
+    def chunks(self, rng, size:int):
+        import numpy as np
+        bad = rng.random() < self.p_gb / (self.p_gb + self.p_bg)  # start in the stationary distribution
+        pending = np.empty(0, dtype=bool)  # states drawn past the end of the previous chunk
+        runs = max(2, 2 * int(size / (1 / self.p_gb + 1 / self.p_bg)) + 2)  # alternating runs per draw, even
+        loss = np.array([self.loss_good, self.loss_bad])
+        while True:
+            parts = [pending]
+            total = pending.size
+            while total < size:
+                lengths = np.empty(runs, dtype=np.int64)
+                lengths[0::2] = rng.geometric(self.p_bg if bad else self.p_gb, runs // 2)
+                lengths[1::2] = rng.geometric(self.p_gb if bad else self.p_bg, runs // 2)
+                states = np.zeros(runs, dtype=bool)
+                states[0::2] = bad
+                states[1::2] = not bad
+                parts.append(np.repeat(states, lengths))  # an even number of runs ends where it started
+                total += parts[-1].size
+            states = np.concatenate(parts)
+            states, pending = states[:size], states[size:]
+            yield rng.random(size) < loss[states.astype(np.intp)]
+
+
+class TraceLoss:
+    """Losses replayed from a recorded file, looped when the run outlasts it
+
+    The file holds one 0 (delivered) or 1 (lost) per transmission, in any
+    layout: "0010011", one per line, or separated by commas or spaces.
+    Lines starting with # are comments. The file is read when the first
+    decision is needed.
+    """
+
+    def __init__(self, path:str):
+        self.path = path
+        self._mask = None
+
+    def mask(self):
+        """The recorded decisions as a boolean NumPy array"""
+        if self._mask is None:
+            import numpy as np
+            with open(self.path) as f:
+                text = "".join(line for line in f if not line.lstrip().startswith("#"))
+            digits = np.frombuffer(text.encode("ascii", "ignore"), dtype=np.uint8)
+            digits = digits[(digits == ord("0")) | (digits == ord("1"))]
+            if digits.size == 0:
+                raise ValueError(f"{self.path} holds no 0/1 loss decisions")
+            self._mask = digits == ord("1")
+        return self._mask
+
+    @property
+    def rate(self) -> float:
+        return float(self.mask().mean())
+
+    def chunks(self, rng, size:int):
+        import numpy as np
+        mask = self.mask()
+        repeats = -(-size // mask.size) + 1  # enough copies for any window of `size` decisions
+        looped = np.tile(mask, repeats)
+        start = 0
+        while True:
+            yield looped[start:start + size]
+            start = (start + size) % mask.size
+
+
+def parse_loss(spec:str):
+    """Loss model of a SimConfig data_loss or ack_loss spec, None for an empty spec
+
+    Specs are "bernoulli:P", "gilbert-elliott:P:B" or "gilbert-elliott:P:B:H"
+    (average loss P%, mean burst length B transmissions, H% lost in the bad
+    state, 100 by default) and "trace:PATH". Raises ValueError for anything else.
+    """
+    if not spec:
+        return None
+    name, _, args = spec.partition(":")
+    try:
+        if name == "bernoulli":
+            return BernoulliLoss(float(args) / 100)
+        if name == "gilbert-elliott":
+            values = [float(v) for v in args.split(":")]
+            if len(values) not in (2, 3):
+                raise ValueError
+            rate, burst_length, loss_bad = (values + [100.0])[:3]
+            return GilbertElliottLoss.from_burst(rate / 100, burst_length, loss_bad / 100)
+    except ValueError as e:
+        raise ValueError(f"bad loss spec {spec!r}: {e}" if str(e) else f"bad loss spec {spec!r}") from None
+    if name == "trace" and args:
+        return TraceLoss(args)
+    raise ValueError(f"bad loss spec {spec!r}, expected bernoulli:P, gilbert-elliott:P:B[:H] or trace:PATH")
+
+
+class LossStream:
+    """Loss decisions of one direction of a run, refilled a chunk at a time
+
+    Call it once per transmission: it returns True when the transmission is lost.
+
+    Args:
+        model: BernoulliLoss, GilbertElliottLoss or TraceLoss
+        seed: seed of the NumPy generator, an int or a sequence of ints
+    """
+
+    def __init__(self, model, seed, chunk:int = CHUNK):
+        import numpy as np
+        self.model = model
+        self._chunks = model.chunks(np.random.default_rng(seed), chunk)
+        self._mask = []  # current chunk as a list, indexing it is cheaper than indexing the array
+        self._next = 0
+
+    def __call__(self) -> bool:
+        if self._next == len(self._mask):
+            self._mask = next(self._chunks).tolist()
+            self._next = 0
+        lost = self._mask[self._next]
+        self._next += 1
+        return lost
+
+
+def loss_streams(config, seed) -> tuple:
+    """(data, ACK) LossStreams of a simulation.SimConfig, None for a direction drawing from per_pkt_loss
+
+    An empty ack_loss uses the data model with a stream of its own. Both
+    streams are seeded from `seed`, any value random.Random accepts.
+    """
+    data_model = parse_loss(config.data_loss)
+    ack_model = parse_loss(config.ack_loss) if config.ack_loss else data_model
+    if data_model is None and ack_model is None:
+        return None, None
+    root = random.Random(seed).getrandbits(64)
+    return (None if data_model is None else LossStream(data_model, [root, 0]),
+            None if ack_model is None else LossStream(ack_model, [root, 1]))
@@ -0,0 +1,194 @@
+# Metrics turns the event stream of a Go-Back-N run into counters and histograms
+# It has the observer signature of traces, so the GUI, the simulator and replays all feed it the same way
+
+import json
+
+from simulation.Simulator import (SEND, PKT_ARRIVE, PKT_DROP, ACK_ARRIVE, ACK_DROP, TIMEOUT, WINDOW_SLIDE,
+                                  USER_KILL, DROP_RANDOM, DROP_MANUAL, DROP_QUEUE)
+
+DROP_CAUSES = {DROP_RANDOM: "random", DROP_MANUAL: "manual", DROP_QUEUE: "queue"}  # clicked-away packets are counted as "user"
+
+
+class Histogram:
+    """Fixed-width bins grown on demand, plus count, sum, min and max"""
+
+    def __init__(self, bin_width:float):
+        self.bin_width = bin_width
+        self.bins = [] # samples per bin, bin i covers [i*bin_width, (i+1)*bin_width)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value:float, weight:int = 1):
+        index = int(value / self.bin_width)
+        if index >= len(self.bins):
+            self.bins.extend([0] * (index + 1 - len(self.bins)))
+        self.bins[index] += weight
+        self.count += weight
+        self.total += value * weight
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, p:float) -> float:
+        """Upper edge of the bin holding the p-th percentile"""
+        if not self.count:
+            return 0.0
+        target = self.count * p / 100
+        seen = 0
+        for index, n in enumerate(self.bins):
+            seen += n
+            if seen >= target:
+                return min((index + 1) * self.bin_width, self.max)
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {"count": self.count, "mean": self.mean, "min": self.min, "max": self.max,
+                "p50": self.percentile(50), "p95": self.percentile(95),
+                "bin_width": self.bin_width, "bins": list(self.bins)}
+
+
+class Metrics:
+    """Live counters of a run, fed one event at a time
+
+    Call it like a trace observer: metrics(time, kind, seq, value, cause) with
+    simulated seconds and the event kinds of simulation.Simulator. Every event
+    costs a few integer updates. Per-packet bookkeeping is kept only for
+    outstanding packets, so memory does not grow with the number of packets.
+
+    RTT samples follow Karn's rule: only packets sent once are measured, from
+    their send to the ACK their arrival produced. Window occupancy is the
+    number of outstanding packets, weighted by how long it lasted.
+    """
+
+    def __init__(self, window_size:int, num_packets:int = 0, rtt_bin:float = 0.1):
+        self.window_size = window_size
+        self.num_packets = num_packets
+        self.start = None # simulated time of the first event
+        self.now = 0.0 # simulated time of the last event
+        self.events = 0 # events seen, cheap change detection for displays
+
+        self.sends = 0 # data packets put on the link
+        self.retransmissions = 0 # sends of a packet that was sent before
+        self.deliveries = 0 # packets accepted in order by the receiver
+        self.duplicates = 0 # packets that reached the receiver again after delivery
+        self.out_of_order = 0 # packets discarded because an earlier one is missing
+        self.acks = 0 # ACKs that reached the sender
+        self.stale_acks = 0 # ACKs that did not move the window
+        self.timeouts = 0
+        self.pkt_drops = {"random": 0, "manual": 0, "user": 0, "queue": 0}
+        self.ack_drops = {"random": 0, "manual": 0, "user": 0}
+        self.loss_presets = 0 # sender/receiver clicks that toggled a manual loss
+        self.base = 0 # oldest unacknowledged packet
+        self.expected = 0 # next in-order packet at the receiver
+
+        self.rtt = Histogram(rtt_bin) # seconds
+        self.occupancy = [0.0] * (window_size + 1) # seconds spent with n packets outstanding
+        self._next_seq = 0 # one past the highest packet sent
+        self._sent_at = {} # outstanding packet -> time of its only send, None once retransmitted
+
+    def __call__(self, time:float, kind:int, seq:int, value:int = 0, cause:int = 0):
+        self.events += 1
+        if self.start is None:
+            self.start = self.now = time
+        # the occupancy so far lasted until this event
+        outstanding = min(max(self._next_seq - self.base, 0), self.window_size)
+        self.occupancy[outstanding] += time - self.now
+        self.now = time
+
+        if kind == SEND:
+            self.sends += 1
+            if seq < self.base or seq in self._sent_at:
+                self.retransmissions += 1
+                if seq >= self.base:
+                    self._sent_at[seq] = None # ambiguous RTT from now on
+            else:
+                self._sent_at[seq] = time
+            self._next_seq = max(self._next_seq, seq + 1)
+        elif kind == PKT_ARRIVE:
+            if value > self.expected:
+                self.deliveries += value - self.expected
+                self.expected = value
+            elif seq < value:
+                self.duplicates += 1
+            else:
+                self.out_of_order += 1
+        elif kind == ACK_ARRIVE:
+            self.acks += 1
+            if value <= self.base:
+                self.stale_acks += 1
+            sent_at = self._sent_at.get(seq)
+            if sent_at is not None:
+                self.rtt.add(time - sent_at)
+                self._sent_at[seq] = None # one sample per packet
+        elif kind == WINDOW_SLIDE:
+            for acked in range(self.base, seq):
+                self._sent_at.pop(acked, None)
+            self.base = seq
+        elif kind == TIMEOUT:
+            self.timeouts += 1
+        elif kind == PKT_DROP:
+            self.pkt_drops[DROP_CAUSES.get(cause, "random")] += 1
+        elif kind == ACK_DROP:
+            self.ack_drops[DROP_CAUSES.get(cause, "random")] += 1
+        elif kind == USER_KILL:
+            (self.ack_drops if value else self.pkt_drops)["user"] += 1
+
+    @classmethod
+    def from_trace(cls, trace, until:float = None) -> "Metrics":
+        """Metrics of a recorded run up to simulated time `until` (the end by default)
+
+        Args:
+            trace: a simulation.Trace.TraceReader
+        """
+        config = trace.config
+        metrics = cls(config.window_size, config.num_packets)
+        for time, kind, cause, seq, value in trace:
+            if until is not None and time > until:
+                break
+            metrics(time, kind, seq, value, cause)
+        return metrics
+
+    @property
+    def elapsed(self) -> float:
+        return self.now - self.start if self.start is not None else 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Data packets sent per simulated second, retransmissions included"""
+        return self.sends / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def goodput(self) -> float:
+        """Packets acknowledged per simulated second"""
+        return self.base / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def utilisation(self) -> float:
+        """Mean fraction of the window in use over the run"""
+        total = sum(self.occupancy)
+        if not total or not self.window_size:
+            return 0.0
+        return sum(n * t for n, t in enumerate(self.occupancy)) / (total * self.window_size)
+
+    def to_dict(self) -> dict:
+        return {
+            "elapsed": self.elapsed, "num_packets": self.num_packets, "window_size": self.window_size,
+            "acknowledged": self.base, "sends": self.sends, "retransmissions": self.retransmissions,
+            "deliveries": self.deliveries, "duplicates": self.duplicates, "out_of_order": self.out_of_order,
+            "acks": self.acks, "stale_acks": self.stale_acks, "timeouts": self.timeouts,
+            "pkt_drops": dict(self.pkt_drops), "ack_drops": dict(self.ack_drops),
+            "loss_presets": self.loss_presets,
+            "throughput": self.throughput, "goodput": self.goodput, "window_utilisation": self.utilisation,
+            "rtt": self.rtt.to_dict(),
+            "window_occupancy": {str(n): t for n, t in enumerate(self.occupancy)},
+        }
+
+    def to_json(self, path:str, **extra):
+        """Write the metrics (and any extra fields, e.g. the seed) to a JSON file"""
+        with open(path, "w") as f:
+            json.dump({**extra, **self.to_dict()}, f, indent=2)
@@ -0,0 +1,243 @@
+# MonteCarlo runs thousands of independent Go-Back-N replicas in lockstep with NumPy
+# Each step processes the next event of every replica at once, so loss draws,
+# timers and window sliding are array operations instead of per-packet Python code
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from simulation.SimConfig import SimConfig
+
+# Event kinds, one row per kind in the (replicas, kinds, window) event-time array
+_SEND = 0
+_ARRIVE = 1
+_ACK = 2
+_TIMEOUT = 3     # only slot 0 is used: there is one retransmission timer per replica
+_NUM_KINDS = 4
+
+
+@dataclass
+class BatchResult:
+    """Per-replica outcome arrays of a Monte Carlo batch (one entry per replica)"""
+
+    completed: np.ndarray
+    completion_time: np.ndarray
+    transmissions: np.ndarray
+    retransmissions: np.ndarray
+    timeouts: np.ndarray
+    pkt_drops: np.ndarray
+    ack_drops: np.ndarray
+    num_packets: int
+
+    @property
+    def goodput(self) -> np.ndarray:
+        """Delivered packets per simulated second for every completed replica"""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(self.completed, self.num_packets / self.completion_time, 0.0)
+
+    def summary(self, percentiles=(5, 50, 95)) -> dict:
+        """Mean, standard deviation and percentiles of the completed replicas"""
+        done = self.completed
+        stats = {"replicas": int(done.size), "completed": int(done.sum())}
+        for name in ("completion_time", "retransmissions", "goodput"):
+            values = getattr(self, name)[done]
+            if values.size == 0:
+                continue
+            entry = {"mean": float(values.mean()), "std": float(values.std())}
+            for p, v in zip(percentiles, np.percentile(values, percentiles)):
+                entry[f"p{p}"] = float(v)
+            stats[name] = entry
+        return stats
+
+
+def run_batch(config:SimConfig, replicas:int, seed=None, max_time:float = None) -> BatchResult:
+    """Simulate `replicas` independent Go-Back-N runs of one configuration
+
+    Follows the same rules as Simulator: one retransmission timer on the
+    oldest unacknowledged packet that resends the whole window when it
+    expires, per-packet loss for data and ACKs, sends leaving in sequence order `stagger` apart.
+    Packet state is kept per window slot (seq % window_size), so memory is
+    O(replicas * window_size) whatever the number of packets. Copies of a
+    packet still in flight when it is acknowledged are discarded, a slot
+    keeps only its earliest pending event of each kind, and simultaneous
+    events of one replica are processed in kind order rather than insertion
+    order, so individual runs differ slightly from Simulator while the
+    distributions match.
+
+    Args:
+        config: parameters shared by every replica
+        replicas: number of independent runs
+        seed: seed for the NumPy random generator
+        max_time: give up on replicas still running at this simulated time
+    """
+    config.validate()
+    if config.protocol != "gbn":
+        raise ValueError("batch mode only simulates Go-Back-N, use simulation.Simulator for other protocols")
+    if config.bandwidth:
+        raise ValueError("batch mode models an unlimited link, use simulation.Simulator with a bandwidth")
+    if config.data_loss or config.ack_loss:
+        raise ValueError("batch mode draws independent losses, use simulation.Simulator with a loss model")
+    if config.re_timer < 2 * config.prop_delay:
+        raise ValueError("batch mode needs re_timer >= 2 * prop_delay (one copy of a packet in flight at a time)")
+    if config.per_pkt_loss >= 100 and max_time is None:
+        raise ValueError("a run with 100% loss never completes, pass max_time")
+
+    rng = np.random.default_rng(seed)
+    K = config.num_packets
+    R = config.window_size
+    B = replicas
+    loss = config.per_pkt_loss / 100
+    prop_delay = config.prop_delay
+    re_timer = config.re_timer
+    inf = np.inf
+
+    rows = np.arange(B)
+    slots = np.arange(R)
+
+    times = np.full((B, _NUM_KINDS, R), inf)    # pending event time per replica, kind and window slot
+    timer = times[:, _TIMEOUT, 0]               # view: deadline of the retransmission timer, inf when stopped
+    ack_val = np.zeros((B, R), dtype=np.int64)  # cumulative ACK carried by the pending ACK of a slot
+    in_flight = np.zeros((B, R), dtype=bool)    # slot handed to the sender and not yet acknowledged
+    sent_once = np.zeros((B, R), dtype=bool)    # packet in the slot was transmitted before
+    base = np.zeros(B, dtype=np.int64)          # oldest unacknowledged packet
+    next_seq = np.zeros(B, dtype=np.int64)      # one past the highest packet handed to the sender
+    expected = np.zeros(B, dtype=np.int64)      # next in-order packet at the receiver
+    now = np.zeros(B)
+    next_departure = np.zeros(B)                # earliest time the next queued send may leave
+    running = np.ones(B, dtype=bool)
+
+    completion_time = np.zeros(B)
+    transmissions = np.zeros(B, dtype=np.int64)
+    retransmissions = np.zeros(B, dtype=np.int64)
+    timeouts = np.zeros(B, dtype=np.int64)
+    pkt_drops = np.zeros(B, dtype=np.int64)
+    ack_drops = np.zeros(B, dtype=np.int64)
+
+    def slot_seqs(which):
+        """Packet number held by every window slot of the selected replicas"""
+        start = np.minimum(base[which], K - R)[:, None]
+        return start + (slots[None, :] - start) % R
+
+    def departures(which, queued, seqs):
+        """Send times of the `queued` slots of the selected replicas: in sequence order, `stagger` apart
+
+        Like Simulator._send_window, each replica's packets leave after the ones it queued before.
+        """
+        order = np.argsort(np.where(queued, seqs, np.iinfo(np.int64).max), axis=1)
+        rank = np.empty_like(order)
+        np.put_along_axis(rank, order, np.broadcast_to(slots, order.shape), axis=1)
+        start = np.maximum(now[which], next_departure[which])
+        next_departure[which] = start + config.stagger * queued.sum(axis=1)
+        return start[:, None] + config.stagger * rank
+
+    def send_window(which):
+        """Schedule the staggered send of every free slot in the window of the selected replicas"""
+        seqs = slot_seqs(which)
+        ready = (seqs >= base[which][:, None]) & ~in_flight[which]
+        departure = departures(which, ready, seqs)
+        r, s = np.nonzero(ready)
+        np.maximum.at(next_seq, which[r], seqs[r, s] + 1)
+        t = departure[r, s]
+        r = which[r]
+        in_flight[r, s] = True
+        times[r, _SEND, s] = t
+
+    def schedule(r, kind, s, t):
+        """Queue events, keeping a slot's earlier pending event of the same kind"""
+        times[r, kind, s] = np.minimum(times[r, kind, s], t)
+
+    send_window(rows)
+    flat = times.reshape(B, _NUM_KINDS * R)
+
+    while running.any():
+        active = np.nonzero(running)[0]
+        idx = flat[active].argmin(axis=1)
+        t = flat[active, idx]
+        if max_time is not None:
+            over = t > max_time
+            running[active[over]] = False
+            active, idx, t = active[~over], idx[~over], t[~over]
+            if active.size == 0:
+                break
+        kind = idx // R
+        slot = idx % R
+        now[active] = t
+        times[active, kind, slot] = inf
+        lost = rng.random(active.size) < loss
+
+        # data packet leaves the sender
+        m = kind == _SEND
+        if m.any():
+            r, s = active[m], slot[m]
+            transmissions[r] += 1
+            retransmissions[r] += sent_once[r, s]
+            sent_once[r, s] = True
+            stopped = timer[r] == inf
+            timer[r[stopped]] = now[r[stopped]] + re_timer
+            dropped = lost[m]
+            pkt_drops[r[dropped]] += 1
+            schedule(r[~dropped], _ARRIVE, s[~dropped], now[r[~dropped]] + prop_delay)
+
+        # data packet reaches the receiver, which answers with a cumulative ACK
+        m = kind == _ARRIVE
+        if m.any():
+            r, s = active[m], slot[m]
+            seq = slot_seqs(r)[np.arange(r.size), s]
+            expected[r] += seq == expected[r]
+            dropped = lost[m]
+            ack_drops[r[dropped]] += 1
+            keep_r, keep_s = r[~dropped], s[~dropped]
+            free = times[keep_r, _ACK, keep_s] == inf
+            keep_r, keep_s = keep_r[free], keep_s[free]
+            times[keep_r, _ACK, keep_s] = now[keep_r] + prop_delay
+            ack_val[keep_r, keep_s] = expected[keep_r]
+
+        # ACK reaches the sender, slide the window over the newly acknowledged packets
+        m = kind == _ACK
+        if m.any():
+            r, s = active[m], slot[m]
+            ack = ack_val[r, s]
+            advance = ack > base[r]
+            r, ack = r[advance], ack[advance]
+            if r.size:
+                seqs = slot_seqs(r)
+                acked = (seqs >= base[r][:, None]) & (seqs < ack[:, None])
+                rr, ss = np.nonzero(acked)
+                rr = r[rr]
+                in_flight[rr, ss] = False
+                sent_once[rr, ss] = False
+                times[rr, :_TIMEOUT, ss] = inf
+                base[r] = ack
+                finished = ack >= K
+                completion_time[r[finished]] = now[r[finished]]
+                running[r[finished]] = False
+                timer[r[finished]] = inf
+                r = r[~finished]
+                if r.size:
+                    send_window(r)
+                    # restart the timer for the new oldest packet, stop it when nothing is outstanding
+                    timer[r] = np.where(base[r] < next_seq[r], now[r] + re_timer, inf)
+
+        # retransmission timer expired: go back and resend every outstanding packet
+        m = kind == _TIMEOUT
+        if m.any():
+            r = active[m]
+            timeouts[r] += 1
+            timer[r] = now[r] + re_timer
+            seqs = slot_seqs(r)
+            outstanding = (seqs >= base[r][:, None]) & (seqs < next_seq[r][:, None])
+            departure = departures(r, outstanding, seqs)
+            rr, ss = np.nonzero(outstanding)
+            schedule(r[rr], _SEND, ss, departure[rr, ss])
+
+    completed = base >= K
+    return BatchResult(
+        completed=completed,
+        completion_time=np.where(completed, completion_time, np.nan),
+        transmissions=transmissions,
+        retransmissions=retransmissions,
+        timeouts=timeouts,
+        pkt_drops=pkt_drops,
+        ack_drops=ack_drops,
+        num_packets=K,
+    )
@@ -0,0 +1,254 @@
+# MultiFlow runs many independent ARQ flows that compete for one bottleneck link
+# Every flow keeps its own window and timers, all of them share one event queue, one link queue and one loss process
+
+import heapq
+import itertools
+import random
+import statistics
+from dataclasses import dataclass, field
+
+from simulation.Link import Link
+from simulation.LossModel import loss_streams
+from simulation.Protocols import make_protocol
+from simulation.SimConfig import SimConfig
+from simulation.Simulator import TIMEOUT, Simulator
+from simulation.TimerManager import TimerManager
+
+
+def jain_index(values) -> float:
+    """Jain's fairness index of `values`: 1 when all are equal, 1/n when one takes everything"""
+    values = list(values)
+    squares = sum(v * v for v in values)
+    if not squares:
+        return 0.0
+    return sum(values) ** 2 / (len(values) * squares)
+
+
+@dataclass
+class FlowResult:
+    """Outcome of one flow of a multi-flow run, times in simulated seconds since the start of the run"""
+
+    start: float = 0.0            # when the flow sent its first window
+    completed: bool = False       # every packet of the flow was acknowledged
+    completion_time: float = 0.0  # when its last ACK arrived
+    transmissions: int = 0        # data packets put on the link, including retransmissions
+    retransmissions: int = 0
+    timeouts: int = 0
+    num_packets: int = 0
+
+    @property
+    def duration(self) -> float:
+        """Seconds from the flow's start to its completion"""
+        return self.completion_time - self.start if self.completed else 0.0
+
+    @property
+    def goodput(self) -> float:
+        """Delivered packets per simulated second of the flow's lifetime"""
+        return self.num_packets / self.duration if self.duration > 0 else 0.0
+
+
+@dataclass
+class MultiFlowResult:
+    """Summary of a multi-flow run: per-flow outcomes and what they shared"""
+
+    flows: list[FlowResult] = field(default_factory=list)
+    completed: bool = False       # every flow completed
+    completion_time: float = 0.0  # when the last flow completed (or the run stopped)
+    delivered: int = 0            # packets acknowledged over all flows
+    pkt_drops: int = 0            # data packets lost on the link
+    ack_drops: int = 0
+    queue_drops: int = 0          # data packets refused by the shared link queue
+    utilisation: float = 0.0      # fraction of the run the shared link spent transmitting
+    mean_queue_delay: float = 0.0
+    max_queue_delay: float = 0.0
+    events: int = 0
+
+    @property
+    def aggregate_goodput(self) -> float:
+        """Packets delivered per simulated second over all flows"""
+        return self.delivered / self.completion_time if self.completion_time > 0 else 0.0
+
+    @property
+    def fairness(self) -> float:
+        """Jain's index of the goodput of the completed flows"""
+        return jain_index(flow.goodput for flow in self.flows if flow.completed)
+
+    def durations(self) -> list[float]:
+        """Completion times of the completed flows, measured from their own start"""
+        return [flow.duration for flow in self.flows if flow.completed]
+
+    def summary(self) -> str:
+        """Multi-line text of the aggregate figures and the spread of flow completion times"""
+        durations = sorted(self.durations())
+        lines = [f"flows {len(self.flows)}   completed {len(durations)}   time {self.completion_time:.2f}s"
+                 f"   aggregate goodput {self.aggregate_goodput:.2f} pkt/s   Jain's index {self.fairness:.3f}",
+                 f"drops pkt {self.pkt_drops}   ack {self.ack_drops}   queue {self.queue_drops}"
+                 f"   link utilisation {self.utilisation:.0%}   queueing {self.mean_queue_delay * 1000:.0f} ms"
+                 f" (max {self.max_queue_delay * 1000:.0f} ms)"]
+        if durations:
+            p95 = durations[min(len(durations) - 1, int(0.95 * len(durations)))]
+            lines.append(f"flow completion: mean {statistics.fmean(durations):.2f}s   median"
+                         f" {statistics.median(durations):.2f}s   p95 {p95:.2f}s   min {durations[0]:.2f}s"
+                         f"   max {durations[-1]:.2f}s")
+        return "\n".join(lines)
+
+
+class FlowTimers:
+    """The timers of one flow inside the TimerManager every flow shares, keyed on (flow, key)"""
+
+    __slots__ = ("timers", "flow")
+
+    def __init__(self, timers:TimerManager, flow:int):
+        self.timers = timers
+        self.flow = flow
+
+    def start(self, key, deadline:float):
+        self.timers.start((self.flow, key), deadline)
+
+    def cancel(self, key):
+        self.timers.cancel((self.flow, key))
+
+    def active(self, key) -> bool:
+        return self.timers.active((self.flow, key))
+
+
+class FlowSimulator(Simulator):
+    """One flow of a MultiFlowSimulator: a Simulator whose events, timers, link and losses are the run's
+
+    Its events are queued with the flow's index, so the run can hand each
+    one back to the flow's _step().
+    """
+
+    def __init__(self, run:"MultiFlowSimulator", flow:int):
+        config = run.config
+        self.config = config
+        self.rng = run.rng
+        self.protocol = make_protocol(config.protocol, config.num_packets, config.window_size, config.seq_bits)
+        self.loss = None
+        self._data_losses, self._ack_losses = run._data_losses, run._ack_losses
+        self.link = run.link
+        self.flow = flow
+        self._connect(run._queue, FlowTimers(run.timers, flow), run._tiebreak)
+
+    def schedule(self, delay:float, kind:int, seq:int, value:int = 0):
+        heapq.heappush(self._queue, (self.now + delay, next(self._tiebreak), kind, seq, value, self.flow))
+
+
+class MultiFlowSimulator:
+    """`flows` copies of the config's transfer over one shared bottleneck
+
+    Each flow is a FlowSimulator: its own protocol state machine (config.protocol
+    with num_packets, window_size and seq_bits), retransmission timers and
+    counters, run by the event rules of simulation.Simulator. The flows share
+    the event queue and timers, the loss process (per_pkt_loss or the
+    data_loss/ack_loss models), and with a config.bandwidth a single Link
+    whose queue their data packets compete for. Without a bandwidth the flows
+    only share the losses.
+
+    Args:
+        config: the transfer every flow makes and the link they share
+        flows: number of flows
+        seed: seed of the losses, the flow start times and RED
+        start_spread: flows start at random times within this many seconds, 0 starts them together
+    """
+
+    def __init__(self, config:SimConfig, flows:int, seed=None, start_spread:float = 0.0):
+        config.validate()
+        if flows < 1:
+            raise ValueError("flows must be at least 1")
+        if start_spread < 0:
+            raise ValueError("start_spread must be >= 0")
+        self.config = config
+        self.rng = random.Random(seed)
+        self._data_losses, self._ack_losses = loss_streams(config, seed)  # None when drawn from self.rng
+        self.link = Link.from_config(config, self.rng)
+        self._queue = []  # heap of (time, tiebreak, kind, seq, value, flow)
+        self.timers = TimerManager()  # keyed on (flow, TIMEOUT), or on (flow, seq) with per-packet timers
+        self._tiebreak = itertools.count()
+        self.flows = [FlowSimulator(self, flow) for flow in range(flows)]
+        starts = [start_spread * self.rng.random() for _ in range(flows)] if start_spread else [0.0] * flows
+        self.result = MultiFlowResult(flows=[FlowResult(start=start, num_packets=config.num_packets)
+                                             for start in starts])
+        for flow, start in zip(self.flows, starts):
+            flow.now = start
+            flow._send_window()
+        self.now = 0.0
+
+    def loss_rates(self) -> tuple[float, float]:
+        """Long-run (data, ACK) loss fractions"""
+        return tuple(self.config.per_pkt_loss / 100 if stream is None else stream.model.rate
+                     for stream in (self._data_losses, self._ack_losses))
+
+    def completed_flows(self) -> int:
+        """Flows whose every packet is acknowledged so far"""
+        return sum(flow.result.completed for flow in self.flows)
+
+    def run(self, max_time:float = None, max_events:int = None) -> MultiFlowResult:
+        """Process events until every flow completes or a limit is reached
+
+        Calling it again continues a stopped run, e.g. max_events at a time.
+
+        Args:
+            max_time: stop once the simulated clock passes this many seconds
+            max_events: stop after processing this many events
+        """
+        if max(self.loss_rates()) >= 1 and max_time is None and max_events is None:
+            raise ValueError("a run with 100% loss never completes, pass max_time or max_events")
+
+        result = self.result
+        flows = self.flows
+        queue = self._queue
+        timers = self.timers
+        per_packet = flows[0].protocol.per_packet_timers
+        remaining = sum(not flow.protocol.done for flow in flows)
+        while remaining:
+            if max_events is not None and result.events >= max_events:
+                break
+            timer = timers.next_timer()
+            if queue and (timer is None or queue[0][0] <= timer[1]):
+                time, _, kind, seq, value, index = heapq.heappop(queue)
+                flow = flows[index]
+            elif timer is not None:
+                (index, key), time = timer
+                flow = flows[index]
+                kind, seq, value = TIMEOUT, key if per_packet else flow.protocol.base, 0
+            else:
+                break
+            if max_time is not None and time > max_time:
+                if kind != TIMEOUT:
+                    heapq.heappush(queue, (time, -1, kind, seq, value, index))  # keep it for a later run()
+                break
+            self.now = time
+            result.events += 1
+            stats = flow.result
+            completed = stats.completed
+            flow._step(time, kind, seq, value)  # events of a finished flow only count its late drops
+            if stats.completed is not completed:
+                remaining -= 1
+
+        result.completed = not remaining
+        result.completion_time = self.now
+        result.delivered = result.pkt_drops = result.ack_drops = result.queue_drops = 0
+        for flow, stats in zip(flows, result.flows):
+            counts = flow.result
+            stats.completed = counts.completed
+            stats.completion_time = counts.completion_time
+            stats.transmissions = counts.transmissions
+            stats.retransmissions = counts.retransmissions
+            stats.timeouts = counts.timeouts
+            result.delivered += flow.protocol.base
+            result.pkt_drops += counts.pkt_drops
+            result.ack_drops += counts.ack_drops
+            result.queue_drops += counts.queue_drops
+        link = self.link
+        if link is not None:
+            result.utilisation = link.utilisation(self.now)
+            result.mean_queue_delay = link.mean_queue_delay
+            result.max_queue_delay = link.max_queue_delay
+        return result
+
+
+def simulate_flows(config:SimConfig, flows:int, seed=None, start_spread:float = 0.0,
+                   max_time:float = None) -> MultiFlowResult:
+    """Run `flows` copies of config's transfer over one shared bottleneck and return the summary"""
+    return MultiFlowSimulator(config, flows, seed, start_spread).run(max_time=max_time)
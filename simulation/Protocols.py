@@ -0,0 +1,32 @@
+# Protocols maps the protocol names used in SimConfig to their state machines
+# Every protocol implements the GoBackNProtocol interface
+
+from simulation.GoBackNProtocol import GoBackNProtocol
+from simulation.SelectiveRepeatProtocol import SelectiveRepeatProtocol
+from simulation.StopAndWaitProtocol import StopAndWaitProtocol
+
+PROTOCOLS = {  # SimConfig.protocol -> protocol class
+    "gbn": GoBackNProtocol,
+    "sr": SelectiveRepeatProtocol,
+    "sw": StopAndWaitProtocol,
+}
+
+
+def make_protocol(name:str, num_packets:int, window_size:int, seq_bits:int = 0) -> GoBackNProtocol:
+    """New protocol state machine for `name` (a key of PROTOCOLS)"""
+    try:
+        protocol = PROTOCOLS[name]
+    except KeyError:
+        raise ValueError(f"unknown protocol {name!r}, expected one of {', '.join(PROTOCOLS)}") from None
+    return protocol(num_packets, window_size, seq_bits)
+
+
+def max_window_size(name:str, num_packets:int, seq_bits:int = 0) -> int:
+    """Largest window size setting protocol `name` accepts for K packets and seq_bits sequence numbers
+
+    Stop-and-Wait ignores the setting and always accepts up to K
+    """
+    limit = PROTOCOLS[name].max_window(seq_bits)
+    if limit is None or name == "sw":
+        return num_packets
+    return min(num_packets, limit)
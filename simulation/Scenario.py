@@ -0,0 +1,165 @@
+# Scenario files describe headless runs in JSON or TOML: SimConfig fields plus a name, a seed and a time limit
+# Loading and running them needs nothing from the GUI, so batches of scenarios start quickly on servers and in CI
+
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field, fields
+
+from simulation.LossModel import TraceLoss, parse_loss
+from simulation.Metrics import Metrics
+from simulation.SimConfig import SimConfig
+from simulation.Simulator import Simulator
+
+CONFIG_KEYS = tuple(f.name for f in fields(SimConfig))
+ALIASES = {"K": "num_packets", "R": "window_size"}  # the names the GUI and the README use
+SCENARIO_KEYS = ("name", "seed", "max_time")
+_TYPES = {**{f.name: f.type for f in fields(SimConfig)}, "max_time": "float"}  # annotations, as strings or types
+
+
+@dataclass
+class Scenario:
+    """One headless run: a validated SimConfig and how to run it"""
+
+    name: str
+    config: SimConfig = field(default_factory=SimConfig)
+    seed: object = None       # int or str, None draws one that is reported with the results
+    max_time: float = 1e6     # simulated seconds after which the run is recorded as not completed
+    source: str = ""          # file the scenario came from
+
+
+def _read(path:str):
+    if path.endswith(".toml"):
+        try:
+            import tomllib
+        except ImportError:  # Python < 3.11
+            try:
+                import tomli as tomllib
+            except ImportError as e:
+                raise ImportError("TOML scenarios need Python 3.11 or the tomli package, or use JSON") from e
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    with open(path) as f:
+        return json.load(f)
+
+
+def _check_types(values:dict):
+    """Raise ValueError for a parameter whose value is not of its field's type (a float field takes ints too)"""
+    for key, value in values.items():
+        kind = getattr(_TYPES.get(key), "__name__", _TYPES.get(key))
+        if kind == "int":
+            ok = isinstance(value, int) and not isinstance(value, bool)
+        elif kind == "float":
+            ok = isinstance(value, (int, float)) and not isinstance(value, bool)
+        elif kind == "str":
+            ok = isinstance(value, str)
+        elif key == "seed":
+            ok = value is None or isinstance(value, (int, str)) and not isinstance(value, bool)
+        else:
+            continue
+        if not ok:
+            expected = {"int": "an integer", "float": "a number", "str": "a string"}.get(kind, "an integer or a string")
+            raise ValueError(f"{key} must be {expected}, not {value!r}")
+
+
+def _load_traces(config:SimConfig):
+    """Read the loss traces a config names, so a missing or empty file fails now rather than in a worker"""
+    for spec in (config.data_loss, config.ack_loss):
+        model = parse_loss(spec)
+        if isinstance(model, TraceLoss):
+            try:
+                model.mask()
+            except OSError as e:
+                raise ValueError(f"cannot read loss trace {model.path}: {e.strerror or e}") from None
+
+
+def _scenario(values:dict, path:str, index:int) -> Scenario:
+    values = {ALIASES.get(key, key): value for key, value in values.items()}
+    unknown = set(values) - set(CONFIG_KEYS) - set(SCENARIO_KEYS)
+    if unknown:
+        raise ValueError(f"{path}: unknown scenario keys {', '.join(sorted(unknown))}")
+    for key in ("data_loss", "ack_loss"):  # loss traces are found next to the scenario file
+        spec = values.get(key, "")
+        if isinstance(spec, str) and spec.startswith("trace:") and not os.path.isabs(spec[6:]):
+            values[key] = "trace:" + os.path.join(os.path.dirname(path), spec[6:])
+    name = values.pop("name", None) or os.path.splitext(os.path.basename(path))[0] + (f"[{index}]" if index else "")
+    try:
+        _check_types(values)
+        scenario = Scenario(str(name), SimConfig(**{key: values.pop(key) for key in CONFIG_KEYS if key in values}),
+                            source=path, **values)
+        scenario.config.validate()
+        _load_traces(scenario.config)
+    except ValueError as e:
+        raise ValueError(f"{path}: scenario {name}: {e}") from None
+    return scenario
+
+
+def load_scenarios(path:str) -> list[Scenario]:
+    """Scenarios of a .json or .toml file, raising ValueError for unknown keys or invalid parameters
+
+    A file holds one scenario as a table of SimConfig fields (K and R are
+    accepted for num_packets and window_size), "name", "seed" and "max_time".
+    A "scenarios" list instead gives several, the other top-level keys are
+    then defaults they override. A JSON file may also be a plain list.
+    Relative loss trace paths are relative to the file. Values are checked
+    against the types of the SimConfig fields, and loss traces are read, so
+    a loaded scenario does not fail on its parameters once it runs.
+    """
+    data = _read(path)
+    if isinstance(data, list):
+        data = {"scenarios": data}
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: expected a table of parameters or a list of them")
+    defaults = {key: value for key, value in data.items() if key != "scenarios"}
+    if "scenarios" not in data:
+        return [_scenario(defaults, path, 0)]
+    scenarios = []
+    for index, values in enumerate(data["scenarios"], 1):
+        if not isinstance(values, dict):
+            raise ValueError(f"{path}: scenario {index} is not a table of parameters")
+        scenarios.append(_scenario({**defaults, **values}, path, index))
+    return scenarios
+
+
+def run_scenario(scenario:Scenario, metrics:bool = False) -> dict:
+    """Simulate one scenario and return its parameters, seed and results as plain JSON-ready values
+
+    With metrics the full simulation.Metrics counters and histograms are included.
+    """
+    seed = scenario.seed if scenario.seed is not None else random.randrange(2**31)
+    simulator = Simulator(scenario.config, seed)
+    observer = None
+    if metrics:
+        observer = Metrics(simulator.protocol.window_size, scenario.config.num_packets)
+        simulator.observers.append(observer)
+    result = simulator.run(max_time=scenario.max_time)
+    row = {"name": scenario.name, "source": scenario.source, "seed": seed, "config": asdict(scenario.config),
+           "result": {**asdict(result), "goodput": result.goodput}}
+    if observer is not None:
+        row["metrics"] = observer.to_dict()
+    return row
+
+
+def _run_checked(scenario:Scenario, metrics:bool) -> dict:
+    """run_scenario(), or a row with an "error" message naming the file and scenario if the run raised"""
+    try:
+        return run_scenario(scenario, metrics)
+    except Exception as e:
+        return {"name": scenario.name, "source": scenario.source, "seed": scenario.seed,
+                "error": f"{scenario.source}: scenario {scenario.name}: {type(e).__name__}: {e}"}
+
+
+def run_scenarios(scenarios:list[Scenario], workers:int = None, metrics:bool = False):
+    """Yield run_scenario() of every scenario in order, run in `workers` processes (every core by default)
+
+    workers=1 runs them one after another in this process. A scenario whose
+    run raises yields a row with an "error" message instead of results, the
+    others still run.
+    """
+    if workers == 1 or len(scenarios) <= 1:
+        for scenario in scenarios:
+            yield _run_checked(scenario, metrics)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(_run_checked, scenarios, [metrics] * len(scenarios))
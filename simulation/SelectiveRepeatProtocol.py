@@ -0,0 +1,91 @@
+# SelectiveRepeatProtocol acknowledges and retransmits packets one by one, the receiver buffers out-of-order ones
+# Same interface as GoBackNProtocol, so the GUI and the headless simulator drive it unchanged
+
+from simulation.GoBackNProtocol import GoBackNProtocol
+from simulation.SeqRing import SeqRing
+
+
+class SelectiveRepeatProtocol(GoBackNProtocol):
+    """Selective Repeat sender and receiver state
+
+    The receiver accepts any packet inside its window (expected to
+    expected + N - 1), buffers it and delivers in order. Every arrival is
+    acknowledged for that packet alone, including duplicates below the
+    window whose earlier ACK may have been lost. ACK values still carry the
+    receiver's cumulative progress for traces and metrics, but the sender
+    only uses the packet an ACK is for.
+
+    Each outstanding packet has its own retransmission timer, and a timeout
+    resends only that packet.
+
+    With wrapped sequence numbers the receiver also re-acknowledges packets
+    up to a window below its own, so the sequence space must hold two windows.
+    """
+
+    name = "Selective Repeat"
+    per_packet_timers = True
+
+    @classmethod
+    def max_window(cls, seq_bits:int) -> int:
+        return 2**(seq_bits - 1) if seq_bits else None
+
+    def reset(self):
+        super().reset()
+        self.acked = SeqRing(self.window_size)  # sender: packets acknowledged, also above base
+        self.received = SeqRing(self.window_size)  # receiver: packets buffered in the receive window
+
+    def is_acked(self, seq:int) -> bool:
+        return seq < self.base or self.acked[seq]
+
+    @property
+    def timer_needed(self) -> bool:
+        return any(self.in_flight[seq] for seq in range(self.base, self.next_seq))
+
+    def sendable(self) -> list[int]:
+        if self.window_size <= 0 or self.done:
+            return []
+        start, end = self.window_bounds()
+        ready = []
+        for seq in range(max(start, self.base), end + 1):
+            if not self.in_flight[seq] and not self.acked[seq]:
+                self.in_flight[seq] = True
+                ready.append(seq)
+        if ready:
+            self.next_seq = max(self.next_seq, ready[-1] + 1)
+        return ready
+
+    def abandon_in_flight(self):
+        for seq in range(self.base, self.next_seq):
+            self.in_flight[seq] = False
+        self.next_seq = self.base
+
+    def packet_arrived(self, seq:int) -> int:
+        """Receiver side: buffer a packet of the receive window and deliver what is now in order"""
+        seq = self.unwrap(self.wire(seq), self.expected)
+        if self.expected <= seq < self.expected + self.window_size:
+            self.received[seq] = True
+            while self.expected < self.num_packets and self.received[self.expected]:
+                self.expected += 1
+        return self.expected
+
+    def has_received(self, seq:int) -> bool:
+        return seq < self.expected or self.received[seq]
+
+    def ack_arrived(self, ack:int, seq:int = None) -> list[int]:
+        """Sender side: acknowledge packet `seq` and slide the window past acknowledged packets"""
+        if seq is None:
+            return []
+        seq = self.unwrap(self.wire(seq), self.base)
+        if seq >= min(self.next_seq, self.num_packets) or self.is_acked(seq):
+            return []  # duplicate, or for a packet below the window
+        self.acked[seq] = True
+        self.in_flight[seq] = False
+        while self.base < self.num_packets and self.acked[self.base]:
+            self.base += 1
+        return [seq]
+
+    def timeout(self, seq:int = None) -> list[int]:
+        """The timer of `seq` expired: resend that packet alone"""
+        if seq is None or seq >= self.num_packets or self.is_acked(seq):
+            return []
+        return [seq]
@@ -0,0 +1,37 @@
+# SeqRing holds per-packet values for the packets of a sliding window in a fixed number of slots
+# Memory depends on the window size, not on how many packets a run transfers
+
+class SeqRing:
+    """Values indexed by packet number, for packets no more than `size` apart
+
+    Packet seq lives in slot seq % size. Each slot remembers which packet
+    wrote it, so reading a packet whose slot was never written or has been
+    taken over by a later packet gives `default`. Packets older than the
+    window therefore read as default: callers check them against the window
+    edges first.
+
+    Args:
+        size: number of slots, at least the window size
+        default: value of packets that have no slot
+    """
+
+    __slots__ = ("size", "default", "_owner", "_values")
+
+    def __init__(self, size:int, default=False):
+        self.size = max(size, 1)
+        self.default = default
+        self._owner = [-1] * self.size  # packet stored in every slot, -1 for none
+        self._values = [default] * self.size
+
+    def __getitem__(self, seq:int):
+        slot = seq % self.size
+        return self._values[slot] if self._owner[slot] == seq else self.default
+
+    def __setitem__(self, seq:int, value):
+        slot = seq % self.size
+        self._owner[slot] = seq
+        self._values[slot] = value
+
+    def clear(self):
+        self._owner = [-1] * self.size
+        self._values = [self.default] * self.size
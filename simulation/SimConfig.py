@@ -0,0 +1,74 @@
+# SimConfig holds the parameters of a single Go-Back-N run
+# Shared by the headless simulator and the GUI so both use the same units
+
+from dataclasses import dataclass
+
+from simulation.Link import QUEUE_POLICIES
+from simulation.LossModel import parse_loss
+from simulation.Protocols import PROTOCOLS, max_window_size
+
+
+@dataclass
+class SimConfig:
+    """Go-Back-N protocol parameters for one simulation run
+
+    Times are in seconds. The GUI sliders work in tenths of a second,
+    use from_sliders() to convert their values.
+    """
+
+    num_packets: int = 10       # Total number of packets to send (K)
+    window_size: int = 3        # Sender window size (N in Go-Back-N)
+    prop_delay: float = 2.0     # One-way propagation delay in seconds
+    re_timer: float = 5.0       # Retransmission timer in seconds
+    per_pkt_loss: float = 0     # Packet/ACK loss percentage (0-100)
+    stagger: float = 0.05       # Gap between packets sent back to back in seconds
+    protocol: str = "gbn"       # ARQ protocol, a key of simulation.Protocols.PROTOCOLS
+    bandwidth: float = 0        # Bottleneck link rate in bytes per second, 0 for an unlimited link sending every `stagger`
+    packet_size: int = 1000     # Bytes per data packet
+    queue_limit: int = 0        # Packets that may wait for the link, 0 for unbounded
+    queue_policy: str = "tail"  # What a full link queue does: "tail" drop or "red" (random early detection)
+    data_loss: str = ""         # Loss model of data packets (simulation.LossModel.parse_loss), "" for independent per_pkt_loss
+    ack_loss: str = ""          # Loss model of ACKs, "" for the same model as data packets
+    seq_bits: int = 0           # Bits of the sequence number field, numbers wrap modulo 2**seq_bits; 0 for unbounded
+
+    @classmethod
+    def from_sliders(cls, prop_delay:int, re_timer:int, per_pkt_loss:int, window_size:int, num_packets:int,
+                     **settings):
+        """Build a config from the raw SettingsWindow slider values (slider value * 0.1 = seconds)
+
+        Other settings (protocol, link) are passed through as keywords in their own units
+        """
+        return cls(num_packets=num_packets, window_size=window_size,
+                   prop_delay=prop_delay*.1, re_timer=re_timer*.1, per_pkt_loss=per_pkt_loss, **settings)
+
+    @property
+    def transmission_delay(self) -> float:
+        """Seconds to put one data packet on the link, 0 for an unlimited link"""
+        return self.packet_size / self.bandwidth if self.bandwidth else 0.0
+
+    def validate(self):
+        """Raise ValueError if the parameters cannot describe a Go-Back-N run"""
+        if self.num_packets < 1:
+            raise ValueError("num_packets must be at least 1")
+        if not 1 <= self.window_size <= self.num_packets:
+            raise ValueError("window_size must be between 1 and num_packets")
+        if self.prop_delay < 0 or self.re_timer <= 0:
+            raise ValueError("prop_delay must be >= 0 and re_timer must be > 0")
+        if not 0 <= self.per_pkt_loss <= 100:
+            raise ValueError("per_pkt_loss must be a percentage between 0 and 100")
+        if self.protocol not in PROTOCOLS:
+            raise ValueError(f"protocol must be one of {', '.join(PROTOCOLS)}")
+        if not 0 <= self.seq_bits <= 32:
+            raise ValueError("seq_bits must be between 0 (unbounded) and 32")
+        if self.window_size > max_window_size(self.protocol, self.num_packets, self.seq_bits):
+            limit = PROTOCOLS[self.protocol].max_window(self.seq_bits)
+            raise ValueError(f"window_size {self.window_size} does not fit {self.seq_bits}-bit sequence numbers,"
+                             f" {PROTOCOLS[self.protocol].name} allows at most {limit}")
+        if self.bandwidth < 0 or self.packet_size < 1 or self.queue_limit < 0:
+            raise ValueError("bandwidth and queue_limit must be >= 0 and packet_size must be >= 1")
+        if self.queue_policy not in QUEUE_POLICIES:
+            raise ValueError(f"queue_policy must be one of {', '.join(QUEUE_POLICIES)}")
+        if self.queue_policy == "red" and not self.queue_limit:
+            raise ValueError("the red queue policy needs a queue_limit")
+        parse_loss(self.data_loss)
+        parse_loss(self.ack_loss)
@@ -0,0 +1,309 @@
+# Simulator runs the ARQ protocols as a discrete-event simulation with no Qt dependency
+# Events sit in a priority queue keyed on simulated time, so a run is bounded by CPU, not by animations
+
+import hashlib
+import heapq
+import itertools
+import random
+import struct
+from dataclasses import dataclass
+
+from simulation.GoBackNProtocol import GoBackNProtocol
+from simulation.Link import Link
+from simulation.LossModel import loss_streams
+from simulation.Protocols import make_protocol
+from simulation.SeqRing import SeqRing
+from simulation.SimConfig import SimConfig
+from simulation.TimerManager import TimerManager
+
+# Event kinds, passed to observers together with the simulated time
+SEND = 0         # sender transmits a data packet
+PKT_ARRIVE = 1   # data packet reaches the receiver
+PKT_DROP = 2     # data packet is lost halfway (same place the GUI kills it)
+ACK_ARRIVE = 3   # ACK reaches the sender
+ACK_DROP = 4     # ACK is lost halfway
+TIMEOUT = 5      # retransmission timer of the window (or of packet seq) expires
+WINDOW_SLIDE = 6 # an ACK moved the window, seq is the new base
+USER_KILL = 7    # the user clicked a packet away in the GUI, value is 1 for an ACK
+
+EVENT_NAMES = ("send", "pkt_arrive", "pkt_drop", "ack_arrive", "ack_drop", "timeout", "window_slide", "user_kill")
+
+# Why a packet or ACK was dropped, passed with PKT_DROP and ACK_DROP events to traces
+DROP_RANDOM = 0  # per-packet loss probability
+DROP_MANUAL = 1  # loss preset by clicking the sender or receiver
+DROP_QUEUE = 2   # refused by a full link queue (tail drop or RED), dropped at the sender
+
+
+@dataclass
+class SimResult:
+    """Summary of a finished (or stopped) headless run"""
+
+    completed: bool = False       # every packet was acknowledged
+    completion_time: float = 0.0  # simulated seconds until the last ACK arrived
+    transmissions: int = 0        # data packets put on the link, including retransmissions
+    retransmissions: int = 0      # data packets sent more than once
+    pkt_drops: int = 0            # data packets lost on the link
+    ack_drops: int = 0            # ACKs lost on the link
+    timeouts: int = 0             # times the retransmission timer expired
+    queue_drops: int = 0          # data packets refused by the link queue
+    utilisation: float = 0.0      # fraction of the run the link spent transmitting, 0 for an unlimited link
+    mean_queue_delay: float = 0.0 # seconds packets waited for the link on average
+    max_queue_delay: float = 0.0  # longest wait for the link in seconds
+    events: int = 0               # events processed by the simulator
+    num_packets: int = 0
+
+    @property
+    def goodput(self) -> float:
+        """Delivered packets per simulated second"""
+        return self.num_packets / self.completion_time if self.completion_time > 0 else 0.0
+
+
+class KeyedLoss:
+    """Loss decisions that depend only on the seed and which transmission is decided
+
+    The `attempt`-th transmission of packet `seq` (or of its ACK) is lost or
+    not regardless of what happened before, so runs of different protocols
+    with the same seed see identical loss patterns. Pass it as the `loss` of
+    a Simulator.
+    """
+
+    def __init__(self, seed, per_pkt_loss:float):
+        self.key = hashlib.blake2b(repr(seed).encode(), digest_size=16).digest()
+        self.threshold = per_pkt_loss / 100 * 2**64
+
+    def __call__(self, is_ack:bool, seq:int, attempt:int) -> bool:
+        digest = hashlib.blake2b(struct.pack("<?QQ", is_ack, seq, attempt), digest_size=8, key=self.key).digest()
+        return int.from_bytes(digest, "little") < self.threshold
+
+
+class Simulator:
+    """Headless ARQ run driven by a simulated clock
+
+    Uses the same protocol state machines as the GUI panel (Go-Back-N unless
+    config.protocol says otherwise) and the same timing rules: one
+    retransmission timer on the oldest unacknowledged packet whose expiry
+    resends the whole window from base, or one timer per packet for
+    protocols with per_packet_timers, losses decided per packet, and packets
+    leaving in the order they are sent, at least `stagger` seconds apart.
+
+    With a config.bandwidth the stagger is replaced by a Link: data packets
+    queue for it, take config.transmission_delay to send and may be dropped
+    by its queue. ACKs are small and travel back with the propagation delay
+    alone.
+
+    With config.seq_bits the protocol only sees wrapped sequence numbers,
+    observers still get packet indexes and cumulative ACK values. Per-packet
+    counters are kept for the window alone, so memory does not grow with
+    num_packets.
+
+    Timers live in a TimerManager next to the event queue, so restarting
+    them never leaves stale timeout events behind.
+
+    Observers are called as observer(time, kind, seq, value, cause) for every
+    event: value is the cumulative ACK for PKT_ARRIVE, ACK_ARRIVE and
+    ACK_DROP, cause is DROP_RANDOM unless noted. A WINDOW_SLIDE follows every
+    ACK_ARRIVE that moves the window, and a PKT_DROP with cause DROP_QUEUE
+    follows a SEND the link queue refused.
+
+    Losses are independent draws from the seeded generator at per_pkt_loss,
+    unless config.data_loss or config.ack_loss names a loss model (bursty,
+    trace-driven), whose decisions are precomputed per transmission.
+
+    Args:
+        loss: optional callable loss(is_ack, seq, attempt) -> bool replacing both,
+            e.g. a KeyedLoss shared by several runs
+    """
+
+    def __init__(self, config:SimConfig, seed=None, protocol:GoBackNProtocol = None, loss=None):
+        config.validate()
+        self.config = config
+        self.rng = random.Random(seed)
+        self.protocol = protocol or make_protocol(config.protocol, config.num_packets, config.window_size,
+                                                  config.seq_bits)
+        self.loss = loss
+        self._data_losses, self._ack_losses = loss_streams(config, seed)  # None when drawn from self.rng
+        self.link = Link.from_config(config, self.rng)  # None for an unlimited link
+        self._connect([], TimerManager(), itertools.count())
+
+    def _connect(self, queue:list, timers, tiebreak):
+        """Reset the state of the transfer, whose events and timers go to `queue` and `timers`"""
+        self.observers = []  # callables notified of every processed event
+        self.now = 0.0
+        self._queue = queue               # heap of (time, tiebreak, kind, seq, value)
+        self.timers = timers              # the retransmission timer of the window, or one per packet
+        self._tiebreak = tiebreak
+        self._sent = SeqRing(self.protocol.window_size, 0)  # transmissions of every packet of the window so far
+        self._acks = SeqRing(self.protocol.window_size, 0)  # ACKs sent for every packet of the window so far
+        self._next_departure = 0.0  # earliest time the next queued SEND may leave
+        self.result = SimResult(num_packets=self.config.num_packets)
+
+    def schedule(self, delay:float, kind:int, seq:int, value:int = 0):
+        """Queue an event `delay` simulated seconds from now"""
+        heapq.heappush(self._queue, (self.now + delay, next(self._tiebreak), kind, seq, value))
+
+    def _send_window(self, packets=None):
+        """Queue a SEND for every packet the protocol allows (or `packets`), staggered like the GUI
+
+        Packets leave in the order they are queued, `stagger` seconds after the
+        previous one, so a packet never overtakes an earlier one on the wire.
+        """
+        stagger = 0.0 if self.link else self.config.stagger  # the link spaces packets itself
+        now = self.now
+        departure = max(now, self._next_departure)
+        for seq in self.protocol.sendable() if packets is None else packets:
+            self.schedule(departure - now, SEND, seq)
+            departure += stagger
+        self._next_departure = departure
+
+    def _lost(self, is_ack:bool, seq:int, attempt:int) -> bool:
+        if self.loss is not None:
+            return self.loss(is_ack, seq, attempt)
+        stream = self._ack_losses if is_ack else self._data_losses
+        if stream is not None:
+            return stream()
+        return self.rng.random() * 100 < self.config.per_pkt_loss
+
+    def loss_rates(self) -> tuple[float, float]:
+        """Long-run (data, ACK) loss fractions"""
+        if self.loss is not None:
+            return self.config.per_pkt_loss / 100, self.config.per_pkt_loss / 100
+        return tuple(self.config.per_pkt_loss / 100 if stream is None else stream.model.rate
+                     for stream in (self._data_losses, self._ack_losses))
+
+    def _step(self, time:float, kind:int, seq:int, value:int):
+        """Process one event at `time`: the protocol's reaction, the timers it moves and the events it queues"""
+        self.now = time
+        result = self.result
+        result.events += 1
+        protocol = self.protocol
+        timers = self.timers
+        config = self.config
+        slid = refused = False  # the ACK moved the window, the SEND was dropped by the link queue
+
+        if kind == SEND:
+            if protocol.is_acked(seq):
+                return  # acknowledged while waiting for its turn to be resent
+            result.transmissions += 1
+            sent = self._sent
+            attempt = sent[seq]
+            if attempt:
+                result.retransmissions += 1
+            if protocol.per_packet_timers:
+                timers.start(seq, time + config.re_timer)  # (re)start the timer of this packet
+            elif not timers.active(TIMEOUT):
+                timers.start(TIMEOUT, time + config.re_timer)
+            wait = 0.0
+            link = self.link
+            if link is not None:
+                start = link.admit(time)
+                refused = start is None
+                if not refused:
+                    wait = start - time + link.transmission_delay  # queueing and serialisation
+            if refused:
+                result.queue_drops += 1
+            elif self._lost(False, seq, attempt):
+                self.schedule(wait + config.prop_delay / 2, PKT_DROP, seq)
+            else:
+                self.schedule(wait + config.prop_delay, PKT_ARRIVE, seq)
+            sent[seq] = attempt + 1
+        elif kind == PKT_ARRIVE:
+            ack = value = protocol.packet_arrived(seq)
+            acks = self._acks
+            attempt = acks[seq]
+            if self._lost(True, seq, attempt):
+                self.schedule(config.prop_delay / 2, ACK_DROP, seq, ack)
+            else:
+                self.schedule(config.prop_delay, ACK_ARRIVE, seq, ack)
+            acks[seq] = attempt + 1
+        elif kind == ACK_ARRIVE:
+            base = protocol.base
+            newly_acked = protocol.ack_arrived(value, seq)
+            if newly_acked:
+                slid = protocol.base != base
+                per_packet = protocol.per_packet_timers
+                if per_packet:
+                    for acked in newly_acked:
+                        timers.cancel(acked)
+                if protocol.done:
+                    timers.cancel(TIMEOUT)  # per-packet timers went with their packets
+                    result.completed = True
+                    result.completion_time = time
+                elif slid:
+                    self._send_window()
+                    if not per_packet:
+                        if protocol.timer_needed:
+                            timers.start(TIMEOUT, time + config.re_timer)  # restart for the new oldest packet
+                        else:
+                            timers.cancel(TIMEOUT)
+        elif kind == TIMEOUT:
+            result.timeouts += 1
+            if protocol.per_packet_timers:
+                timers.start(seq, time + config.re_timer)
+                self._send_window(protocol.timeout(seq))  # resend that packet alone
+            else:
+                timers.start(TIMEOUT, time + config.re_timer)
+                self._send_window(protocol.timeout())  # go back N: resend everything outstanding
+        elif kind == PKT_DROP:
+            result.pkt_drops += 1
+        elif kind == ACK_DROP:
+            result.ack_drops += 1
+
+        observers = self.observers
+        if observers:
+            for observer in observers:
+                observer(time, kind, seq, value, DROP_RANDOM)
+            if slid:
+                for observer in observers:
+                    observer(time, WINDOW_SLIDE, protocol.base, 0, DROP_RANDOM)
+            if refused:
+                for observer in observers:
+                    observer(time, PKT_DROP, seq, 0, DROP_QUEUE)
+
+    def run(self, max_time:float = None, max_events:int = None) -> SimResult:
+        """Process events until every packet is acknowledged or a limit is reached
+
+        Args:
+            max_time: stop once the simulated clock passes this many seconds
+            max_events: stop after processing this many events
+        """
+        if max(self.loss_rates()) >= 1 and max_time is None and max_events is None:
+            raise ValueError("a run with 100% loss never completes, pass max_time or max_events")
+
+        protocol = self.protocol
+        result = self.result
+        queue = self._queue
+        timers = self.timers
+        per_packet = protocol.per_packet_timers
+        step = self._step
+
+        if not queue and not protocol.done:
+            self._send_window()
+
+        while not protocol.done:
+            if max_events is not None and result.events >= max_events:
+                break
+            timer = timers.next_timer()
+            if queue and (timer is None or queue[0][0] <= timer[1]):
+                time, _, kind, seq, value = heapq.heappop(queue)
+            elif timer is not None:
+                key, time = timer
+                kind, seq, value = TIMEOUT, key if per_packet else protocol.base, 0
+            else:
+                break
+            if max_time is not None and time > max_time:
+                if kind != TIMEOUT:
+                    heapq.heappush(queue, (time, -1, kind, seq, value))  # keep it for a later run()
+                break
+            step(time, kind, seq, value)
+
+        link = self.link
+        if link is not None:
+            result.utilisation = link.utilisation(self.now)
+            result.mean_queue_delay = link.mean_queue_delay
+            result.max_queue_delay = link.max_queue_delay
+        return result
+
+
+def simulate(config:SimConfig, seed=None, max_time:float = None) -> SimResult:
+    """Run one headless simulation of config.protocol and return its summary"""
+    return Simulator(config, seed).run(max_time=max_time)
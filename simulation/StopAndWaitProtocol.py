@@ -0,0 +1,16 @@
+# StopAndWaitProtocol sends one packet and waits for its ACK before the next
+# It is Go-Back-N with a window of one packet, whatever window size it is given
+
+from simulation.GoBackNProtocol import GoBackNProtocol
+
+
+class StopAndWaitProtocol(GoBackNProtocol):
+    """Stop-and-Wait: a single outstanding packet, resent when its timer expires"""
+
+    name = "Stop-and-Wait"
+
+    def __init__(self, num_packets:int, window_size:int = 1, seq_bits:int = 0):
+        super().__init__(num_packets, 1, seq_bits)
+
+    def resize(self, num_packets:int, window_size:int = 1, seq_bits:int = None):
+        super().resize(num_packets, 1, seq_bits)
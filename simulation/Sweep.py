@@ -0,0 +1,158 @@
+# Sweep runs the headless simulator over a grid of Go-Back-N parameters
+# Runs are spread over a process pool, written to disk as they finish, and skipped on resume
+
+import csv
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, fields
+
+from simulation.SimConfig import SimConfig
+from simulation.Simulator import SimResult, simulate
+
+# Parameters that can be swept, in the order they appear in the output
+SWEEP_PARAMS = ("num_packets", "window_size", "prop_delay", "re_timer", "per_pkt_loss", "protocol",
+                "bandwidth", "packet_size", "queue_limit", "queue_policy", "data_loss", "ack_loss",
+                "seq_bits")
+RESULT_FIELDS = tuple(f.name for f in fields(SimResult) if f.name != "num_packets") + ("goodput",)
+COLUMNS = ("run_id",) + SWEEP_PARAMS + ("replica", "seed") + RESULT_FIELDS
+
+
+def expand_grid(**params) -> list[SimConfig]:
+    """Cartesian product of parameter values, skipping combinations that fail validation
+
+    Every keyword is a SimConfig field with a single value or an iterable of
+    values, e.g. expand_grid(window_size=range(1, 11), per_pkt_loss=[0, 10, 30])
+    """
+    unknown = set(params) - {f.name for f in fields(SimConfig)}
+    if unknown:
+        raise ValueError(f"unknown sweep parameters: {', '.join(sorted(unknown))}")
+    names = list(params)
+    values = [v if isinstance(v, (list, tuple, range)) else [v] for v in params.values()]
+    configs = []
+    for combo in itertools.product(*values):
+        config = SimConfig(**dict(zip(names, combo)))
+        try:
+            config.validate()
+        except ValueError:
+            continue  # e.g. window larger than the number of packets
+        configs.append(config)
+    return configs
+
+
+def run_id(config:SimConfig, replica:int) -> str:
+    """Stable identifier of one run, used to skip finished runs on resume"""
+    return "|".join(f"{getattr(config, name)!r}" for name in SWEEP_PARAMS) + f"|{replica}"
+
+
+def _run_one(config:SimConfig, replica:int, seed:str, max_time:float) -> dict:
+    """Worker: simulate one run and flatten it into an output row"""
+    result = simulate(config, seed=seed, max_time=max_time)
+    row = {"run_id": run_id(config, replica), "replica": replica, "seed": seed}
+    row.update({name: getattr(config, name) for name in SWEEP_PARAMS})
+    row.update({name: value for name, value in asdict(result).items() if name in RESULT_FIELDS})
+    row["goodput"] = result.goodput
+    return row
+
+
+def _drop_partial_line(path:str):
+    """Cut a file back to the end of its last complete line
+
+    A sweep killed mid-write leaves an unterminated row, rows appended after
+    it would be glued onto it. Only the tail of the file is read.
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, "r+b") as f:
+        end = position = f.seek(0, os.SEEK_END)
+        while position:
+            start = max(position - 4096, 0)
+            f.seek(start)
+            newline = f.read(position - start).rfind(b"\n")
+            if newline >= 0:
+                position = start + newline + 1
+                break
+            position = start
+        if position != end:
+            f.truncate(position)
+
+
+def _finished_runs(path:str) -> set:
+    """run_ids already present in a partial output file, ignoring a row cut short by an interruption"""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return set()
+    with open(path, newline="") as f:
+        reader = csv.DictReader(f)
+        if tuple(reader.fieldnames or ()) != COLUMNS:
+            raise ValueError(f"{path} was written with other columns, resume it with the version that started it")
+        return {row["run_id"] for row in reader if row.get(COLUMNS[-1])}
+
+
+def _print_progress(done:int, total:int, started:float, stream=sys.stderr):
+    elapsed = time.monotonic() - started
+    eta = elapsed / done * (total - done) if done else 0
+    stream.write(f"\r[{done}/{total}] {100*done/total:5.1f}%  elapsed {elapsed:6.0f}s  ETA {eta:6.0f}s")
+    if done == total:
+        stream.write("\n")
+    stream.flush()
+
+
+def run_sweep(configs:list[SimConfig], out_path:str, replicas:int = 1, seed=0, workers:int = None,
+              max_time:float = 1e6, progress:bool = True) -> int:
+    """Simulate every configuration `replicas` times in parallel and append the rows to out_path
+
+    Rows are flushed as soon as their run finishes, so an interrupted sweep
+    can be restarted with the same arguments and only the missing runs are
+    simulated; a row the interruption left half-written is removed first.
+    A .parquet out_path is staged in a .csv next to it and converted once
+    the sweep is complete (requires pyarrow).
+
+    Args:
+        configs: configurations to run, e.g. from expand_grid()
+        out_path: .csv or .parquet file receiving one row per run
+        replicas: independent runs per configuration, each with its own seed
+        seed: base seed, run seeds are derived from it and the run_id
+        workers: worker processes, defaults to every core
+        max_time: simulated seconds after which a run is recorded as not completed
+        progress: print progress and ETA to stderr
+
+    Returns:
+        number of runs simulated by this call
+    """
+    parquet = out_path.endswith(".parquet")
+    csv_path = os.path.splitext(out_path)[0] + ".csv" if parquet else out_path
+
+    _drop_partial_line(csv_path)
+    finished = _finished_runs(csv_path)
+    jobs = [(config, replica) for config in configs for replica in range(replicas)
+            if run_id(config, replica) not in finished]
+    total = len(jobs)
+
+    new_file = not os.path.exists(csv_path) or os.path.getsize(csv_path) == 0
+    with open(csv_path, "a", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNS)
+        if new_file:
+            writer.writeheader()
+        started = last_report = time.monotonic()
+        if progress and total:
+            _print_progress(0, total, started)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_run_one, config, replica, f"{seed}:{run_id(config, replica)}", max_time)
+                       for config, replica in jobs]
+            for done, future in enumerate(as_completed(futures), 1):
+                writer.writerow(future.result())
+                f.flush()
+                if progress and (done == total or time.monotonic() - last_report >= 0.5):
+                    last_report = time.monotonic()
+                    _print_progress(done, total, started)
+
+    if parquet:
+        try:
+            import pyarrow.csv
+            import pyarrow.parquet
+        except ImportError as e:
+            raise ImportError("writing .parquet sweeps requires pyarrow, the results are in " + csv_path) from e
+        pyarrow.parquet.write_table(pyarrow.csv.read_csv(csv_path), out_path)
+    return total
@@ -0,0 +1,91 @@
+# TimerManager keeps cancellable, restartable timers in a heap keyed on their deadline
+# Go-Back-N needs one retransmission timer per connection, restarting it replaces the old deadline
+
+import heapq
+import itertools
+
+
+class TimerManager:
+    """Heap of named timers with O(1) cancel and O(log n) start/restart
+
+    Each key has at most one live deadline: start() on a running key moves
+    it. Cancelled or replaced deadlines are dropped lazily, and the heap is
+    compacted when stale entries outnumber live ones, so memory stays
+    proportional to the number of live timers (one per connection).
+    """
+
+    def __init__(self):
+        self._deadlines = {}  # key -> (deadline, version) of the live timer
+        self._heap = []  # (deadline, version, key), may hold stale entries
+        self._versions = itertools.count()
+
+    def __len__(self) -> int:
+        """Number of live timers"""
+        return len(self._deadlines)
+
+    def active(self, key) -> bool:
+        return key in self._deadlines
+
+    def deadline(self, key):
+        """Deadline of a live timer, None if it is not running"""
+        entry = self._deadlines.get(key)
+        return entry[0] if entry else None
+
+    def start(self, key, deadline:float):
+        """Start the timer of `key`, or restart it if it is already running"""
+        version = next(self._versions)
+        self._deadlines[key] = (deadline, version)
+        heapq.heappush(self._heap, (deadline, version, key))
+        if len(self._heap) > 2 * len(self._deadlines) + 16:
+            self._compact()
+
+    def cancel(self, key):
+        """Stop the timer of `key` if it is running"""
+        self._deadlines.pop(key, None)
+
+    def clear(self):
+        self._deadlines.clear()
+        self._heap.clear()
+
+    def next_deadline(self):
+        """Earliest live deadline, None when no timer is running"""
+        heap = self._heap
+        while heap:
+            deadline, version, key = heap[0]
+            if self._deadlines.get(key) == (deadline, version):
+                return deadline
+            heapq.heappop(heap)  # stale: cancelled or restarted
+        return None
+
+    def next_timer(self):
+        """(key, deadline) of the earliest live timer, None when no timer is running"""
+        deadline = self.next_deadline()
+        return None if deadline is None else (self._heap[0][2], deadline)
+
+    def pop_expired(self, now:float) -> list:
+        """Remove and return the keys whose deadline is at or before `now`, earliest first"""
+        expired = []
+        while True:
+            deadline = self.next_deadline()
+            if deadline is None or deadline > now:
+                return expired
+            _, _, key = heapq.heappop(self._heap)
+            del self._deadlines[key]
+            expired.append(key)
+
+    def pop_next(self, now:float):
+        """Remove the earliest timer due at or before `now` and return (key, deadline), None if none is due
+
+        Unlike pop_expired(), callers can run each timer before looking at the
+        next, so timers started or cancelled by a callback are taken into account
+        """
+        deadline = self.next_deadline()
+        if deadline is None or deadline > now:
+            return None
+        _, _, key = heapq.heappop(self._heap)
+        del self._deadlines[key]
+        return key, deadline
+
+    def _compact(self):
+        self._heap = [(deadline, version, key) for key, (deadline, version) in self._deadlines.items()]
+        heapq.heapify(self._heap)
@@ -0,0 +1,188 @@
+# Trace records every Go-Back-N event of a run to a compact binary file and replays it
+# Records are fixed-size structs written and read in chunks, so traces of any length are streamed
+
+import json
+import os
+import struct
+from dataclasses import asdict, dataclass, field
+
+from simulation.SimConfig import SimConfig
+from simulation.Simulator import (SEND, PKT_ARRIVE, PKT_DROP, ACK_ARRIVE, ACK_DROP, TIMEOUT, WINDOW_SLIDE,
+                                  USER_KILL, EVENT_NAMES, SimResult, Simulator)
+
+MAGIC = b"GBNT"
+VERSION = 1
+_HEADER = struct.Struct("<4sHI")  # magic, format version, length of the JSON metadata that follows
+RECORD = struct.Struct("<dBBIi")  # time (simulated s), kind, drop cause, seq, value: 18 bytes per event
+_CHUNK = 4096  # records buffered per write and decoded per read
+
+
+class TraceWriter:
+    """Appends event records to a trace file
+
+    The writer is callable with the Simulator observer signature, so
+    `simulator.observers.append(writer)` records a headless run. Records are
+    buffered and written in chunks, nothing but the buffer is kept in memory.
+
+    Args:
+        target: path of the trace file, or a binary file object opened for writing
+        metadata: JSON-serialisable description of the run (config, seed, ...)
+    """
+
+    def __init__(self, target, metadata:dict):
+        self._owns_file = isinstance(target, (str, os.PathLike))
+        self.file = open(target, "wb") if self._owns_file else target
+        self.metadata = metadata
+        self.count = 0 # records written so far
+        self._buffer = bytearray()
+        meta = json.dumps(metadata).encode()
+        self.file.write(_HEADER.pack(MAGIC, VERSION, len(meta)) + meta)
+
+    def __call__(self, time:float, kind:int, seq:int, value:int = 0, cause:int = 0):
+        """Record one event (simulated seconds, event kind from simulation.Simulator)"""
+        self._buffer += RECORD.pack(time, kind, cause, seq, value)
+        self.count += 1
+        if len(self._buffer) >= _CHUNK * RECORD.size:
+            self.flush()
+
+    def flush(self):
+        self.file.write(self._buffer)
+        self._buffer.clear()
+        self.file.flush()
+
+    def close(self):
+        self.flush()
+        if self._owns_file:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class TraceReader:
+    """Streams the records of a trace file
+
+    Iterating yields (time, kind, cause, seq, value) tuples, read and decoded
+    a chunk at a time.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            magic, version, meta_len = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a Go-Back-N trace")
+            if version != VERSION:
+                raise ValueError(f"unsupported trace version {version}")
+            self.metadata = json.loads(f.read(meta_len))
+        self._data_start = _HEADER.size + meta_len
+
+    @property
+    def config(self) -> SimConfig:
+        return SimConfig(**self.metadata["config"])
+
+    def __len__(self) -> int:
+        """Number of records, from the file size"""
+        return (os.path.getsize(self.path) - self._data_start) // RECORD.size
+
+    def __iter__(self):
+        with open(self.path, "rb") as f:
+            f.seek(self._data_start)
+            while True:
+                chunk = f.read(_CHUNK * RECORD.size)
+                chunk = chunk[:len(chunk) - len(chunk) % RECORD.size]  # ignore a record cut short by a crash
+                if not chunk:
+                    return
+                yield from RECORD.iter_unpack(chunk)
+
+    def duration(self) -> float:
+        """Simulated time of the last record, reading only the end of the file"""
+        if len(self) == 0:
+            return 0.0
+        with open(self.path, "rb") as f:
+            f.seek(self._data_start + (len(self) - 1) * RECORD.size)
+            return RECORD.unpack(f.read(RECORD.size))[0]
+
+    def dump(self, limit:int = None):
+        """Human readable lines, for debugging"""
+        for i, (time, kind, cause, seq, value) in enumerate(self):
+            if limit is not None and i >= limit:
+                return
+            yield f"{time:12.4f}  {EVENT_NAMES[kind]:12} seq={seq} value={value} cause={cause}"
+
+
+@dataclass
+class InFlight:
+    """A data packet or ACK on the link at the replayed time"""
+    is_ack: bool
+    seq: int      # 0-based packet (pair) index
+    value: int    # cumulative ACK carried by an ACK
+    departed: float  # simulated second it left
+
+
+@dataclass
+class ReplayState:
+    """Protocol state rebuilt from a trace at a given time"""
+    time: float = 0.0
+    base: int = 0      # oldest unacknowledged packet
+    expected: int = 0  # next in-order packet at the receiver
+    in_flight: list = field(default_factory=list)  # InFlight packets and ACKs on the link
+    counts: dict = field(default_factory=dict)  # event name -> occurrences so far
+
+
+def _remove(in_flight:list, is_ack:bool, seq:int):
+    """Drop the oldest matching packet, a retransmission can share the link with its original"""
+    for i, pkt in enumerate(in_flight):
+        if pkt.is_ack == is_ack and pkt.seq == seq:
+            del in_flight[i]
+            return
+
+
+def replay(trace, until:float = None) -> ReplayState:
+    """Rebuild the state of a recorded run at simulated time `until` (the end by default)
+
+    Only the trace is read: nothing is simulated again, so the result is the
+    recorded run exactly, whatever produced it (GUI or headless simulator).
+
+    Args:
+        trace: a TraceReader or the path of a trace file
+    """
+    if not isinstance(trace, TraceReader):
+        trace = TraceReader(trace)
+    state = ReplayState()
+    counts = [0] * len(EVENT_NAMES)
+    in_flight = state.in_flight
+    for time, kind, cause, seq, value in trace:
+        if until is not None and time > until:
+            break
+        state.time = time
+        counts[kind] += 1
+        if kind == SEND:
+            in_flight.append(InFlight(False, seq, 0, time))
+        elif kind == PKT_ARRIVE:
+            _remove(in_flight, False, seq)
+            state.expected = max(state.expected, value)
+            in_flight.append(InFlight(True, seq, value, time))  # the receiver answers right away
+        elif kind == PKT_DROP:
+            _remove(in_flight, False, seq)
+        elif kind in (ACK_ARRIVE, ACK_DROP):
+            _remove(in_flight, True, seq)
+        elif kind == WINDOW_SLIDE:
+            state.base = seq
+        elif kind == USER_KILL:
+            _remove(in_flight, bool(value), seq)
+    if until is not None:
+        state.time = until
+    state.counts = dict(zip(EVENT_NAMES, counts))
+    return state
+
+
+def record_simulation(config:SimConfig, path, seed=None, max_time:float = None) -> SimResult:
+    """Run the headless simulator and write its trace to `path`"""
+    simulator = Simulator(config, seed)
+    with TraceWriter(path, {"source": "simulator", "seed": seed, "config": asdict(config)}) as writer:
+        simulator.observers.append(writer)
+        return simulator.run(max_time=max_time)
@@ -0,0 +1,70 @@
+# Tests of the analytical model: its predictions agree with the mean of seeded simulator runs
+# compare() flags a run only when its goodput is well away from the prediction
+
+import statistics
+
+import pytest
+
+from simulation.Analytics import compare, predict, predict_config
+from simulation.Metrics import Metrics
+from simulation.SimConfig import SimConfig
+from simulation.Simulator import Simulator, simulate
+
+SETTINGS = [
+    {"window_size": 1, "per_pkt_loss": 20},
+    {"protocol": "sw", "per_pkt_loss": 30},
+    {"window_size": 2, "per_pkt_loss": 30, "prop_delay": 0.5, "re_timer": 2.0},
+    {"window_size": 3, "per_pkt_loss": 40},
+    {"window_size": 4, "per_pkt_loss": 10},
+    {"window_size": 10, "per_pkt_loss": 20},
+    {"window_size": 20, "per_pkt_loss": 5},
+]
+
+
+def run_metrics(config:SimConfig, seed, max_time:float = None) -> Metrics:
+    simulator = Simulator(config, seed)
+    metrics = Metrics(config.window_size, config.num_packets)
+    simulator.observers.append(metrics)
+    simulator.run(max_time=max_time)
+    return metrics
+
+
+@pytest.mark.parametrize("settings", SETTINGS)
+def test_prediction_matches_the_mean_of_simulated_runs(settings):
+    config = SimConfig(num_packets=2000, **settings)
+    results = [simulate(config, seed=seed) for seed in range(5)]
+    predicted = predict_config(config)
+    assert predicted.goodput == pytest.approx(statistics.fmean(r.goodput for r in results), rel=0.06)
+    assert predicted.timeouts * config.num_packets == pytest.approx(
+        statistics.fmean(r.timeouts for r in results), rel=0.06)
+    assert predicted.transmissions * config.num_packets == pytest.approx(
+        statistics.fmean(r.transmissions for r in results), rel=0.06)
+
+
+def test_lossless_prediction_sends_a_window_per_round_trip():
+    predicted = predict(5, 0.0, 5.0, 4.0)
+    assert predicted.goodput == pytest.approx(5 / 4.0)
+    assert (predicted.timeouts, predicted.transmissions, predicted.efficiency) == (0.0, 1.0, 1.0)
+    assert predict(200, 0.0, 5.0, 4.0).goodput == pytest.approx(1 / 0.05)  # the window outlasts a round trip
+
+
+def test_compare_flags_only_runs_far_from_the_prediction():
+    config = SimConfig(num_packets=500, window_size=4, per_pkt_loss=20)
+    metrics = run_metrics(config, 1)
+    assert not compare(config, metrics).diverges
+    comparison = compare(SimConfig(num_packets=500, window_size=4), metrics)  # judged against the lossless model
+    assert comparison.settled and comparison.diverges and comparison.error > 0.2
+
+
+def test_compare_waits_for_enough_packets():
+    metrics = run_metrics(SimConfig(num_packets=500, window_size=4, per_pkt_loss=20), 1, max_time=5.0)
+    comparison = compare(SimConfig(num_packets=500, window_size=4), metrics)
+    assert not comparison.settled and not comparison.diverges
+
+
+def test_model_refuses_what_it_does_not_cover():
+    with pytest.raises(ValueError):
+        predict_config(SimConfig(protocol="sr"))
+    with pytest.raises(ValueError):
+        predict_config(SimConfig(data_loss="gilbert-elliott:10:5"))
+    assert not predict(4, 0.1, 3.0, 4.0).valid  # the timer expires before the ACK is back
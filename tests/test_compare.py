@@ -0,0 +1,33 @@
+# Tests of the protocol comparison: every protocol meets the same seeded losses
+# Selective Repeat must resend less than Go-Back-N on the same loss pattern
+
+from simulation.Compare import compare_protocols, report
+from simulation.SimConfig import SimConfig
+from simulation.Simulator import KeyedLoss
+
+
+def test_keyed_loss_depends_only_on_the_seed_and_the_transmission():
+    first, second = KeyedLoss(3, 30), KeyedLoss(3, 30)
+    decisions = [(is_ack, seq, attempt) for is_ack in (False, True) for seq in range(50) for attempt in range(3)]
+    forward = [first(*d) for d in decisions]
+    backward = [second(*d) for d in reversed(decisions)]
+    assert forward == backward[::-1]  # the order the decisions are asked in does not matter
+    assert 0.15 < sum(forward) / len(forward) < 0.45
+    assert not any(KeyedLoss(3, 0)(*d) for d in decisions)
+
+
+def test_selective_repeat_resends_less_than_go_back_n():
+    runs = compare_protocols(SimConfig(num_packets=200, window_size=8, per_pkt_loss=10), seeds=range(5))
+    assert len(runs) == 5 * 3
+    assert all(run.result.completed for run in runs)
+    resent = {protocol: sum(run.bytes_retransmitted for run in runs if run.protocol == protocol)
+              for protocol in ("gbn", "sr", "sw")}
+    assert 0 < resent["sr"] < resent["gbn"]
+
+
+def test_report_has_a_line_per_protocol():
+    runs = compare_protocols(SimConfig(num_packets=50, window_size=4, per_pkt_loss=10), seeds=[1, 2],
+                             protocols=("gbn", "sr"))
+    lines = report(runs).splitlines()
+    assert len(lines) == 3
+    assert lines[1].split()[-1] == "1.00x"  # the first protocol is the reference
@@ -0,0 +1,74 @@
+# Tests of the bottleneck link: FIFO service at the link rate, tail drop and RED at a bounded queue
+# Runs over a link must recover queue drops like any other loss
+
+import random
+
+import pytest
+
+from simulation.Link import Link
+from simulation.SimConfig import SimConfig
+from simulation.Simulator import DROP_QUEUE, PKT_DROP, Simulator, simulate
+
+
+def test_packets_wait_for_the_ones_ahead():
+    link = Link(bandwidth=1000, packet_size=100)  # 0.1 s per packet
+    starts = [link.admit(0.0) for _ in range(4)]
+    assert starts == pytest.approx([0.0, 0.1, 0.2, 0.3])
+    assert link.queue_length(0.05) == 3
+    assert link.mean_queue_delay == pytest.approx(0.15)
+    assert link.admit(1.0) == 1.0  # the queue drained meanwhile
+    assert link.utilisation(1.1) == pytest.approx(0.5 / 1.1)
+
+
+def test_tail_drop_refuses_packets_beyond_the_queue_limit():
+    link = Link(bandwidth=1000, packet_size=100, queue_limit=2)
+    starts = [link.admit(0.0) for _ in range(5)]
+    assert starts[:3] == pytest.approx([0.0, 0.1, 0.2])
+    assert starts[3:] == [None, None]
+    assert link.drops == 2 and link.sent == 3
+    assert link.admit(0.15) == pytest.approx(0.3)  # one left the queue
+
+
+def test_red_drops_before_the_queue_is_full():
+    red = Link(bandwidth=1000, packet_size=100, queue_limit=20, policy="red", rng=random.Random(1))
+    tail = Link(bandwidth=1000, packet_size=100, queue_limit=20)
+    for i in range(200):
+        red.admit(i * 0.05)  # twice the link rate
+        tail.admit(i * 0.05)
+    assert red.drops > 0
+    assert red.max_queue < tail.max_queue == 20
+
+
+@pytest.mark.parametrize("arguments", [{"bandwidth": 0}, {"policy": "fifo"}, {"policy": "red", "queue_limit": 0}])
+def test_invalid_link_is_refused(arguments):
+    with pytest.raises(ValueError):
+        Link(**{"bandwidth": 1000, "packet_size": 100, **arguments})
+
+
+@pytest.mark.parametrize("protocol, window_size", [("gbn", 1), ("gbn", 10), ("sr", 10), ("sw", 1)])
+def test_lossless_run_over_an_unbounded_link_sends_every_packet_once(protocol, window_size):
+    config = SimConfig(num_packets=200, window_size=window_size, protocol=protocol, bandwidth=5e4)
+    result = simulate(config, seed=1)
+    assert result.completed
+    assert result.transmissions == 200
+    assert result.queue_drops == 0
+    assert 0 < result.utilisation <= 1
+
+
+@pytest.mark.parametrize("protocol", ["gbn", "sr"])
+def test_queue_drops_are_reported_and_recovered(protocol):
+    config = SimConfig(num_packets=200, window_size=10, protocol=protocol, bandwidth=5e4, queue_limit=2)
+    simulator = Simulator(config, seed=1)
+    causes = []
+
+    def on_event(time, kind, seq, value, cause=0):
+        if kind == PKT_DROP:
+            causes.append(cause)
+
+    simulator.observers.append(on_event)
+    result = simulator.run()
+    assert result.completed
+    assert result.queue_drops > 0
+    assert result.pkt_drops == 0  # no random loss, only the queue drops
+    assert causes == [DROP_QUEUE] * result.queue_drops
+    assert result.retransmissions > 0
@@ -0,0 +1,95 @@
+# Tests of the loss models: long-run rates and burst lengths of Gilbert-Elliott, replayed trace files, loss specs
+# NumPy draws the decisions, so these tests are skipped without it
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from simulation.LossModel import BernoulliLoss, GilbertElliottLoss, LossStream, TraceLoss, parse_loss
+from simulation.SimConfig import SimConfig
+from simulation.Simulator import simulate
+
+
+def draw(model, count:int, seed:int = 1, chunk:int = 4096) -> list:
+    stream = LossStream(model, seed, chunk)
+    return [stream() for _ in range(count)]
+
+
+def burst_lengths(decisions:list) -> list:
+    lengths, run = [], 0
+    for lost in decisions:
+        if lost:
+            run += 1
+        elif run:
+            lengths.append(run)
+            run = 0
+    return lengths
+
+
+def test_bernoulli_loses_at_its_rate():
+    decisions = draw(BernoulliLoss(0.2), 100_000)
+    assert sum(decisions) / len(decisions) == pytest.approx(0.2, abs=0.01)
+
+
+@pytest.mark.parametrize("rate, burst_length", [(0.05, 2), (0.1, 5), (0.3, 10)])
+def test_gilbert_elliott_loses_at_its_rate_in_bursts(rate, burst_length):
+    model = GilbertElliottLoss.from_burst(rate, burst_length)
+    assert model.rate == pytest.approx(rate)
+    decisions = draw(model, 200_000)
+    assert sum(decisions) / len(decisions) == pytest.approx(rate, rel=0.1)
+    bursts = burst_lengths(decisions)
+    assert sum(bursts) / len(bursts) == pytest.approx(burst_length, rel=0.1)  # the bad state loses everything
+
+
+def test_gilbert_elliott_without_bursts_is_bernoulli():
+    assert isinstance(GilbertElliottLoss.from_burst(0.0, 4), BernoulliLoss)
+    with pytest.raises(ValueError):
+        GilbertElliottLoss.from_burst(0.1, 0.5)
+    with pytest.raises(ValueError):
+        GilbertElliottLoss(0.0, 0.5)
+
+
+def test_trace_loss_replays_the_file_in_a_loop(tmp_path):
+    path = tmp_path / "loss.txt"
+    path.write_text("# recorded on a lossy link\n0010\n1, 1, 0\n")
+    model = TraceLoss(str(path))
+    pattern = [False, False, True, False, True, True, False]
+    assert model.mask().tolist() == pattern
+    assert model.rate == pytest.approx(3 / 7)
+    assert draw(model, 50, chunk=3) == (pattern * 8)[:50]  # chunks do not line up with the file
+
+
+def test_trace_without_decisions_is_refused(tmp_path):
+    path = tmp_path / "empty.txt"
+    path.write_text("# nothing recorded\n")
+    with pytest.raises(ValueError):
+        TraceLoss(str(path)).mask()
+
+
+def test_loss_specs():
+    assert parse_loss("") is None
+    assert parse_loss("bernoulli:10").rate == pytest.approx(0.1)
+    assert parse_loss("gilbert-elliott:10:4").rate == pytest.approx(0.1)
+    assert parse_loss("gilbert-elliott:10:4:50").loss_bad == 0.5
+    assert parse_loss("trace:loss.txt").path == "loss.txt"
+    for spec in ("bernoulli", "bernoulli:x", "gilbert-elliott:10", "burst:10:4", "trace:"):
+        with pytest.raises(ValueError):
+            parse_loss(spec)
+
+
+def test_runs_with_a_loss_model_repeat_and_recover():
+    config = SimConfig(num_packets=300, window_size=5, data_loss="gilbert-elliott:10:5", ack_loss="bernoulli:5")
+    result = simulate(config, seed=3)
+    assert result.completed
+    assert result.pkt_drops > 0 and result.ack_drops > 0
+    assert simulate(config, seed=3) == result
+
+
+def test_run_replaying_a_trace_drops_what_it_records(tmp_path):
+    path = tmp_path / "loss.txt"
+    path.write_text("1" + "0" * 9)  # the first of every ten transmissions is lost
+    config = SimConfig(num_packets=100, window_size=1, data_loss=f"trace:{path}", ack_loss="bernoulli:0")
+    result = simulate(config, seed=1)
+    assert result.completed
+    assert result.ack_drops == 0
+    assert result.pkt_drops == -(-result.transmissions // 10)
@@ -0,0 +1,52 @@
+# Tests of the live run metrics: counts fed from simulator events agree with its result
+# The same counts come back when the run is read from its trace
+
+import json
+
+import pytest
+
+from simulation.Metrics import Histogram, Metrics
+from simulation.SimConfig import SimConfig
+from simulation.Simulator import Simulator
+from simulation.Trace import TraceReader, record_simulation
+
+
+def test_metrics_count_what_the_simulator_reports():
+    config = SimConfig(num_packets=300, window_size=6, per_pkt_loss=15)
+    simulator = Simulator(config, seed=2)
+    metrics = Metrics(config.window_size, config.num_packets)
+    simulator.observers.append(metrics)
+    result = simulator.run()
+    assert metrics.base == config.num_packets
+    assert metrics.sends == result.transmissions
+    assert metrics.retransmissions == result.retransmissions
+    assert metrics.timeouts == result.timeouts
+    assert metrics.pkt_drops["random"] == result.pkt_drops
+    assert metrics.ack_drops["random"] == result.ack_drops
+    assert metrics.goodput == pytest.approx(result.goodput)
+    assert 0 < metrics.utilisation <= 1
+
+
+def test_metrics_from_trace_match_the_live_metrics(tmp_path):
+    config = SimConfig(num_packets=200, window_size=4, per_pkt_loss=10)
+    path = tmp_path / "run.gbnt"
+    record_simulation(config, str(path), seed=5)
+    simulator = Simulator(config, seed=5)
+    metrics = Metrics(config.window_size, config.num_packets)
+    simulator.observers.append(metrics)
+    simulator.run()
+    assert Metrics.from_trace(TraceReader(str(path))).to_dict() == metrics.to_dict()
+    metrics.to_json(str(tmp_path / "metrics.json"), seed=5)
+    exported = json.loads((tmp_path / "metrics.json").read_text())
+    assert exported["seed"] == 5
+    assert exported["acknowledged"] == 200
+
+
+def test_histogram_percentiles_are_bin_edges():
+    histogram = Histogram(0.5)
+    for value in (0.1, 0.2, 0.7, 1.2, 4.9):
+        histogram.add(value)
+    assert histogram.count == 5
+    assert histogram.mean == pytest.approx(7.1 / 5)
+    assert histogram.percentile(50) == 1.0
+    assert histogram.percentile(100) == 4.9
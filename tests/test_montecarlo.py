@@ -0,0 +1,66 @@
+# Tests of the NumPy batch runner against the event-by-event Simulator it vectorizes
+# Lossless replicas must match the simulator exactly, lossy ones in distribution
+
+import statistics
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from simulation.MonteCarlo import run_batch
+from simulation.SimConfig import SimConfig
+from simulation.Simulator import simulate
+
+
+@pytest.mark.parametrize("window_size", [1, 3, 10])
+def test_lossless_replicas_match_the_simulator(window_size):
+    config = SimConfig(num_packets=100, window_size=window_size)
+    expected = simulate(config, seed=1)
+    batch = run_batch(config, 50, seed=1)
+    assert batch.completed.all()
+    assert batch.completion_time == pytest.approx(expected.completion_time)
+    assert (batch.transmissions == expected.transmissions).all()
+    assert (batch.retransmissions == expected.retransmissions).all()
+
+
+@pytest.mark.parametrize("window_size, loss", [(1, 20), (4, 10), (8, 30)])
+def test_lossy_replicas_match_the_simulator_on_average(window_size, loss):
+    config = SimConfig(num_packets=100, window_size=window_size, per_pkt_loss=loss)
+    runs = [simulate(config, seed=seed) for seed in range(1000)]
+    batch = run_batch(config, 2000, seed=1)
+    assert batch.completed.all()
+    assert batch.completion_time.mean() == pytest.approx(statistics.mean(r.completion_time for r in runs), rel=0.05)
+    assert batch.retransmissions.mean() == pytest.approx(statistics.mean(r.retransmissions for r in runs), rel=0.05)
+    assert batch.timeouts.mean() == pytest.approx(statistics.mean(r.timeouts for r in runs), rel=0.05)
+
+
+def test_same_seed_repeats_the_batch():
+    config = SimConfig(num_packets=50, window_size=4, per_pkt_loss=20)
+    first, second = run_batch(config, 100, seed=9), run_batch(config, 100, seed=9)
+    assert (first.completion_time == second.completion_time).all()
+    assert (first.retransmissions == second.retransmissions).all()
+
+
+def test_max_time_leaves_replicas_unfinished():
+    config = SimConfig(num_packets=100, window_size=4, per_pkt_loss=20)
+    batch = run_batch(config, 100, seed=1, max_time=50.0)
+    assert not batch.completed.any()
+    summary = batch.summary()
+    assert summary == {"replicas": 100, "completed": 0}
+
+
+def test_summary_covers_completed_replicas():
+    batch = run_batch(SimConfig(num_packets=50, window_size=4, per_pkt_loss=10), 200, seed=1)
+    summary = batch.summary(percentiles=(5, 95))
+    assert summary["completed"] == 200
+    times = summary["completion_time"]
+    assert times["p5"] <= times["mean"] <= times["p95"]
+    assert summary["goodput"]["mean"] == pytest.approx(float(batch.goodput.mean()))
+
+
+@pytest.mark.parametrize("window_size", [3, 10, 20])
+def test_lossless_batch_never_retransmits(window_size):
+    batch = run_batch(SimConfig(num_packets=300, window_size=window_size), 20, seed=1)
+    assert batch.completed.all()
+    assert not batch.retransmissions.any()
+    assert not batch.timeouts.any()
@@ -0,0 +1,61 @@
+# Tests of many flows sharing one bottleneck: every flow completes, the shared queue drops are recovered
+# Every run is seeded, so a failure reproduces with the same parameters
+
+from dataclasses import asdict
+
+import pytest
+
+from simulation.MultiFlow import MultiFlowSimulator, jain_index, simulate_flows
+from simulation.SimConfig import SimConfig
+from simulation.Simulator import simulate
+
+SHARED_LINK = SimConfig(num_packets=20, window_size=4, prop_delay=0.05, re_timer=0.5, bandwidth=1e6, queue_limit=10)
+
+
+@pytest.mark.parametrize("protocol", ["gbn", "sr"])
+def test_lossless_flows_send_every_packet_once(protocol):
+    config = SimConfig(num_packets=50, window_size=4, protocol=protocol)
+    result = simulate_flows(config, 20, seed=1, start_spread=1.0)
+    assert result.completed
+    assert result.delivered == 20 * 50
+    assert all(flow.retransmissions == 0 and flow.timeouts == 0 for flow in result.flows)
+
+
+def test_flows_recover_drops_at_the_shared_queue():
+    result = simulate_flows(SHARED_LINK, 200, seed=1, start_spread=0.5)
+    assert result.completed
+    assert result.delivered == 200 * SHARED_LINK.num_packets
+    assert result.queue_drops > 0
+    assert sum(flow.retransmissions for flow in result.flows) >= result.queue_drops
+    assert result.aggregate_goodput <= SHARED_LINK.bandwidth / SHARED_LINK.packet_size
+    assert 0 < result.fairness <= 1
+
+
+def test_same_seed_repeats_the_flows():
+    config = SimConfig(**{**asdict(SHARED_LINK), "per_pkt_loss": 5})
+    first = simulate_flows(config, 50, seed=2, start_spread=0.5)
+    assert asdict(simulate_flows(config, 50, seed=2, start_spread=0.5)) == asdict(first)
+    assert first.pkt_drops > 0
+
+
+@pytest.mark.parametrize("config, pause", [(SimConfig(num_packets=50, window_size=4, per_pkt_loss=10), 10.0),
+                                           (SHARED_LINK, 1.0)])
+def test_resumed_run_matches_a_whole_run(config, pause):
+    simulator = MultiFlowSimulator(config, 30, seed=3, start_spread=0.5)
+    part = simulator.run(max_time=pause)
+    assert not part.completed and part.delivered > 0
+    assert asdict(simulator.run()) == asdict(simulate_flows(config, 30, seed=3, start_spread=0.5))
+
+
+@pytest.mark.parametrize("protocol", ["gbn", "sr", "sw"])
+def test_single_flow_matches_the_simulator(protocol):
+    config = SimConfig(num_packets=200, window_size=5, per_pkt_loss=15, protocol=protocol)
+    flow = simulate_flows(config, 1, seed=4).flows[0]
+    result = simulate(config, seed=4)
+    assert (flow.transmissions, flow.retransmissions, flow.timeouts, flow.completion_time) == \
+        (result.transmissions, result.retransmissions, result.timeouts, result.completion_time)
+
+
+def test_jain_index():
+    assert jain_index([3.0, 3.0, 3.0]) == pytest.approx(1.0)
+    assert jain_index([1.0, 0.0, 0.0, 0.0]) == pytest.approx(0.25)
@@ -0,0 +1,123 @@
+# Tests of scenario files and the headless runner: defaults and aliases, errors naming the scenario, rows per run
+# Scenario files are written to pytest's temporary directory
+
+import csv
+import json
+
+import pytest
+
+import headless
+from simulation import Scenario
+from simulation.Scenario import load_scenarios, run_scenarios
+from simulation.SimConfig import SimConfig
+from simulation.Simulator import simulate
+
+
+def write_json(path, data) -> str:
+    path.write_text(json.dumps(data))
+    return str(path)
+
+
+def test_scenarios_override_the_file_defaults(tmp_path):
+    path = write_json(tmp_path / "grid.json", {"K": 50, "R": 5, "per_pkt_loss": 10, "seed": 3,
+                                                "scenarios": [{"name": "gbn"}, {"protocol": "sr", "R": 2}]})
+    first, second = load_scenarios(path)
+    assert first.name == "gbn" and second.name == "grid[2]"
+    assert first.config == SimConfig(num_packets=50, window_size=5, per_pkt_loss=10)
+    assert second.config == SimConfig(num_packets=50, window_size=2, per_pkt_loss=10, protocol="sr")
+    assert first.seed == second.seed == 3
+    assert first.source == path
+
+
+def test_toml_file_and_plain_json_list(tmp_path):
+    toml = tmp_path / "one.toml"
+    toml.write_text('K = 20\nR = 4\nmax_time = 50.0\n')
+    [scenario] = load_scenarios(str(toml))
+    assert scenario.name == "one"
+    assert scenario.config.window_size == 4 and scenario.max_time == 50.0
+    listed = load_scenarios(write_json(tmp_path / "list.json", [{"K": 10}, {"K": 20}]))
+    assert [s.config.num_packets for s in listed] == [10, 20]
+
+
+def test_loss_trace_paths_are_relative_to_the_file(tmp_path):
+    (tmp_path / "loss.txt").write_text("0001")
+    [scenario] = load_scenarios(write_json(tmp_path / "trace.json", {"K": 10, "data_loss": "trace:loss.txt"}))
+    assert scenario.config.data_loss == "trace:" + str(tmp_path / "loss.txt")
+
+
+@pytest.mark.parametrize("values, message", [({"K": 10, "window": 3}, "unknown scenario keys window"),
+                                             ({"name": "big", "K": 10, "R": 20}, "scenario big: window_size"),
+                                             ({"name": "lossy", "per_pkt_loss": 120}, "scenario lossy: per_pkt_loss")])
+def test_bad_scenarios_are_refused_with_the_file_and_name(tmp_path, values, message):
+    path = write_json(tmp_path / "bad.json", values)
+    with pytest.raises(ValueError, match=message) as error:
+        load_scenarios(path)
+    assert str(error.value).startswith(path + ": ")
+
+
+def test_rows_repeat_the_simulator(tmp_path):
+    path = write_json(tmp_path / "runs.json", {"K": 100, "per_pkt_loss": 10, "seed": 4,
+                                                "scenarios": [{"R": 1}, {"R": 4}, {"R": 4, "protocol": "sr"}]})
+    scenarios = load_scenarios(path)
+    rows = list(run_scenarios(scenarios, workers=1, metrics=True))
+    assert [row["name"] for row in rows] == [s.name for s in scenarios]
+    for scenario, row in zip(scenarios, rows):
+        result = simulate(scenario.config, seed=4, max_time=scenario.max_time)
+        assert row["result"]["retransmissions"] == result.retransmissions
+        assert row["result"]["completion_time"] == result.completion_time
+        assert row["metrics"]["sends"] == result.transmissions
+
+
+def test_headless_writes_a_row_per_scenario(tmp_path, capsys):
+    path = write_json(tmp_path / "runs.json", {"K": 50, "scenarios": [{"R": 1}, {"R": 5}]})
+    output = tmp_path / "out.csv"
+    assert headless.main([path, "-j", "1", "--seed", "1", "-o", str(output)]) == 0
+    assert len(capsys.readouterr().out.splitlines()) == 3  # header and one line per scenario
+    with open(output, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [row["window_size"] for row in rows] == ["1", "5"]
+    assert all(row["completed"] == "True" for row in rows)
+
+
+def test_headless_reports_a_bad_file(tmp_path, capsys):
+    path = write_json(tmp_path / "bad.json", {"K": 10, "R": 20})
+    assert headless.main([path, "--quiet"]) == 2
+    assert capsys.readouterr().err.startswith(f"error: {path}: scenario bad: ")
+
+
+@pytest.mark.parametrize("values, message", [({"name": "typo", "per_pkt_loss": "10"}, "per_pkt_loss must be a number"),
+                                             ({"name": "half", "K": 10.5}, "num_packets must be an integer"),
+                                             ({"name": "gone", "data_loss": "trace:missing.txt"},
+                                              "cannot read loss trace")])
+def test_wrong_types_and_missing_traces_fail_at_load(tmp_path, values, message):
+    path = write_json(tmp_path / "bad.json", values)
+    with pytest.raises(ValueError, match=f"scenario {values['name']}: {message}"):
+        load_scenarios(path)
+
+
+def test_a_failed_run_gives_an_error_row(tmp_path):
+    trace = tmp_path / "loss.txt"
+    trace.write_text("0001")
+    path = write_json(tmp_path / "runs.json", {"K": 20, "seed": 1, "scenarios": [
+        {"name": "plain"}, {"name": "traced", "data_loss": "trace:loss.txt"}]})
+    scenarios = load_scenarios(path)
+    trace.unlink()  # gone by the time the run reads it
+    plain, traced = run_scenarios(scenarios, workers=1)
+    assert plain["result"]["completed"]
+    assert traced["error"].startswith(f"{path}: scenario traced: FileNotFoundError")
+    assert "result" not in traced
+
+
+def test_headless_keeps_the_other_rows_of_a_failed_run(tmp_path, capsys, monkeypatch):
+    def run_scenario(scenario, metrics=False):
+        if scenario.name == "broken":
+            raise RuntimeError("worker died")
+        return original(scenario, metrics)
+
+    original = Scenario.run_scenario
+    monkeypatch.setattr(Scenario, "run_scenario", run_scenario)
+    path = write_json(tmp_path / "runs.json", {"K": 20, "scenarios": [{"name": "broken"}, {"name": "fine"}]})
+    output = tmp_path / "out.json"
+    assert headless.main([path, "-j", "1", "--quiet", "-o", str(output)]) == 1
+    assert capsys.readouterr().err == f"error: {path}: scenario broken: RuntimeError: worker died\n"
+    assert [row["name"] for row in json.loads(output.read_text())] == ["fine"]
@@ -0,0 +1,125 @@
+# Tests of the headless simulator: seeded runs repeat and resume, lossless runs deliver everything, wraparound changes nothing
+# Every run is seeded, so a failure reproduces with the same parameters
+
+from dataclasses import asdict
+
+import pytest
+
+from simulation.SeqRing import SeqRing
+from simulation.SimConfig import SimConfig
+from simulation.Simulator import Simulator, simulate
+
+
+def run_with_events(config:SimConfig, seed:int, **limits):
+    simulator = Simulator(config, seed=seed)
+    events = []
+    simulator.observers.append(lambda *event: events.append(event))
+    return simulator, simulator.run(**limits), events
+
+
+LOSSLESS = [("gbn", 1), ("gbn", 3), ("gbn", 10), ("gbn", 20), ("sr", 1), ("sr", 3), ("sr", 10), ("sr", 20), ("sw", 1)]
+
+
+@pytest.mark.parametrize("bandwidth", [0, 5e4])
+@pytest.mark.parametrize("protocol, window_size", LOSSLESS)
+def test_lossless_run_sends_every_packet_once(protocol, window_size, bandwidth):
+    result = simulate(SimConfig(num_packets=200, window_size=window_size, protocol=protocol, bandwidth=bandwidth),
+                      seed=1)
+    assert result.completed
+    assert result.timeouts == 0
+    assert result.retransmissions == 0
+    assert result.transmissions == 200
+
+
+@pytest.mark.parametrize("protocol, window_size", LOSSLESS)
+def test_lossless_run_takes_one_round_trip_per_window(protocol, window_size):
+    config = SimConfig(num_packets=100, window_size=window_size, protocol=protocol)
+    result = simulate(config, seed=1)
+    slot = max(2 * config.prop_delay / window_size, config.stagger)  # one ACK per slot once the pipe is full
+    assert result.completion_time == pytest.approx(2 * config.prop_delay + slot * (100 - window_size)
+                                                   + config.stagger * (window_size - 1), rel=0.05)
+
+
+def test_lossless_window_of_one_takes_a_round_trip_per_packet():
+    config = SimConfig(num_packets=50, window_size=1)
+    result = simulate(config, seed=1)
+    assert result.transmissions == 50
+    assert result.timeouts == 0
+    assert result.completion_time == pytest.approx(50 * 2 * config.prop_delay)
+
+
+def test_stop_and_wait_is_go_back_n_with_a_window_of_one():
+    runs = [asdict(simulate(SimConfig(num_packets=300, window_size=1, per_pkt_loss=20, protocol=protocol), seed=4))
+            for protocol in ("gbn", "sw")]
+    assert runs[0] == runs[1]
+
+
+def test_selective_repeat_resends_one_packet_per_timeout():
+    result = simulate(SimConfig(num_packets=300, window_size=8, per_pkt_loss=20, protocol="sr"), seed=4)
+    assert result.completed
+    assert result.retransmissions == result.timeouts > 0
+    assert result.retransmissions <= result.pkt_drops + result.ack_drops
+
+
+@pytest.mark.parametrize("protocol", ["gbn", "sr", "sw"])
+def test_same_seed_repeats_the_run(protocol):
+    config = SimConfig(num_packets=300, window_size=5, per_pkt_loss=20, protocol=protocol)
+    first, second = run_with_events(config, 7), run_with_events(config, 7)
+    assert asdict(first[1]) == asdict(second[1])
+    assert first[2] == second[2]
+    assert first[1].retransmissions > 0
+
+
+def test_run_resumed_after_max_time_matches_one_run():
+    config = SimConfig(num_packets=300, window_size=5, per_pkt_loss=20)
+    _, whole, whole_events = run_with_events(config, 3)
+    simulator, partial, events = run_with_events(config, 3, max_time=100.0)
+    assert not partial.completed
+    assert all(event[0] <= 100.0 for event in events)
+    assert asdict(simulator.run()) == asdict(whole)
+    assert events == whole_events
+
+
+def test_full_loss_needs_a_limit():
+    config = SimConfig(num_packets=10, per_pkt_loss=100)
+    with pytest.raises(ValueError):
+        simulate(config, seed=1)
+    result = simulate(config, seed=1, max_time=60.0)
+    assert not result.completed
+    assert result.timeouts > 0
+
+
+@pytest.mark.parametrize("fields", [{"num_packets": 0}, {"window_size": 0}, {"num_packets": 5, "window_size": 6},
+                                    {"re_timer": 0}, {"prop_delay": -1}, {"per_pkt_loss": 101},
+                                    {"protocol": "tcp"}])
+def test_invalid_config_is_refused(fields):
+    with pytest.raises(ValueError):
+        SimConfig(**fields).validate()
+
+
+@pytest.mark.parametrize("link", [{}, {"bandwidth": 5e3, "queue_limit": 4}])
+@pytest.mark.parametrize("protocol, window_size, seq_bits", [("gbn", 7, 3), ("gbn", 3, 2), ("sr", 4, 3),
+                                                             ("sr", 2, 2), ("sw", 1, 1)])
+def test_wrapped_sequence_numbers_match_unwrapped_run(protocol, window_size, seq_bits, link):
+    runs = []
+    for bits in (0, seq_bits):
+        config = SimConfig(num_packets=200, window_size=window_size, per_pkt_loss=20, protocol=protocol,
+                           seq_bits=bits, **link)
+        _, result, events = run_with_events(config, 5)
+        runs.append((asdict(result), events))
+    assert runs[0][0]["retransmissions"] > 0
+    assert runs[1] == runs[0]
+
+
+def test_window_too_large_for_sequence_numbers_is_refused():
+    with pytest.raises(ValueError):
+        SimConfig(num_packets=100, window_size=8, seq_bits=3).validate()  # Go-Back-N allows 2**3 - 1
+    with pytest.raises(ValueError):
+        SimConfig(num_packets=100, window_size=5, protocol="sr", seq_bits=3).validate()  # Selective Repeat 2**2
+
+
+def test_seq_ring_forgets_packets_that_left_the_window():
+    ring = SeqRing(4)
+    for seq in range(6):
+        ring[seq] = seq * 10
+    assert [ring[seq] for seq in range(6)] == [False, False, 20, 30, 40, 50]
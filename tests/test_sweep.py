@@ -0,0 +1,85 @@
+# Tests of parameter sweeps: grid expansion, one CSV row per run, and resuming an interrupted sweep
+# Sweeps run in a single worker process and write to pytest's temporary directory
+
+import csv
+
+import pytest
+
+from simulation.SimConfig import SimConfig
+from simulation.Simulator import simulate
+from simulation.Sweep import COLUMNS, _drop_partial_line, expand_grid, run_sweep
+
+
+def read_rows(path):
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def test_grid_is_the_product_of_valid_values():
+    configs = expand_grid(num_packets=3, window_size=range(1, 6), per_pkt_loss=[0, 10])
+    assert len(configs) == 3 * 2  # windows above num_packets are skipped
+    assert {(c.window_size, c.per_pkt_loss) for c in configs} == {(r, l) for r in (1, 2, 3) for l in (0, 10)}
+    assert all(c.num_packets == 3 for c in configs)
+
+
+def test_unknown_grid_parameter_is_refused():
+    with pytest.raises(ValueError):
+        expand_grid(window=[1, 2])
+
+
+def test_sweep_writes_one_row_per_run(tmp_path):
+    path = tmp_path / "sweep.csv"
+    configs = expand_grid(num_packets=20, window_size=[1, 3], per_pkt_loss=[0, 20])
+    assert run_sweep(configs, str(path), replicas=2, seed=4, workers=1, progress=False) == 8
+    rows = read_rows(path)
+    assert list(rows[0]) == list(COLUMNS)
+    assert len({row["run_id"] for row in rows}) == 8
+    for row in rows:
+        config = SimConfig(num_packets=20, window_size=int(row["window_size"]), per_pkt_loss=float(row["per_pkt_loss"]))
+        result = simulate(config, seed=row["seed"], max_time=1e6)  # the row's seed repeats the run
+        assert int(row["retransmissions"]) == result.retransmissions
+        assert float(row["completion_time"]) == pytest.approx(result.completion_time)
+
+
+def test_resumed_sweep_only_runs_missing_rows(tmp_path):
+    path = tmp_path / "sweep.csv"
+    configs = expand_grid(num_packets=20, window_size=[1, 2, 3], per_pkt_loss=[0, 10])
+    assert run_sweep(configs[:4], str(path), workers=1, progress=False) == 4
+    assert run_sweep(configs, str(path), workers=1, progress=False) == 2
+    assert run_sweep(configs, str(path), workers=1, progress=False) == 0
+    rows = read_rows(path)
+    assert len(rows) == len({row["run_id"] for row in rows}) == 6
+
+
+def test_resumed_sweep_reruns_a_row_cut_short(tmp_path):
+    path = tmp_path / "sweep.csv"
+    configs = expand_grid(num_packets=20, window_size=[1, 2, 3], per_pkt_loss=[0, 10])
+    run_sweep(configs, str(path), workers=1, progress=False)
+    data = path.read_bytes()
+    path.write_bytes(data[:-40])  # killed while writing the last row
+    assert run_sweep(configs, str(path), workers=1, progress=False) == 1
+    rows = read_rows(path)
+    assert len(rows) == len({row["run_id"] for row in rows}) == 6
+    assert all(None not in row and None not in row.values() for row in rows)  # no row glued onto another
+
+
+def test_sweep_cut_inside_its_header_starts_over(tmp_path):
+    path = tmp_path / "sweep.csv"
+    path.write_bytes(b"run_id,num_pa")
+    configs = expand_grid(num_packets=20, window_size=[1, 2], per_pkt_loss=[0])
+    assert run_sweep(configs, str(path), workers=1, progress=False) == 2
+    rows = read_rows(path)
+    assert list(rows[0]) == list(COLUMNS) and len(rows) == 2
+
+
+def test_drop_partial_line(tmp_path):
+    path = tmp_path / "rows.csv"
+    path.write_bytes(b"a\nb\nc")
+    _drop_partial_line(str(path))
+    assert path.read_bytes() == b"a\nb\n"
+    _drop_partial_line(str(path))
+    assert path.read_bytes() == b"a\nb\n"
+    path.write_bytes(b"x" * 10000)  # no newline in the last few blocks either
+    _drop_partial_line(str(path))
+    assert path.read_bytes() == b""
+    _drop_partial_line(str(tmp_path / "missing.csv"))
@@ -0,0 +1,49 @@
+# Tests of TimerManager and the single Go-Back-N retransmission timer it keeps for the simulator
+# A restarted timer replaces its deadline, an expired one resends the whole window
+
+from simulation.SimConfig import SimConfig
+from simulation.Simulator import SEND, TIMEOUT, Simulator
+from simulation.TimerManager import TimerManager
+
+
+def test_timers_expire_earliest_first():
+    timers = TimerManager()
+    timers.start("b", 2.0)
+    timers.start("a", 1.0)
+    timers.start("c", 3.0)
+    assert timers.next_deadline() == 1.0
+    assert timers.pop_expired(2.5) == ["a", "b"]
+    assert len(timers) == 1 and timers.active("c")
+
+
+def test_restart_replaces_the_deadline_and_cancel_stops_it():
+    timers = TimerManager()
+    timers.start("base", 5.0)
+    timers.start("base", 9.0)
+    assert timers.deadline("base") == 9.0
+    assert timers.pop_expired(8.0) == []
+    timers.cancel("base")
+    assert timers.next_deadline() is None
+    assert timers.pop_expired(20.0) == []
+
+
+def test_restarts_do_not_grow_the_heap():
+    timers = TimerManager()
+    for deadline in range(10_000):
+        timers.start("base", float(deadline))
+    assert len(timers) == 1
+    assert len(timers._heap) <= 2 * len(timers) + 16
+    assert timers.pop_expired(1e9) == ["base"]
+
+
+def test_timeout_resends_the_window_from_its_base():
+    config = SimConfig(num_packets=10, window_size=4, per_pkt_loss=100)
+    simulator = Simulator(config, seed=1)
+    events = []
+    simulator.observers.append(lambda *event: events.append(event[:3]))  # time, kind, seq
+    result = simulator.run(max_time=30.0)
+    timeouts = [time for time, kind, seq in events if kind == TIMEOUT]
+    assert len(timeouts) == result.timeouts == 6
+    assert timeouts == [config.re_timer * i for i in range(1, 7)]  # one timer, restarted on every resend
+    sends = [seq for time, kind, seq in events if kind == SEND]
+    assert sends[:4 * 6] == [0, 1, 2, 3] * 6
@@ -0,0 +1,65 @@
+# Tests of the binary trace format: 18-byte records that read back as written and replay the recorded run
+# Traces are written to pytest's temporary directory
+
+from simulation.SimConfig import SimConfig
+from simulation.Simulator import ACK_ARRIVE, DROP_MANUAL, PKT_DROP, SEND, TIMEOUT, Simulator
+from simulation.Trace import RECORD, TraceReader, TraceWriter, record_simulation, replay
+
+
+def test_record_is_18_bytes_and_round_trips():
+    assert RECORD.size == 18
+    record = (12.5, PKT_DROP, DROP_MANUAL, 2**32 - 1, -1)
+    assert RECORD.unpack(RECORD.pack(*record)) == record
+
+
+def test_writer_and_reader_round_trip(tmp_path):
+    path = tmp_path / "run.gbnt"
+    events = [(0.0, SEND, 0, 0, 0), (2.0, ACK_ARRIVE, 0, 1, 0), (5.25, TIMEOUT, 0, 1, 0), (7.0, PKT_DROP, DROP_MANUAL, 3, 0)]
+    with TraceWriter(str(path), {"config": {"num_packets": 4}, "seed": 7}) as writer:
+        for time, kind, cause, seq, value in events:
+            writer(time, kind, seq, value, cause)
+    reader = TraceReader(str(path))
+    assert reader.metadata == {"config": {"num_packets": 4}, "seed": 7}
+    assert len(reader) == len(events)
+    assert list(reader) == events
+    assert reader.duration() == 7.0
+
+
+def test_reader_ignores_a_record_cut_short(tmp_path):
+    path = tmp_path / "cut.gbnt"
+    with TraceWriter(str(path), {}) as writer:
+        for seq in range(10):
+            writer(float(seq), SEND, seq)
+    with open(path, "ab") as f:
+        f.write(RECORD.pack(10.0, SEND, 0, 10, 0)[:7])  # a crash in the middle of a write
+    reader = TraceReader(str(path))
+    assert len(reader) == 10
+    assert [record[3] for record in reader] == list(range(10))
+
+
+def test_recorded_run_matches_the_simulator(tmp_path):
+    config = SimConfig(num_packets=100, window_size=4, per_pkt_loss=10)
+    path = tmp_path / "sim.gbnt"
+    result = record_simulation(config, str(path), seed=3)
+    simulator = Simulator(config, seed=3)
+    events = []
+    simulator.observers.append(lambda time, kind, seq, value, cause=0: events.append((time, kind, cause, seq, value)))
+    simulator.run()
+    reader = TraceReader(str(path))
+    assert reader.config == config
+    assert list(reader) == events
+    assert sum(record[1] == SEND for record in reader) == result.transmissions
+
+
+def test_replay_rebuilds_the_window_at_any_time(tmp_path):
+    config = SimConfig(num_packets=200, window_size=5, per_pkt_loss=20)
+    path = tmp_path / "sim.gbnt"
+    record_simulation(config, str(path), seed=8)
+    simulator = Simulator(config, seed=8)
+    for until in (30.0, 120.0, 300.0):
+        partial = simulator.run(max_time=until)  # the same run, stopped at `until`
+        state = replay(str(path), until)
+        assert state.base == simulator.protocol.base
+        assert state.expected == simulator.protocol.expected
+        assert state.counts["send"] == partial.transmissions
+        assert state.counts["timeout"] == partial.timeouts
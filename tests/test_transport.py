@@ -0,0 +1,85 @@
+# Tests of the UDP transport over localhost: every protocol delivers the payload intact, files copy byte for byte
+# Timers are generous so a slow machine does not retransmit a lossless transfer
+
+import asyncio
+import random
+import zlib
+
+import pytest
+
+from transport.Checksums import segment_sums
+from transport.FileTransfer import send_file
+from transport.UdpTransport import transfer
+
+PAYLOAD = random.Random(1).randbytes(200_000)
+
+
+@pytest.mark.parametrize("protocol, window_size", [("gbn", 8), ("sr", 8), ("sw", 1)])
+def test_lossless_transfer_is_intact(protocol, window_size):
+    result = asyncio.run(transfer(PAYLOAD, window_size, 1024, re_timer=1.0, protocol=protocol, timeout=30))
+    assert result.intact
+    assert result.bytes == len(PAYLOAD)
+    assert result.packets == 196
+    assert result.retransmissions == 0
+
+
+@pytest.mark.parametrize("protocol", ["gbn", "sr"])
+def test_transfer_with_losses_and_wrapped_sequence_numbers_is_intact(protocol):
+    result = asyncio.run(transfer(PAYLOAD[:50_000], 4, 1024, re_timer=0.05, protocol=protocol, seq_bits=3,
+                                  loss=10, seed=2, timeout=60))
+    assert result.intact
+    assert result.retransmissions > 0
+
+
+def test_transfer_through_a_delaying_proxy_is_intact():
+    result = asyncio.run(transfer(PAYLOAD[:20_000], 8, 1024, re_timer=1.0, delay=0.01, timeout=30))
+    assert result.intact
+    assert result.retransmissions == 0
+    assert result.elapsed >= 0.02  # at least one round trip through the proxy
+
+
+def internet_sum(data:bytes) -> int:
+    """RFC 1071 sum of 16-bit big-endian words, a trailing odd byte padded with zero, folded but not complemented"""
+    total = sum(int.from_bytes(data[i:i + 2].ljust(2, b"\0"), "big") for i in range(0, len(data), 2))
+    while total >> 16:
+        total = (total & 0xFFFF) + (total >> 16)
+    return total
+
+
+@pytest.mark.parametrize("size", [1000, 1024, 1023])
+def test_segment_sums_match_a_packet_at_a_time(size):
+    data = PAYLOAD[:10_001]  # the last segment is short, and odd for the Internet checksum
+    segments = [data[start:start + size] for start in range(0, len(data), size)]
+    assert segment_sums(data, size, "crc32") == [zlib.crc32(segment) for segment in segments]
+    pytest.importorskip("numpy")
+    assert segment_sums(data, size, "internet") == [internet_sum(segment) for segment in segments]
+
+
+@pytest.mark.parametrize("checksum", ["crc32", "internet"])
+def test_file_transfer_copies_the_file(tmp_path, checksum):
+    source = tmp_path / "source.bin"
+    source.write_bytes(PAYLOAD + b"tail")  # the last packet is short
+    destination = tmp_path / "copy.bin"
+    result = asyncio.run(send_file(str(source), str(destination), 8, 1024, re_timer=1.0, checksum=checksum,
+                                   timeout=30))
+    assert result.identical
+    assert result.transfer.intact
+    assert result.transfer.corrupted == 0
+    assert destination.read_bytes() == source.read_bytes()
+
+
+def test_file_transfer_recovers_corrupted_packets(tmp_path):
+    source = tmp_path / "source.bin"
+    source.write_bytes(PAYLOAD[:50_000])
+    destination = tmp_path / "copy.bin"
+    result = asyncio.run(send_file(str(source), str(destination), 8, 1024, re_timer=0.05, corrupt=10, seed=3,
+                                   timeout=60))
+    assert result.identical
+    assert result.transfer.corrupted > 0
+
+
+def test_empty_file_transfer(tmp_path):
+    source = tmp_path / "empty.bin"
+    source.write_bytes(b"")
+    result = asyncio.run(send_file(str(source), str(tmp_path / "copy.bin"), timeout=30))
+    assert result.identical
@@ -0,0 +1,50 @@
+# Checksums of data packets: CRC32 or the Internet checksum (RFC 1071) of the payload and the header fields
+# Payload sums are computed for every segment of a buffer at once, only the header fields are added per packet
+
+import struct
+import zlib
+
+CHECKSUMS = ("crc32", "internet")
+_FIELDS = struct.Struct("!II")
+
+
+def segment_sums(view, size:int, kind:str) -> list[int]:
+    """Partial checksum of every `size`-byte segment of `view`, the last one may be shorter
+
+    For "crc32" the CRC of the segment, for "internet" its 16-bit ones'
+    complement sum, not yet complemented. The Internet sums of all full
+    segments come from two strided NumPy reductions over the buffer, which
+    is read in place.
+    """
+    view = memoryview(view).cast("B")
+    if kind == "crc32":
+        return [zlib.crc32(view[start:start + size]) for start in range(0, len(view), size)] or [0]
+    if kind != "internet":
+        raise ValueError(f"unknown checksum {kind!r}, expected one of {', '.join(CHECKSUMS)}")
+    import numpy as np
+    full = len(view) // size
+    sums = []
+    if full:
+        segments = np.frombuffer(view, dtype=np.uint8, count=full * size).reshape(full, size)
+        total = (segments[:, 0::2].sum(axis=1, dtype=np.uint64) << np.uint64(8)) \
+            + segments[:, 1::2].sum(axis=1, dtype=np.uint64)
+        sums = _fold(total).tolist()
+    if len(view) > full * size or not sums:
+        tail = np.frombuffer(view[full * size:], dtype=np.uint8)
+        sums.append(int(_fold(np.uint64((int(tail[0::2].sum()) << 8) + int(tail[1::2].sum())))))
+    return sums
+
+
+def _fold(total):
+    """Fold a ones' complement sum held in 64 bits down to 16"""
+    for _ in range(3):
+        total = (total & 0xFFFF) + (total >> 16)
+    return total
+
+
+def seal(kind:str, partial:int, seq:int, total:int) -> int:
+    """Checksum a packet carries: its payload's partial sum extended over the sequence number and packet count"""
+    if kind == "crc32":
+        return zlib.crc32(_FIELDS.pack(seq, total), partial)
+    words = partial + (seq >> 16) + (seq & 0xFFFF) + (total >> 16) + (total & 0xFFFF)
+    return ~int(_fold(words)) & 0xFFFF
@@ -0,0 +1,77 @@
+# LossProxy relays UDP datagrams between a sender and a receiver, losing and delaying some of them on purpose
+# Real sockets on localhost never drop anything, the proxy puts the simulator's lossy link between them
+
+import asyncio
+import random
+
+
+class LossProxy(asyncio.DatagramProtocol):
+    """UDP relay with independent random loss, bit errors and a fixed one-way delay
+
+    The sender sends to the proxy's address instead of the receiver's.
+    Datagrams from the target are returned to whoever sent to the proxy
+    last, so replies travel back through the proxy too. Use start() to bind
+    it and close() to stop it.
+
+    Args:
+        target: (host, port) of the receiver
+        loss: percentage of datagrams dropped in each direction
+        delay: one-way delay in seconds added to every datagram
+        seed: seed of the loss draws
+        corrupt: percentage of the datagrams towards the target with one bit flipped, ACKs are never corrupted
+    """
+
+    def __init__(self, target:tuple, loss:float = 0.0, delay:float = 0.0, seed=None, corrupt:float = 0.0):
+        if not 0 <= loss <= 100 or not 0 <= corrupt <= 100:
+            raise ValueError("loss and corrupt must be percentages between 0 and 100")
+        if delay < 0:
+            raise ValueError("delay must be >= 0")
+        self.target = target
+        self.loss = loss
+        self.delay = delay
+        self.corrupt = corrupt
+        self.rng = random.Random(seed)
+        self.transport = None
+        self.client = None  # address of the sender, learnt from its first datagram
+        self.forwarded = 0  # datagrams relayed
+        self.dropped = 0  # datagrams lost on purpose
+        self.corrupted = 0  # datagrams relayed with a flipped bit
+
+    async def start(self, host:str = "127.0.0.1", port:int = 0) -> tuple:
+        """Bind the proxy and return the (host, port) the sender should use"""
+        loop = asyncio.get_running_loop()
+        await loop.create_datagram_endpoint(lambda: self, local_addr=(host, port))
+        return self.transport.get_extra_info("sockname")[:2]
+
+    def close(self):
+        if self.transport is not None:
+            self.transport.close()
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data:bytes, addr:tuple):
+        if addr[:2] == self.target[:2]:
+            destination = self.client
+        else:
+            self.client = addr
+            destination = self.target
+        if destination is None:
+            return  # a reply before the sender said anything
+        if self.loss and self.rng.random() * 100 < self.loss:
+            self.dropped += 1
+            return
+        if self.corrupt and destination is self.target and data and self.rng.random() * 100 < self.corrupt:
+            data = bytearray(data)
+            bit = self.rng.randrange(len(data) * 8)
+            data[bit >> 3] ^= 1 << (bit & 7)
+            self.corrupted += 1
+        self.forwarded += 1
+        if self.delay:
+            asyncio.get_running_loop().call_later(self.delay, self._forward, data, destination)
+        else:
+            self.transport.sendto(data, destination)
+
+    def _forward(self, data:bytes, destination:tuple):
+        if not self.transport.is_closing():
+            self.transport.sendto(data, destination)
@@ -0,0 +1,335 @@
+# UdpTransport moves real bytes with the ARQ state machines of simulation.Protocols over asyncio UDP sockets
+# The sender and the receiver each drive their half of a protocol object, the same ones the GUI and the simulator use
+
+import asyncio
+import math
+import socket
+import struct
+import time
+from dataclasses import dataclass
+
+from simulation.Protocols import make_protocol
+from simulation.SeqRing import SeqRing
+from transport.Checksums import seal, segment_sums
+from transport.LossProxy import LossProxy
+
+HEADER = struct.Struct("!BII")  # kind, sequence number, packet count (DATA) or cumulative ACK (ACK)
+CHECKED_HEADER = struct.Struct("!BIII")  # HEADER of a CHECKED data packet followed by its checksum
+DATA = 0
+ACK = 1
+CHECKED = 2  # data packet carrying a checksum
+MAX_PACKETS = 2**32 - 1  # sequence numbers and counts travel in 32-bit fields
+
+
+@dataclass
+class TransferResult:
+    """Outcome of one transfer, counted at the sender"""
+
+    bytes: int = 0              # payload bytes delivered
+    packets: int = 0            # data packets the payload was cut into
+    transmissions: int = 0      # data packets sent, including retransmissions
+    retransmissions: int = 0
+    timeouts: int = 0
+    elapsed: float = 0.0        # wall seconds from the first send to the last ACK
+    intact: bool = False        # the receiver got exactly the bytes that were sent
+    corrupted: int = 0          # data packets the receiver discarded for a wrong checksum
+
+    @property
+    def mb_per_s(self) -> float:
+        return self.bytes / 1e6 / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def packets_per_s(self) -> float:
+        return self.packets / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class UdpReceiver(asyncio.DatagramProtocol):
+    """Receiving end: feeds data packets to protocol.packet_arrived() and acknowledges every one
+
+    The number of packets comes with every data packet, the protocol is built
+    from the first. Accepted payloads are appended to `data` in order, and
+    `done` resolves with them once every packet is delivered. The receiver
+    keeps acknowledging retransmissions after that, in case its last ACKs
+    were lost, until it is closed.
+
+    Given a preallocated `buffer`, every accepted payload is written straight
+    to its offset in it instead and `done` resolves with the buffer. Packets
+    with a checksum that does not match are dropped unacknowledged, like a
+    lost packet.
+
+    Args:
+        protocol: key of simulation.Protocols.PROTOCOLS, the sender must use the same
+        window_size: receive window, Selective Repeat buffers that many packets
+        seq_bits: bits of the sequence numbers on the wire, 0 for the full 32 bits
+        checksum: one of transport.Checksums.CHECKSUMS, the sender must use the same
+        buffer: writable bytes-like the size of the whole payload
+        packet_size: payload bytes per data packet, needed with a buffer
+    """
+
+    def __init__(self, protocol:str = "gbn", window_size:int = 8, seq_bits:int = 0, checksum:str = None,
+                 buffer=None, packet_size:int = 1024):
+        make_protocol(protocol, window_size, window_size, seq_bits)  # ValueError for a window the numbers cannot hold
+        self.protocol_name = protocol
+        self.window_size = window_size
+        self.seq_bits = seq_bits
+        self.checksum = checksum
+        self.protocol = None
+        self.data = bytearray()
+        self.buffer = None if buffer is None else memoryview(buffer).cast("B")
+        self.packet_size = packet_size
+        self._buffer = {}  # accepted packet -> payload, until it is delivered in order
+        self.corrupted = 0
+        self.transport = None
+        self.done = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.done = asyncio.get_running_loop().create_future()
+
+    def datagram_received(self, datagram:bytes, addr:tuple):
+        if len(datagram) < HEADER.size:
+            return
+        kind, wire, total = HEADER.unpack_from(datagram)
+        if kind == CHECKED and self.checksum and len(datagram) >= CHECKED_HEADER.size:
+            payload = memoryview(datagram)[CHECKED_HEADER.size:]
+            if seal(self.checksum, segment_sums(payload, len(payload) or 1, self.checksum)[0], wire, total) \
+                    != CHECKED_HEADER.unpack_from(datagram)[3]:
+                self.corrupted += 1
+                return
+        elif kind == DATA and not self.checksum:
+            payload = memoryview(datagram)[HEADER.size:]
+        else:
+            return
+        if not total:
+            return
+        protocol = self.protocol
+        if protocol is None:
+            protocol = self.protocol = make_protocol(self.protocol_name, total, min(self.window_size, total),
+                                                     self.seq_bits)
+        before = protocol.expected
+        seq = protocol.unwrap(wire, before)
+        expected = protocol.packet_arrived(wire)
+        if seq >= before and protocol.has_received(seq):
+            if self.buffer is None:
+                self._buffer[seq] = payload
+            else:
+                offset = seq * self.packet_size
+                self.buffer[offset:offset + len(payload)] = payload  # in place, in order of the file whatever the arrival
+        if self.buffer is None:
+            for delivered in range(before, expected):
+                self.data += self._buffer.pop(delivered)
+        self.transport.sendto(HEADER.pack(ACK, wire, protocol.wire(expected)), addr)
+        if expected >= protocol.num_packets and not self.done.done():
+            self.done.set_result(bytes(self.data) if self.buffer is None else self.buffer)
+
+
+class UdpSender(asyncio.DatagramProtocol):
+    """Sending end: cuts `data` into packets and sends them as protocol.sendable() allows
+
+    Retransmission timers run on the event loop with the rules of
+    simulation.Simulator: one timer on the oldest outstanding packet whose
+    expiry resends everything outstanding, or one per packet for protocols
+    with per_packet_timers. `done` resolves with a TransferResult when every
+    packet is acknowledged.
+
+    Given the endpoint's connected socket as `sock`, every packet goes out
+    with sendmsg() of its header and a slice of `data`, so payloads reach
+    the kernel without being copied into a datagram first. Without it, or
+    when the socket would block, the two are joined and handed to the
+    transport.
+
+    Args:
+        data: bytes-like payload, sliced without copying
+        window_size: send window (capped to the number of packets)
+        packet_size: payload bytes per data packet
+        re_timer: retransmission timeout in seconds
+        protocol: key of simulation.Protocols.PROTOCOLS
+        seq_bits: bits of the sequence numbers on the wire, 0 for the full 32 bits
+        checksum: one of transport.Checksums.CHECKSUMS to send CHECKED packets, None for plain DATA
+    """
+
+    def __init__(self, data, window_size:int = 8, packet_size:int = 1024, re_timer:float = 0.2,
+                 protocol:str = "gbn", seq_bits:int = 0, checksum:str = None):
+        if packet_size < 1 or re_timer <= 0:
+            raise ValueError("packet_size must be >= 1 and re_timer must be > 0")
+        self.view = memoryview(data).cast("B")
+        self.packet_size = packet_size
+        num_packets = max(1, math.ceil(len(self.view) / packet_size))
+        if num_packets > MAX_PACKETS:
+            raise ValueError(f"at most {MAX_PACKETS} packets fit the header, use larger packets")
+        self.protocol = make_protocol(protocol, num_packets, min(window_size, num_packets), seq_bits)
+        self.re_timer = re_timer
+        self.checksum = checksum
+        self._sums = segment_sums(self.view, packet_size, checksum) if checksum else None  # every payload, up front
+        self.result = TransferResult(bytes=len(self.view), packets=num_packets)
+        self._sent = SeqRing(self.protocol.window_size, 0)  # transmissions of every packet of the window
+        self._deadline = None  # expiry of the window's timer, None while it is stopped
+        self._timer = None  # loop handle firing at or before _deadline
+        self._timers = {}  # packet -> handle of its own timer, with per_packet_timers
+        self.transport = None
+        self.sock = None  # connected socket.socket of the endpoint, for gathering sends
+        self.done = None
+        self._start = 0.0
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.done = asyncio.get_running_loop().create_future()
+        self._start = time.perf_counter()
+        self._send(self.protocol.sendable())
+
+    def connection_lost(self, exc):
+        self._stop_timers()
+
+    def _send(self, packets):
+        protocol = self.protocol
+        size = self.packet_size
+        total = protocol.num_packets
+        sendmsg = getattr(self.sock, "sendmsg", None)  # not on Windows
+        for seq in packets:
+            if protocol.is_acked(seq):
+                continue
+            wire = protocol.wire(seq)
+            if self._sums is None:
+                header = HEADER.pack(DATA, wire, total)
+            else:
+                header = CHECKED_HEADER.pack(CHECKED, wire, total, seal(self.checksum, self._sums[seq], wire, total))
+            payload = self.view[seq * size:(seq + 1) * size]
+            if sendmsg is not None and not self.transport.get_write_buffer_size():
+                try:
+                    sendmsg((header, payload))
+                except (BlockingIOError, InterruptedError):
+                    self.transport.sendto(header + payload)  # queued by the transport until the socket drains
+                except OSError as exc:
+                    self.error_received(exc)
+            else:
+                self.transport.sendto(header + payload)
+            self.result.transmissions += 1
+            attempt = self._sent[seq]
+            if attempt:
+                self.result.retransmissions += 1
+            self._sent[seq] = attempt + 1
+            if protocol.per_packet_timers:
+                self._start_packet_timer(seq)
+            elif self._deadline is None:
+                self._start_timer()
+
+    # The window's timer is restarted on every slide, so it only moves a deadline and the
+    # loop callback re-arms itself when it fires early, instead of cancelling and rescheduling
+
+    def _start_timer(self):
+        loop = asyncio.get_running_loop()
+        self._deadline = loop.time() + self.re_timer
+        if self._timer is None:
+            self._timer = loop.call_at(self._deadline, self._window_timer_fired)
+
+    def _window_timer_fired(self):
+        self._timer = None
+        if self._deadline is None:
+            return
+        loop = asyncio.get_running_loop()
+        if loop.time() < self._deadline:
+            self._timer = loop.call_at(self._deadline, self._window_timer_fired)
+            return
+        self.result.timeouts += 1
+        self._start_timer()
+        self._send(self.protocol.timeout())  # go back N: resend everything outstanding
+
+    def _start_packet_timer(self, seq:int):
+        handle = self._timers.pop(seq, None)
+        if handle is not None:
+            handle.cancel()
+        self._timers[seq] = asyncio.get_running_loop().call_later(self.re_timer, self._packet_timer_fired, seq)
+
+    def _packet_timer_fired(self, seq:int):
+        self._timers.pop(seq, None)
+        self.result.timeouts += 1
+        self._send(self.protocol.timeout(seq))  # resend that packet alone
+
+    def _stop_timers(self):
+        self._deadline = None
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        for handle in self._timers.values():
+            handle.cancel()
+        self._timers.clear()
+
+    def datagram_received(self, datagram:bytes, addr:tuple):
+        if len(datagram) < HEADER.size:
+            return
+        kind, wire, ack = HEADER.unpack_from(datagram)
+        protocol = self.protocol
+        if kind != ACK or protocol.done:
+            return
+        base = protocol.base
+        newly_acked = protocol.ack_arrived(ack, wire)
+        if not newly_acked:
+            return
+        if protocol.per_packet_timers:
+            for seq in newly_acked:
+                handle = self._timers.pop(seq, None)
+                if handle is not None:
+                    handle.cancel()
+        if protocol.done:
+            self._stop_timers()
+            self.result.elapsed = time.perf_counter() - self._start
+            self.done.set_result(self.result)
+        elif protocol.base != base:
+            self._send(protocol.sendable())
+            if not protocol.per_packet_timers:
+                if protocol.timer_needed:
+                    self._start_timer()  # restart for the new oldest packet
+                else:
+                    self._deadline = None
+
+    def error_received(self, exc):
+        pass  # e.g. the receiver is not up yet, the retransmission timer resends
+
+
+async def transfer(data, window_size:int = 8, packet_size:int = 1024, re_timer:float = 0.2, protocol:str = "gbn",
+                   seq_bits:int = 0, loss:float = 0.0, delay:float = 0.0, seed=None,
+                   timeout:float = None, checksum:str = None, corrupt:float = 0.0,
+                   buffer=None) -> TransferResult:
+    """Send `data` from a UdpSender to a UdpReceiver over localhost and return the sender's counters
+
+    With a loss or corruption percentage or a one-way delay the datagrams go
+    through a LossProxy. With a `buffer` the receiver reassembles into it
+    instead of its own bytearray. The views of `data` and `buffer` are
+    released on return, so memory maps behind them can be closed. Raises
+    asyncio.TimeoutError if the transfer takes longer than `timeout` wall
+    seconds.
+    """
+    loop = asyncio.get_running_loop()
+    receiver_transport, receiver = await loop.create_datagram_endpoint(
+        lambda: UdpReceiver(protocol, window_size, seq_bits, checksum, buffer, packet_size),
+        local_addr=("127.0.0.1", 0))
+    target = receiver_transport.get_extra_info("sockname")[:2]
+    proxy = None
+    sender = None
+    sender_transport = None
+    try:
+        if loss or delay or corrupt:
+            proxy = LossProxy(target, loss, delay, seed, corrupt)
+            target = await proxy.start()
+        sender = UdpSender(data, window_size, packet_size, re_timer, protocol, seq_bits, checksum)
+        sender.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sender.sock.setblocking(False)
+        sender.sock.connect(target)
+        sender_transport, _ = await loop.create_datagram_endpoint(lambda: sender, sock=sender.sock)
+        result = await asyncio.wait_for(sender.done, timeout)
+        received = await receiver.done
+        result.intact = memoryview(received).cast("B") == sender.view
+        result.corrupted = receiver.corrupted
+        return result
+    finally:
+        if sender_transport is not None:
+            sender_transport.close()
+        elif sender is not None and sender.sock is not None:
+            sender.sock.close()
+        if proxy is not None:
+            proxy.close()
+        receiver_transport.close()
+        if sender is not None:
+            sender.view.release()
+        if receiver.buffer is not None:
+            receiver.buffer.release()
@@ -15,8 +15,8 @@ from PySide6.QtGui import (QBrush, QColor, QConicalGradient, QCursor,
     QFont, QFontDatabase, QGradient, QIcon,
     QImage, QKeySequence, QLinearGradient, QPainter,
     QPalette, QPixmap, QRadialGradient, QTransform)
-from PySide6.QtWidgets import (QApplication, QHBoxLayout, QPushButton, QSizePolicy,
-    QWidget)
+from PySide6.QtWidgets import (QApplication, QComboBox, QHBoxLayout, QPushButton,
+    QSizePolicy, QSlider, QSpinBox, QWidget)
 
 class Ui_w_play_and_reset(object):
     def setupUi(self, w_play_and_reset):
@@ -48,6 +48,123 @@ class Ui_w_play_and_reset(object):
 
         self.horizontalLayout.addWidget(self.pb_play)
 
+        self.cb_speed = QComboBox(w_play_and_reset)
+        self.cb_speed.setObjectName(u"cb_speed")
+        self.cb_speed.setStyleSheet(u"QComboBox {\n"
+"    font: bold 16px;\n"
+"    padding: 4px;\n"
+"}")
+
+        self.horizontalLayout.addWidget(self.cb_speed)
+
+        self.pb_skip = QPushButton(w_play_and_reset)
+        self.pb_skip.setObjectName(u"pb_skip")
+        self.pb_skip.setStyleSheet(u"QPushButton {\n"
+"    background-color: #2B5DD1;\n"
+"    color: #FFFFFF;\n"
+"    border-style: outset;\n"
+"    padding: 2px;\n"
+"    font: bold 20px;\n"
+"    border-width: 6px;\n"
+"    border-radius: 10px;\n"
+"    border-color: #2752B8;\n"
+"}\n"
+"QPushButton:hover {\n"
+"    background-color: lightgreen;\n"
+"}\n"
+"\n"
+"QPushButton:pressed{\n"
+"	background-color: blue;\n"
+"}")
+
+        self.horizontalLayout.addWidget(self.pb_skip)
+
+        self.spin_seed = QSpinBox(w_play_and_reset)
+        self.spin_seed.setObjectName(u"spin_seed")
+        self.spin_seed.setStyleSheet(u"QSpinBox {\n"
+"    font: bold 16px;\n"
+"    padding: 4px;\n"
+"}")
+        self.spin_seed.setMinimum(-1)
+        self.spin_seed.setMaximum(2147483647)
+        self.spin_seed.setValue(-1)
+
+        self.horizontalLayout.addWidget(self.spin_seed)
+
+        self.pb_save_trace = QPushButton(w_play_and_reset)
+        self.pb_save_trace.setObjectName(u"pb_save_trace")
+        self.pb_save_trace.setStyleSheet(u"QPushButton {\n"
+"    background-color: #2B5DD1;\n"
+"    color: #FFFFFF;\n"
+"    border-style: outset;\n"
+"    padding: 2px;\n"
+"    font: bold 20px;\n"
+"    border-width: 6px;\n"
+"    border-radius: 10px;\n"
+"    border-color: #2752B8;\n"
+"}\n"
+"QPushButton:hover {\n"
+"    background-color: lightgreen;\n"
+"}\n"
+"\n"
+"QPushButton:pressed{\n"
+"	background-color: blue;\n"
+"}")
+
+        self.horizontalLayout.addWidget(self.pb_save_trace)
+
+        self.pb_open_trace = QPushButton(w_play_and_reset)
+        self.pb_open_trace.setObjectName(u"pb_open_trace")
+        self.pb_open_trace.setStyleSheet(u"QPushButton {\n"
+"    background-color: #2B5DD1;\n"
+"    color: #FFFFFF;\n"
+"    border-style: outset;\n"
+"    padding: 2px;\n"
+"    font: bold 20px;\n"
+"    border-width: 6px;\n"
+"    border-radius: 10px;\n"
+"    border-color: #2752B8;\n"
+"}\n"
+"QPushButton:hover {\n"
+"    background-color: lightgreen;\n"
+"}\n"
+"\n"
+"QPushButton:pressed{\n"
+"	background-color: blue;\n"
+"}")
+
+        self.horizontalLayout.addWidget(self.pb_open_trace)
+
+        self.pb_flows = QPushButton(w_play_and_reset)
+        self.pb_flows.setObjectName(u"pb_flows")
+        self.pb_flows.setStyleSheet(u"QPushButton {\n"
+"    background-color: #2B5DD1;\n"
+"    color: #FFFFFF;\n"
+"    border-style: outset;\n"
+"    padding: 2px;\n"
+"    font: bold 20px;\n"
+"    border-width: 6px;\n"
+"    border-radius: 10px;\n"
+"    border-color: #2752B8;\n"
+"}\n"
+"QPushButton:hover {\n"
+"    background-color: lightgreen;\n"
+"}\n"
+"\n"
+"QPushButton:pressed{\n"
+"	background-color: blue;\n"
+"}")
+
+        self.horizontalLayout.addWidget(self.pb_flows)
+
+        self.sl_replay = QSlider(w_play_and_reset)
+        self.sl_replay.setObjectName(u"sl_replay")
+        self.sl_replay.setMaximum(1000)
+        self.sl_replay.setTracking(False)
+        self.sl_replay.setOrientation(Qt.Horizontal)
+
+        self.horizontalLayout.addWidget(self.sl_replay)
+
         self.pb_reset = QPushButton(w_play_and_reset)
         self.pb_reset.setObjectName(u"pb_reset")
         self.pb_reset.setStyleSheet(u"QPushButton {\n"
@@ -79,6 +196,23 @@ class Ui_w_play_and_reset(object):
     def retranslateUi(self, w_play_and_reset):
         w_play_and_reset.setWindowTitle(QCoreApplication.translate("w_play_and_reset", u"Form", None))
         self.pb_play.setText(QCoreApplication.translate("w_play_and_reset", u"Play", None))
+#if QT_CONFIG(tooltip)
+        self.cb_speed.setToolTip(QCoreApplication.translate("w_play_and_reset", u"Simulation speed", None))
+#endif // QT_CONFIG(tooltip)
+        self.pb_skip.setText(QCoreApplication.translate("w_play_and_reset", u"Skip to End", None))
+#if QT_CONFIG(tooltip)
+        self.spin_seed.setToolTip(QCoreApplication.translate("w_play_and_reset", u"Seed of the random packet and ACK losses, the same seed replays the same draws", None))
+#endif // QT_CONFIG(tooltip)
+        self.spin_seed.setSpecialValueText(QCoreApplication.translate("w_play_and_reset", u"Random seed", None))
+        self.pb_save_trace.setText(QCoreApplication.translate("w_play_and_reset", u"Save Trace", None))
+        self.pb_open_trace.setText(QCoreApplication.translate("w_play_and_reset", u"Open Trace", None))
+#if QT_CONFIG(tooltip)
+        self.pb_flows.setToolTip(QCoreApplication.translate("w_play_and_reset", u"Run many flows of the current settings over one shared link", None))
+#endif // QT_CONFIG(tooltip)
+        self.pb_flows.setText(QCoreApplication.translate("w_play_and_reset", u"Many Flows", None))
+#if QT_CONFIG(tooltip)
+        self.sl_replay.setToolTip(QCoreApplication.translate("w_play_and_reset", u"Replay position in the opened trace", None))
+#endif // QT_CONFIG(tooltip)
         self.pb_reset.setText(QCoreApplication.translate("w_play_and_reset", u"Reset Animation and Sliders", None))
     # retranslateUi
 
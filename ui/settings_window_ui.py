@@ -15,8 +15,9 @@ from PySide6.QtGui import (QBrush, QColor, QConicalGradient, QCursor,
     QFont, QFontDatabase, QGradient, QIcon,
     QImage, QKeySequence, QLinearGradient, QPainter,
     QPalette, QPixmap, QRadialGradient, QTransform)
-from PySide6.QtWidgets import (QApplication, QGridLayout, QGroupBox, QLabel,
-    QSizePolicy, QSlider, QSpinBox, QWidget)
+from PySide6.QtWidgets import (QApplication, QComboBox, QGridLayout, QGroupBox,
+    QLabel, QPushButton, QSizePolicy, QSlider,
+    QSpinBox, QWidget)
 
 class Ui_w_settings(object):
     def setupUi(self, w_settings):
@@ -93,6 +94,40 @@ class Ui_w_settings(object):
 
         self.gridLayout_2.addWidget(self.sl_re_timer, 1, 1, 1, 1)
 
+        self.label_14 = QLabel(self.groupBox)
+        self.label_14.setObjectName(u"label_14")
+        self.label_14.setAlignment(Qt.AlignCenter)
+
+        self.gridLayout_2.addWidget(self.label_14, 3, 0, 1, 1)
+
+        self.cb_loss_model = QComboBox(self.groupBox)
+        self.cb_loss_model.setObjectName(u"cb_loss_model")
+
+        self.gridLayout_2.addWidget(self.cb_loss_model, 3, 1, 1, 1)
+
+        self.spin_burst_length = QSpinBox(self.groupBox)
+        self.spin_burst_length.setObjectName(u"spin_burst_length")
+        self.spin_burst_length.setAlignment(Qt.AlignCenter)
+
+        self.gridLayout_2.addWidget(self.spin_burst_length, 3, 2, 1, 1)
+
+        self.label_15 = QLabel(self.groupBox)
+        self.label_15.setObjectName(u"label_15")
+        self.label_15.setAlignment(Qt.AlignCenter)
+
+        self.gridLayout_2.addWidget(self.label_15, 4, 0, 1, 1)
+
+        self.spin_ack_loss = QSpinBox(self.groupBox)
+        self.spin_ack_loss.setObjectName(u"spin_ack_loss")
+        self.spin_ack_loss.setAlignment(Qt.AlignCenter)
+
+        self.gridLayout_2.addWidget(self.spin_ack_loss, 4, 1, 1, 1)
+
+        self.pb_loss_trace = QPushButton(self.groupBox)
+        self.pb_loss_trace.setObjectName(u"pb_loss_trace")
+
+        self.gridLayout_2.addWidget(self.pb_loss_trace, 4, 2, 1, 1)
+
 
         self.gridLayout.addWidget(self.groupBox, 0, 0, 1, 1)
 
@@ -126,6 +161,76 @@ class Ui_w_settings(object):
 
         self.gridLayout_3.addWidget(self.spin_K, 0, 1, 1, 1)
 
+        self.label_9 = QLabel(self.groupBox_2)
+        self.label_9.setObjectName(u"label_9")
+        self.label_9.setAlignment(Qt.AlignCenter)
+
+        self.gridLayout_3.addWidget(self.label_9, 1, 0, 1, 1)
+
+        self.cb_protocol = QComboBox(self.groupBox_2)
+        self.cb_protocol.setObjectName(u"cb_protocol")
+
+        self.gridLayout_3.addWidget(self.cb_protocol, 1, 1, 1, 1)
+
+        self.label_16 = QLabel(self.groupBox_2)
+        self.label_16.setObjectName(u"label_16")
+        self.label_16.setAlignment(Qt.AlignCenter)
+
+        self.gridLayout_3.addWidget(self.label_16, 1, 2, 1, 1)
+
+        self.spin_seq_bits = QSpinBox(self.groupBox_2)
+        self.spin_seq_bits.setObjectName(u"spin_seq_bits")
+        self.spin_seq_bits.setAlignment(Qt.AlignCenter)
+
+        self.gridLayout_3.addWidget(self.spin_seq_bits, 1, 3, 1, 1)
+
+        self.label_10 = QLabel(self.groupBox_2)
+        self.label_10.setObjectName(u"label_10")
+        self.label_10.setAlignment(Qt.AlignCenter)
+
+        self.gridLayout_3.addWidget(self.label_10, 2, 0, 1, 1)
+
+        self.spin_bandwidth = QSpinBox(self.groupBox_2)
+        self.spin_bandwidth.setObjectName(u"spin_bandwidth")
+        self.spin_bandwidth.setAlignment(Qt.AlignCenter)
+
+        self.gridLayout_3.addWidget(self.spin_bandwidth, 2, 1, 1, 1)
+
+        self.label_11 = QLabel(self.groupBox_2)
+        self.label_11.setObjectName(u"label_11")
+        self.label_11.setAlignment(Qt.AlignCenter)
+
+        self.gridLayout_3.addWidget(self.label_11, 2, 2, 1, 1)
+
+        self.spin_packet_size = QSpinBox(self.groupBox_2)
+        self.spin_packet_size.setObjectName(u"spin_packet_size")
+        self.spin_packet_size.setAlignment(Qt.AlignCenter)
+
+        self.gridLayout_3.addWidget(self.spin_packet_size, 2, 3, 1, 1)
+
+        self.label_12 = QLabel(self.groupBox_2)
+        self.label_12.setObjectName(u"label_12")
+        self.label_12.setAlignment(Qt.AlignCenter)
+
+        self.gridLayout_3.addWidget(self.label_12, 3, 0, 1, 1)
+
+        self.spin_queue_limit = QSpinBox(self.groupBox_2)
+        self.spin_queue_limit.setObjectName(u"spin_queue_limit")
+        self.spin_queue_limit.setAlignment(Qt.AlignCenter)
+
+        self.gridLayout_3.addWidget(self.spin_queue_limit, 3, 1, 1, 1)
+
+        self.label_13 = QLabel(self.groupBox_2)
+        self.label_13.setObjectName(u"label_13")
+        self.label_13.setAlignment(Qt.AlignCenter)
+
+        self.gridLayout_3.addWidget(self.label_13, 3, 2, 1, 1)
+
+        self.cb_queue_policy = QComboBox(self.groupBox_2)
+        self.cb_queue_policy.setObjectName(u"cb_queue_policy")
+
+        self.gridLayout_3.addWidget(self.cb_queue_policy, 3, 3, 1, 1)
+
 
         self.gridLayout.addWidget(self.groupBox_2, 1, 0, 1, 1)
 
@@ -144,8 +249,17 @@ class Ui_w_settings(object):
         self.label_2.setText(QCoreApplication.translate("w_settings", u"Retransimission Timer", None))
         self.label_3.setText(QCoreApplication.translate("w_settings", u"Chance of Packet Loss", None))
         self.lbl_re_timer.setText(QCoreApplication.translate("w_settings", u"5.0s", None))
+        self.label_14.setText(QCoreApplication.translate("w_settings", u"Loss Model", None))
+        self.label_15.setText(QCoreApplication.translate("w_settings", u"ACK Loss", None))
+        self.pb_loss_trace.setText(QCoreApplication.translate("w_settings", u"Load Loss Trace", None))
         self.groupBox_2.setTitle("")
         self.label_8.setText(QCoreApplication.translate("w_settings", u"Sender Window Size: R", None))
         self.label_7.setText(QCoreApplication.translate("w_settings", u"Number of Packets: K", None))
+        self.label_9.setText(QCoreApplication.translate("w_settings", u"Protocol", None))
+        self.label_16.setText(QCoreApplication.translate("w_settings", u"Sequence Number Bits", None))
+        self.label_10.setText(QCoreApplication.translate("w_settings", u"Bandwidth", None))
+        self.label_11.setText(QCoreApplication.translate("w_settings", u"Packet Size", None))
+        self.label_12.setText(QCoreApplication.translate("w_settings", u"Queue Limit", None))
+        self.label_13.setText(QCoreApplication.translate("w_settings", u"Queue Policy", None))
     # retranslateUi
 
@@ -0,0 +1,243 @@
+# FlowSummary runs many copies of the current settings as competing flows and shows how they shared the link
+# The flows run headless in simulation.MultiFlow, the window only shows the totals and a sortable table per flow
+
+import random
+
+from PySide6 import QtCore as qtc
+from PySide6 import QtWidgets as qtw
+from PySide6 import QtGui as qtg
+
+from simulation.MultiFlow import MultiFlowResult, MultiFlowSimulator
+from simulation.SimConfig import SimConfig
+
+COLUMNS = ("Flow", "Start (s)", "Completed (s)", "Duration (s)", "Goodput (pkt/s)", "Sent", "Resent", "Timeouts")
+SLICE_EVENTS = 20000  # events the worker runs between progress reports and checks for Stop
+
+
+class FlowRunner(qtc.QThread):
+    """Runs a MultiFlowSimulator off the GUI thread, a slice of events at a time
+
+    The window stays responsive while thousands of flows run. Emits `progress`
+    after every slice and `result` once the flows complete or the run is
+    stopped with requestInterruption(), then the partial result. `failed`
+    carries the message of a configuration the flows cannot run.
+    """
+
+    progress = qtc.Signal(int, int)  # completed flows, flows
+    result = qtc.Signal(object)      # MultiFlowResult, completed False when stopped early
+    failed = qtc.Signal(str)
+
+    def __init__(self, config:SimConfig, flows:int, seed:int, start_spread:float, parent:qtc.QObject = None):
+        super().__init__(parent)
+        self.config = config
+        self.flows = flows
+        self.seed = seed
+        self.start_spread = start_spread
+
+    def run(self):
+        try:
+            simulator = MultiFlowSimulator(self.config, self.flows, self.seed, self.start_spread)
+        except ValueError as e:
+            self.failed.emit(str(e))
+            return
+        if max(simulator.loss_rates()) >= 1:
+            self.failed.emit("a run with 100% loss never completes")
+            return
+        result = simulator.result
+        while not self.isInterruptionRequested():
+            events = result.events
+            simulator.run(max_events=events + SLICE_EVENTS)
+            self.progress.emit(simulator.completed_flows(), self.flows)
+            if result.completed or result.events == events:
+                break
+        self.result.emit(result)
+
+
+class FlowTableModel(qtc.QAbstractTableModel):
+    """One row per flow of a MultiFlowResult, the view only asks for the visible cells
+
+    Sorting reorders the rows with one list sort on the raw values, 10,000
+    flows would take a second through a QSortFilterProxyModel.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.flows = []
+        self.order = []  # flow index shown in each row
+        self.sorted_by = (0, qtc.Qt.AscendingOrder)
+
+    def set_result(self, result:MultiFlowResult):
+        self.beginResetModel()
+        self.flows = result.flows
+        self.order = list(range(len(self.flows)))
+        self.endResetModel()
+        self.sort(*self.sorted_by)
+
+    def sort_key(self, number:int, column:int):
+        """Raw value of a column for flow `number`, what the rows are sorted on"""
+        flow = self.flows[number]
+        if column == 0:
+            return number
+        if column in (2, 3) and not flow.completed:
+            return float("inf")
+        return (number, flow.start, flow.completion_time, flow.duration, flow.goodput,
+                flow.transmissions, flow.retransmissions, flow.timeouts)[column]
+
+    def sort(self, column:int, order=qtc.Qt.AscendingOrder):
+        self.sorted_by = (column, order)
+        self.layoutAboutToBeChanged.emit()
+        self.order.sort(key=lambda number: self.sort_key(number, column), reverse=order == qtc.Qt.DescendingOrder)
+        self.layoutChanged.emit()
+
+    def rowCount(self, parent=qtc.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.flows)
+
+    def columnCount(self, parent=qtc.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section:int, orientation, role=qtc.Qt.DisplayRole):
+        if role == qtc.Qt.DisplayRole and orientation == qtc.Qt.Horizontal:
+            return COLUMNS[section]
+        return None
+
+    def data(self, index:qtc.QModelIndex, role=qtc.Qt.DisplayRole):
+        number = self.order[index.row()]
+        flow = self.flows[number]
+        column = index.column()
+        if role == qtc.Qt.DisplayRole:
+            if column == 0:
+                return str(number + 1)
+            if column == 1:
+                return f"{flow.start:.3f}"
+            if column in (2, 3) and not flow.completed:
+                return "-"
+            if column == 2:
+                return f"{flow.completion_time:.3f}"
+            if column == 3:
+                return f"{flow.duration:.3f}"
+            if column == 4:
+                return f"{flow.goodput:.2f}"
+            return str((flow.transmissions, flow.retransmissions, flow.timeouts)[column - 5])
+        if role == qtc.Qt.TextAlignmentRole:
+            return int(qtc.Qt.AlignRight | qtc.Qt.AlignVCenter)
+        return None
+
+
+class FlowSummary(qtw.QDialog):
+    """Window that runs N flows of the panel's settings over one shared link and summarises them
+
+    Args:
+        config: callable returning the SimConfig every flow uses, read on each run
+        parent: window the dialog belongs to
+    """
+
+    def __init__(self, config, parent:qtw.QWidget = None):
+        super().__init__(parent)
+        self.config = config
+        self.setWindowTitle("Many Flows")
+        self.resize(900, 600)
+
+        vbox = qtw.QVBoxLayout(self)
+        hbox = qtw.QHBoxLayout()
+        self.spin_flows = qtw.QSpinBox(self)
+        self.spin_flows.setRange(1, 10000)
+        self.spin_flows.setValue(100)
+        self.spin_flows.setSuffix(" flows")
+        self.spin_spread = qtw.QDoubleSpinBox(self)
+        self.spin_spread.setRange(0, 1000)
+        self.spin_spread.setValue(1.0)
+        self.spin_spread.setPrefix("starts within ")
+        self.spin_spread.setSuffix(" s")
+        self.spin_seed = qtw.QSpinBox(self)
+        self.spin_seed.setRange(-1, 2**31 - 1)
+        self.spin_seed.setValue(-1)
+        self.spin_seed.setSpecialValueText("Random seed")
+        self.pb_run = qtw.QPushButton("Run Flows", self)
+        self.pb_run.clicked.connect(self.run_clicked)
+        for widget in (self.spin_flows, self.spin_spread, self.spin_seed, self.pb_run):
+            hbox.addWidget(widget)
+        vbox.addLayout(hbox)
+        self.runner = None  # FlowRunner of the run in progress
+        self.run_config = None  # SimConfig of that run
+        qtw.QApplication.instance().aboutToQuit.connect(self.stop)
+
+        self.progress_bar = qtw.QProgressBar(self)
+        self.progress_bar.setFormat("%v of %m flows completed")
+        self.progress_bar.hide()
+        vbox.addWidget(self.progress_bar)
+
+        self.lb_summary = qtw.QLabel("Every flow sends the packets of the current settings over the shared link", self)
+        self.lb_summary.setStyleSheet("QLabel { font-family: monospace; }")
+        self.lb_summary.setTextInteractionFlags(qtc.Qt.TextSelectableByMouse)
+        vbox.addWidget(self.lb_summary)
+
+        self.model = FlowTableModel(self)
+        self.table = qtw.QTableView(self)
+        self.table.setModel(self.model)
+        self.table.setSortingEnabled(True)
+        self.table.sortByColumn(0, qtc.Qt.AscendingOrder)
+        self.table.verticalHeader().hide()
+        self.table.horizontalHeader().setSectionResizeMode(qtw.QHeaderView.Stretch)
+        vbox.addWidget(self.table)
+
+    def run_clicked(self):
+        if self.runner is not None:  # the button reads Stop while flows run
+            self.runner.requestInterruption()
+            self.pb_run.setEnabled(False)
+            return
+        self.run_config = self.config()
+        seed = self.spin_seed.value()
+        if seed < 0:
+            seed = random.randrange(2**31)
+            self.spin_seed.setValue(seed)  # show the seed so the run can be repeated
+        flows = self.spin_flows.value()
+        self.runner = FlowRunner(self.run_config, flows, seed, self.spin_spread.value(), self)
+        self.runner.progress.connect(self.show_progress)  # slots of the dialog, so queued to the GUI thread
+        self.runner.result.connect(self.show_result)
+        self.runner.failed.connect(self.show_error)
+        self.runner.finished.connect(self.run_finished)
+        self.progress_bar.setRange(0, flows)
+        self.progress_bar.setValue(0)
+        self.progress_bar.show()
+        self.pb_run.setText("Stop")
+        for widget in (self.spin_flows, self.spin_spread, self.spin_seed):
+            widget.setEnabled(False)
+        self.runner.start()
+
+    def show_progress(self, completed:int, flows:int):
+        self.progress_bar.setValue(completed)
+
+    def show_error(self, message:str):
+        qtw.QMessageBox.warning(self, "Many Flows", message)
+
+    def show_result(self, result:MultiFlowResult):
+        text = result.summary()
+        if not result.completed:
+            text += "\nstopped before every flow completed"
+        if not self.run_config.bandwidth:
+            text += "\nunlimited link: the flows only share the losses, set a bandwidth to make them compete"
+        self.lb_summary.setText(text)
+        self.model.set_result(result)
+
+    def run_finished(self):
+        self.runner.deleteLater()
+        self.runner = None
+        self.progress_bar.hide()
+        self.pb_run.setText("Run Flows")
+        self.pb_run.setEnabled(True)
+        for widget in (self.spin_flows, self.spin_spread, self.spin_seed):
+            widget.setEnabled(True)
+
+    def stop(self):
+        """Stop a run in progress and wait for its thread, before the dialog or the application goes away"""
+        if self.runner is not None:
+            self.runner.requestInterruption()
+            self.runner.wait()
+
+    def closeEvent(self, event:qtg.QCloseEvent):
+        self.stop()
+        super().closeEvent(event)
+
+    def reject(self):
+        self.stop()
+        super().reject()
@@ -10,11 +10,14 @@ from widget_containers.PlayAndReset import PlayandReset
 from widget_containers.SenderReciever import SenderReciever
 from widget_containers.SenderRecieverPanel import SenderRecieverPanel
 from widget_containers.SettingsWindow import SettingsWindow
+from widget_containers.StatsStrip import StatsStrip
 
 
 class MainWidget(qtw.QWidget):
     """Main application window that orchestrates the Go-Back-N protocol simulation"""
-    
+
+    first_painted = qtc.Signal() # the window was painted for the first time, startup is over
+
     def __init__(self):
         super().__init__()
 
@@ -26,18 +29,15 @@ class MainWidget(qtw.QWidget):
         self.prop_delay = 20        # Propagation delay for animations
         self.window_size = 3        # Sender window size (N in Go-Back-N)
         self.num_packets = 10       # Total number of packets to send
+        self.protocol = "gbn"       # ARQ protocol, a key of simulation.Protocols.PROTOCOLS
+        self.replay_duration = 0.0  # simulated seconds covered by the opened trace
 
         # Create main layout and initialize all widget components
         self.vbox = qtw.QVBoxLayout(self)
         self.settings = SettingsWindow()        # Settings panel for protocol parameters
         self.play_and_reset = PlayandReset()    # Control buttons for simulation
-        self.hosts_panel = SenderRecieverPanel() # Main simulation area
-
-        # add scrollable area for better error handling if it gets too big
-        self.scroll_area = qtw.QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setHorizontalScrollBarPolicy(qtc.Qt.ScrollBarAlwaysOff) 
-        self.scroll_area.setWidget(self.hosts_panel)
+        self.hosts_panel = SenderRecieverPanel() # Main simulation area (scrolls itself, only visible rows are built)
+        self.stats = StatsStrip(self.hosts_panel) # Live counters of the current run
 
         # Connect settings changes to update handlers
         self.settings.changed_re_timer.connect(self.changed_re_timer)
@@ -45,20 +45,59 @@ class MainWidget(qtw.QWidget):
         self.settings.changed_prop.connect(self.changed_prop_delay)
         self.settings.changed_window_size.connect(self.changed_window_size)
         self.settings.changed_num_packets.connect(self.changed_num_packets)
+        self.settings.changed_protocol.connect(self.changed_protocol)
+        self.settings.changed_seq_bits.connect(self.changed_seq_bits)
+        self.settings.changed_link.connect(self.hosts_panel.set_link)
+        self.settings.changed_loss.connect(self.hosts_panel.set_loss)
 
         # Connect control buttons to simulation actions
         self.play_and_reset.play_clicked.connect(self.play_clicked)
         self.play_and_reset.reset_clicked.connect(self.reset_clicked)
+        self.play_and_reset.skip_clicked.connect(self.skip_clicked)
+        self.play_and_reset.speed_changed.connect(self.hosts_panel.set_speed)
+        self.play_and_reset.save_trace_clicked.connect(self.save_trace_clicked)
+        self.play_and_reset.open_trace_clicked.connect(self.open_trace_clicked)
+        self.play_and_reset.flows_clicked.connect(self.flows_clicked)
+        self.play_and_reset.replay_moved.connect(self.replay_moved)
+        self.stats.export_clicked.connect(self.export_metrics_clicked)
 
         # Initialize simulation panel with default values
         self.hosts_panel.changeSliders(self.prop_delay, self.re_timer, self.per_pkt_loss, self.window_size, self.num_packets)
-        self.hosts_panel.draw_window(self.hosts_panel.base)  # Draw initial window visualization
+        self.hosts_panel.schedule_window()  # Draw initial window visualization
 
         # Arrange widgets vertically in the main window
         self.vbox.addWidget(self.settings)
         self.vbox.addWidget(self.play_and_reset)
-        self.vbox.addWidget(self.scroll_area)
+        self.vbox.addWidget(self.stats)
+        self.vbox.addWidget(self.hosts_panel)
+
+        # Frame-time profiler floating over everything, F12 shows and hides it (built on first use)
+        self.profiler = None
+        self.flow_summary = None  # Many Flows window, built on first use
+        qtg.QShortcut(qtg.QKeySequence("F12"), self, self.toggle_profiler)
+        self._painted = False
     
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self._painted:
+            self._painted = True
+            self.first_painted.emit()
+
+    def toggle_profiler(self):
+        """Show or hide the profiler overlay, importing and building it the first time"""
+        if self.profiler is None:
+            from widget_containers.ProfilerOverlay import ProfilerOverlay  # not needed to start up
+            self.profiler = ProfilerOverlay(self.hosts_panel, self)
+        self.profiler.toggle()
+
+    def flows_clicked(self):
+        """Show the Many Flows window, which runs the current settings as competing flows"""
+        if self.flow_summary is None:
+            from widget_containers.FlowSummary import FlowSummary  # not needed to start up
+            self.flow_summary = FlowSummary(self.hosts_panel.config, self)
+        self.flow_summary.show()
+        self.flow_summary.raise_()
+
     # Settings change handlers - update simulation parameters when user modifies settings
     
     def changed_re_timer(self, value:int):
@@ -80,22 +119,75 @@ class MainWidget(qtw.QWidget):
         """Update sender window size (N in Go-Back-N) and redraw window visualization"""
         self.window_size = value
         self.hosts_panel.changeSliders(self.prop_delay, self.re_timer, self.per_pkt_loss, self.window_size, self.num_packets)
-        # Redraw window after brief delay to ensure UI updates are complete
-        qtc.QTimer.singleShot(50, lambda: self.hosts_panel.draw_window(self.hosts_panel.base))
+        self.hosts_panel.schedule_window()  # Redrawn on the next frame, once however fast the spin box moves
         
     def changed_num_packets(self, value:int):
         """Update total number of packets and recreate packet UI elements"""
         self.num_packets = value
         self.hosts_panel.changeSliders(self.prop_delay, self.re_timer, self.per_pkt_loss, self.window_size, self.num_packets)
         self.hosts_panel.setPackets()  # Recreate packet widgets to match new count
-        # Redraw window after brief delay to ensure UI updates are complete
-        qtc.QTimer.singleShot(50, lambda: self.hosts_panel.draw_window(self.hosts_panel.base))
+        self.hosts_panel.schedule_window()  # Redrawn on the next frame, once however fast the spin box moves
         
+    def changed_protocol(self, name:str):
+        """Switch the simulation panel to another ARQ protocol and redraw its window"""
+        self.protocol = name
+        self.hosts_panel.set_protocol(name)
+        self.hosts_panel.schedule_window()
+
+    def changed_seq_bits(self, value:int):
+        """Wrap the panel's sequence numbers at 2^value (0 for unbounded)"""
+        self.hosts_panel.set_seq_bits(value)
+
     def play_clicked(self):
         """Start the Go-Back-N simulation - disable settings and begin packet transmission"""
         self.settings.setEnabled(False)  # Prevent settings changes during simulation
-        self.hosts_panel.send_packets()  # Begin sending packets within the current window
+        seed = self.hosts_panel.start_run(self.play_and_reset.seed())  # Begin sending packets within the current window
+        self.play_and_reset.spin_seed.setValue(seed)  # show the seed so the run can be repeated
         
+    def skip_clicked(self):
+        """Finish the run without animations and jump to its final state"""
+        self.play_and_reset.pb_play.setEnabled(False)  # the run is over, only reset starts a new one
+        self.settings.setEnabled(False)
+        self.hosts_panel.skip_to_end()
+
+    def save_trace_clicked(self):
+        """Save the event trace of the current run"""
+        path, _ = qtw.QFileDialog.getSaveFileName(self, "Save Trace", "run.gbnt", "Go-Back-N traces (*.gbnt)")
+        if path and not self.hosts_panel.save_trace(path):
+            qtw.QMessageBox.information(self, "Save Trace", "Press Play first, there is no run to save yet.")
+
+    def export_metrics_clicked(self):
+        """Save the counters and histograms of the current run as JSON"""
+        path, _ = qtw.QFileDialog.getSaveFileName(self, "Export Metrics", "metrics.json", "JSON (*.json)")
+        if not path:
+            return
+        try:
+            self.hosts_panel.metrics.to_json(path, seed=self.hosts_panel.seed)
+        except OSError as e:
+            qtw.QMessageBox.warning(self, "Export Metrics", f"Could not write {path}: {e}")
+
+    def open_trace_clicked(self):
+        """Open a saved trace and replay it with the position slider"""
+        path, _ = qtw.QFileDialog.getOpenFileName(self, "Open Trace", "", "Go-Back-N traces (*.gbnt)")
+        if not path:
+            return
+        try:
+            reader = self.hosts_panel.load_replay(path)
+        except (OSError, ValueError) as e:
+            qtw.QMessageBox.warning(self, "Open Trace", f"Could not open {path}: {e}")
+            return
+        self.replay_duration = reader.duration()
+        self.settings.setEnabled(False)
+        self.play_and_reset.pb_play.setEnabled(False)  # reset leaves the replay
+        self.play_and_reset.sl_replay.show()
+        self.play_and_reset.sl_replay.setValue(self.play_and_reset.sl_replay.maximum())
+        self.replay_moved(1.0)
+
+    def replay_moved(self, fraction:float):
+        """Show the replayed run at `fraction` of its duration"""
+        if self.hosts_panel.replay_trace is not None:
+            self.hosts_panel.show_replay(fraction * self.replay_duration)
+
     def reset_clicked(self):
         """Reset simulation to initial state - restore default settings and clear progress"""
         self.settings.setEnabled(True)  # Re-enable settings modification
@@ -105,10 +197,19 @@ class MainWidget(qtw.QWidget):
         self.settings.sl_re_timer.setRange(50, 100)
         self.settings.sl_re_timer.setValue(50)
         self.settings.sl_pkt_loss_per.setValue(0)
+        self.settings.cb_protocol.setCurrentIndex(0)
+        self.settings.spin_seq_bits.setValue(0)
+        self.settings.spin_bandwidth.setValue(0)
+        self.settings.spin_packet_size.setValue(1000)
+        self.settings.spin_queue_limit.setValue(0)
+        self.settings.cb_queue_policy.setCurrentIndex(0)
+        self.settings.cb_loss_model.setCurrentIndex(0)
+        self.settings.spin_burst_length.setValue(4)
+        self.settings.spin_ack_loss.setValue(-1)
         
         # Reset simulation state
-        self.hosts_panel.base = 0        # Reset window base position
-        self.hosts_panel.cur_ACK = 1     # Reset expected ACK number
+        self.play_and_reset.sl_replay.hide()
+        self.hosts_panel.reset()  # Reset window base position and expected ACK number
         self.hosts_panel.changeSliders(self.prop_delay, self.re_timer, self.per_pkt_loss, self.window_size, self.num_packets)
         
         # Reset spinbox values with proper sequencing to avoid validation issues
@@ -116,6 +217,6 @@ class MainWidget(qtw.QWidget):
         qtc.QTimer.singleShot(50, lambda: self.settings.spin_K.setValue(0))
         qtc.QTimer.singleShot(100, lambda: self.settings.spin_K.setValue(10))
         qtc.QTimer.singleShot(150, lambda: self.settings.spin_R.setValue(3))
-        qtc.QTimer.singleShot(100, lambda: self.hosts_panel.draw_window(self.hosts_panel.base))
+        self.hosts_panel.schedule_window()  # the K and R changes above schedule it again as they land
         qtc.QTimer.singleShot(100, lambda: self.settings.spin_K.setMinimum(1))  # Restore minimum
         
\ No newline at end of file
@@ -1,41 +1,190 @@
 # Packet class represents individual data packets in the Go-Back-N simulation
-# Packets are animated buttons that move between sender and receiver
+# Packets are lightweight graphics items moved by the shared clock of a PacketView
+
+from functools import lru_cache
 
 from PySide6 import QtCore as qtc
 from PySide6 import QtWidgets as qtw
 from PySide6 import QtGui as qtg
 
-class Packet(qtw.QPushButton):
-    """Animated packet widget that can be sent between sender and receiver in Go-Back-N protocol"""
-    
-    def __init__(self, parent=None):
-        super().__init__(parent)
+FADE_DURATION = 250  # ms it takes a delivered or killed packet to fade away
+_FADE_CURVE = qtc.QEasingCurve(qtc.QEasingCurve.OutQuad)  # nice ease out for the fade
+_TRAVEL_CURVE = qtc.QEasingCurve(qtc.QEasingCurve.InOutCirc)  # nice ease in and out for the trip
+
+_PADDING = 6  # px between the label and the packet border
+_COLOR = qtg.QColor(225, 225, 225)
+_KILLED_COLOR = qtg.QColor("red")
+_BORDER = qtg.QColor(120, 120, 120)
+
+
+@lru_cache(maxsize=4096)
+def _label_pixmap(text:str, killed:bool) -> qtg.QPixmap:
+    """Rendered packet body, shared by every packet (and retransmission) with the same label"""
+    metrics = qtg.QFontMetrics(qtg.QFont())
+    rect = qtc.QRect(0, 0, metrics.horizontalAdvance(text) + 2 * _PADDING, metrics.height() + 2 * _PADDING)
+    pixmap = qtg.QPixmap(rect.size())
+    pixmap.fill(qtc.Qt.transparent)
+    painter = qtg.QPainter(pixmap)
+    painter.setRenderHint(qtg.QPainter.Antialiasing)
+    painter.setPen(_BORDER)
+    painter.setBrush(_KILLED_COLOR if killed else _COLOR)
+    painter.drawRoundedRect(qtc.QRectF(rect).adjusted(.5, .5, -.5, -.5), 4, 4)
+    painter.setPen(qtc.Qt.black)
+    painter.drawText(rect, qtc.Qt.AlignCenter, text)
+    painter.end()
+    return pixmap
+
 
-        # allow this packet to be animated
-        self.anim = qtc.QPropertyAnimation(self, b"pos")
+class Packet(qtw.QGraphicsPixmapItem):
+    """Animated packet travelling between sender and receiver in Go-Back-N protocol
 
+    Packets do not own timers or animations: the PacketView that holds them
+    calls advance_to() on every frame of its single clock, and settle() at the
+    exact simulated time the trip ends. Frames only draw, so arrivals and drops
+    are never late by a frame, whatever the speed. Clicking a packet kills it
+    (simulated loss), killed and delivered packets fade out.
+    Packets are recycled through a PacketPool, launch() starts a new trip.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.text = ""
+        self.start = qtc.QPointF()
+        self.end = qtc.QPointF()
+        self.duration = 1
+        self.started = 0.0
+        self.on_arrival = None
+        self.on_lost = None
+        self.drop_at = None
+        self.trip = 0 # launches so far, tells a stale settle() from the current trip
         self.killed = False # flag to indicate if the packet has been killed
-        self.clicked.connect(self.kill) # connect the kill function to the click event
+        self.user_killed = False # killed by a click rather than by drop_at
+        self.finished = True # travel is over (arrived or killed), only the fade remains
+        self.fade_started = None # clock time the fade out began
+
+    def launch(self, text:str, start:qtc.QPointF, end:qtc.QPointF, duration:float, now:float,
+               on_arrival=None, drop_at:float = None, on_lost=None):
+        """Start a new trip, resetting everything left over from the previous one
+
+        Args:
+            text: label drawn on the packet
+            start, end: travel path in view coordinates (top left corner of the packet)
+            duration: travel time in ms (the propagation delay)
+            now: clock time in ms at which the packet leaves
+            on_arrival: called with the packet if it reaches `end` alive
+            drop_at: fraction of the trip (0-1) at which the packet is lost, None to deliver it
+            on_lost: called with the packet when it is killed (dropped or clicked)
+        """
+        self.text = text
+        self.setPixmap(_label_pixmap(text, False))  # label is rasterised once and shared
+        self.start = qtc.QPointF(start)
+        self.end = qtc.QPointF(end)
+        self.duration = max(duration, 1)
+        self.started = now
+        self.on_arrival = on_arrival
+        self.on_lost = on_lost
+        self.drop_at = drop_at
+        self.trip += 1
+
+        self.killed = False
+        self.user_killed = False
+        self.finished = False
+        self.fade_started = None
+        self.setOpacity(1.0)
+        self.setPos(self.start)
+        self.setVisible(True)
+
+    def advance_to(self, now:float) -> bool:
+        """Move the packet to where it is at clock time `now`, return False once it can be removed"""
+        if not self.finished:
+            stop = 1.0 if self.drop_at is None else self.drop_at
+            self.move_to(min((now - self.started) / self.duration, stop)) # waits there for settle()
+        if self.fade_started is not None:
+            fade = (now - self.fade_started) / FADE_DURATION
+            if fade >= 1.0:
+                return False
+            self.setOpacity(1.0 - _FADE_CURVE.valueForProgress(fade))
+        return True
 
-        # initialize fade out logic for smooth packet removal
-        self.fx_opacity = qtw.QGraphicsOpacityEffect(self)
-        self.fx_opacity.setOpacity(1.0)
-        self.setGraphicsEffect(self.fx_opacity)
+    def move_to(self, progress:float):
+        self.setPos(self.start + (self.end - self.start) * _TRAVEL_CURVE.valueForProgress(progress))
+
+    def settle(self, now:float):
+        """End the trip: drop the packet at drop_at (simulated network loss) or deliver it"""
+        if self.finished:
+            return
+        if self.drop_at is not None:
+            self.move_to(self.drop_at)
+            self.kill(now)
+        else:
+            self.move_to(1.0)
+            self.finished = True
+            if self.on_arrival is not None:
+                self.on_arrival(self)
+            self.fade_out(now)
 
     # fade out once the packet has reached the reciever
-    def fade_out_and_delete(self):
-        fade = qtc.QPropertyAnimation(self.fx_opacity, b"opacity", self) # allow for opacity animation
-        fade.setStartValue(1.0) # start the animation at full opacity
-        fade.setEndValue(0.0) # end with the element dissapearing
-        fade.setDuration(250) # the duration of the animation is 250ms
-        fade.setEasingCurve(qtc.QEasingCurve.OutQuad) # set a nice ease out animation
-        # delete the packet
-        fade.finished.connect(self.deleteLater)
-        fade.start()
-    
-    def kill(self):
-        """Manually kill a packet when clicked by user (simulates packet loss)"""
+    def fade_out(self, now:float):
+        if self.fade_started is None:
+            self.fade_started = now
+
+    def kill(self, now:float, by_user:bool = False):
+        """Kill the packet (simulates packet loss), it turns red and fades away"""
         self.killed = True
-        self.anim.stop()  # Stop any ongoing animation
-        self.setStyleSheet("background-color: red;") # turn the packet red to show it has been killed
-        self.fade_out_and_delete() # fade out and delete the packet
\ No newline at end of file
+        self.user_killed = by_user
+        self.finished = True  # Stop any ongoing travel
+        self.setPixmap(_label_pixmap(self.text, True)) # turn the packet red to show it has been killed
+        self.fade_out(now)
+        if self.on_lost is not None:
+            self.on_lost(self)
+
+
+class PacketPool:
+    """Recycles Packet items so sends and retransmissions do not allocate Qt objects
+
+    Released packets stay in the scene, hidden, until they are launched again.
+    At most `max_free` idle packets are kept, extra ones are removed from the
+    scene so a burst does not pin memory forever.
+    """
+
+    def __init__(self, scene:qtw.QGraphicsScene, max_free:int = 4096):
+        self.scene = scene
+        self.max_free = max_free
+        self.free = [] # idle packets ready to be launched
+        self.size = 0 # packets owned by the pool (idle or in flight)
+        self.hits = 0 # acquires served by an idle packet
+        self.misses = 0 # acquires that had to create a new packet
+
+    def acquire(self, *args, **kwargs) -> Packet:
+        """Launch an idle packet (or a new one), see Packet.launch for the arguments"""
+        if self.free:
+            pkt = self.free.pop()
+            self.hits += 1
+        else:
+            pkt = Packet()
+            self.scene.addItem(pkt)
+            self.size += 1
+            self.misses += 1
+        pkt.launch(*args, **kwargs)
+        return pkt
+
+    def release(self, pkt:Packet):
+        """Hide a packet that finished its trip and keep it for the next acquire"""
+        pkt.on_arrival = None # drop the reference to the pair that sent it
+        pkt.on_lost = None
+        pkt.finished = True
+        if len(self.free) < self.max_free:
+            pkt.setVisible(False)
+            self.free.append(pkt)
+        else:
+            self.scene.removeItem(pkt)
+            self.size -= 1
+
+    @property
+    def in_use(self) -> int:
+        return self.size - len(self.free)
+
+    def stats(self) -> dict:
+        """Pool counters: owned packets, idle packets, hits and misses"""
+        return {"size": self.size, "free": len(self.free), "in_use": self.in_use,
+                "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,126 @@
+# PacketView draws every packet in flight on a QGraphicsScene laid over the sender-receiver panel
+# One shared frame timer moves all packets, instead of one widget and animation per packet
+
+from PySide6 import QtCore as qtc
+from PySide6 import QtWidgets as qtw
+from PySide6 import QtGui as qtg
+
+from widget_containers.Packet import Packet, PacketPool
+from widget_containers.Profiler import profiled
+from widget_containers.SimClock import SimClock
+
+FRAME_MS = 16  # interval of the shared animation clock (~60 frames per second)
+
+
+class PacketView(qtw.QGraphicsView):
+    """Transparent overlay that animates data packets and ACKs above the sender-receiver pairs
+
+    Scene coordinates are the content coordinates of the parent panel, the
+    view shows the slice starting at the panel's scroll offset. The view lets mouse events through to the
+    buttons below; clicks that land on a packet are caught with an event
+    filter and kill the packet instead.
+
+    Packets move on a SimClock, so durations are simulated ms and follow its
+    speed multiplier. The end of every trip is a callback on that clock, so
+    it happens at its simulated time even when frames are far apart.
+    """
+
+    def __init__(self, parent:qtw.QWidget, clock:SimClock = None):
+        super().__init__(parent)
+
+        # transparent, frameless, non-scrolling view in panel coordinates
+        self.setScene(qtw.QGraphicsScene(self))
+        self.scene().setItemIndexMethod(qtw.QGraphicsScene.NoIndex)  # every item moves each frame, an index only costs
+        self.setStyleSheet("background: transparent; border: none;")
+        self.setFrameShape(qtw.QFrame.NoFrame)
+        self.setHorizontalScrollBarPolicy(qtc.Qt.ScrollBarAlwaysOff)
+        self.setVerticalScrollBarPolicy(qtc.Qt.ScrollBarAlwaysOff)
+        self.setAlignment(qtc.Qt.AlignLeft | qtc.Qt.AlignTop)
+        self.setViewportUpdateMode(qtw.QGraphicsView.BoundingRectViewportUpdate)  # one repaint region per frame
+        self.setAttribute(qtc.Qt.WA_TransparentForMouseEvents, True)  # Allow clicks through
+
+        self.pool = PacketPool(self.scene()) # recycled packet items
+        self.packets = [] # packets currently travelling or fading out
+        self.clock = clock or SimClock(self) # shared animation clock
+        self.frame_timer = qtc.QTimer(self) # single timer driving every packet
+        self.frame_timer.setInterval(FRAME_MS)
+        self.frame_timer.timeout.connect(self.advance)
+        self._filtering = False # click filter is only installed while packets are on screen
+
+    def now(self) -> float:
+        """Current time of the animation clock in simulated ms"""
+        return self.clock.now()
+
+    def fit(self, rect:qtc.QRect, offset:int = 0):
+        """Cover `rect` of the parent panel, showing content scrolled down by `offset` px"""
+        self.setGeometry(rect)
+        self.setSceneRect(0, offset, rect.width(), rect.height())
+
+    def spawn(self, text:str, start:qtc.QPoint, end:qtc.QPoint, duration:float,
+              on_arrival=None, drop_at:float = None, on_lost=None, elapsed:float = 0) -> Packet:
+        """Launch a packet from start to end over `duration` ms (see Packet for the arguments)
+
+        A packet with `elapsed` ms already travelled starts partway along its path
+        """
+        pkt = self.pool.acquire(text, start, end, duration, self.now() - elapsed, on_arrival, drop_at, on_lost)
+        self.packets.append(pkt)
+        trip = pkt.trip
+        remaining = pkt.duration * (1.0 if drop_at is None else drop_at) - elapsed
+        self.clock.call_later(max(remaining, 0), lambda: self._settle(pkt, trip))
+        if not self.frame_timer.isActive():
+            self.frame_timer.start()
+            self._set_click_filter(True)
+        return pkt
+
+    @profiled("frame")
+    def advance(self):
+        """Shared clock tick - move every packet and drop the ones that finished fading"""
+        now = self.now()
+        current, self.packets = self.packets, [] # arrival handlers may spawn new packets
+        alive = []
+        for pkt in current:
+            if pkt.advance_to(now):
+                alive.append(pkt)
+            else:
+                self.pool.release(pkt)
+        self.packets = alive + self.packets
+        if not self.packets:
+            self.frame_timer.stop()
+            self._set_click_filter(False)
+
+    @profiled("paint")
+    def paintEvent(self, event):
+        super().paintEvent(event)
+
+    def _settle(self, pkt:Packet, trip:int):
+        if pkt.trip == trip: # not recycled for another trip since
+            pkt.settle(self.now())
+
+    def clear(self):
+        """Remove every packet without delivering it"""
+        for pkt in self.packets:
+            self.pool.release(pkt)
+        self.packets = []
+        self.frame_timer.stop()
+        self._set_click_filter(False)
+
+    def _set_click_filter(self, enabled:bool):
+        app = qtw.QApplication.instance()
+        if enabled != self._filtering and app is not None:
+            if enabled:
+                app.installEventFilter(self)
+            else:
+                app.removeEventFilter(self)
+            self._filtering = enabled
+
+    def eventFilter(self, obj, event) -> bool:
+        """Kill a packet when the user clicks on it (simulates packet loss)"""
+        if event.type() == qtc.QEvent.MouseButtonPress and isinstance(obj, qtw.QWidget):
+            panel = self.parentWidget()
+            if obj is panel or panel.isAncestorOf(obj):
+                pos = self.viewport().mapFromGlobal(event.globalPosition().toPoint())
+                pkt = self.itemAt(pos)
+                if isinstance(pkt, Packet) and not pkt.finished:
+                    pkt.kill(self.now(), by_user=True)
+                    return True
+        return False
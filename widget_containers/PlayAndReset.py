@@ -6,6 +6,7 @@ from PySide6 import QtWidgets as qtw
 from PySide6 import QtGui as qtg
 
 from ui.play_and_reset_ui import Ui_w_play_and_reset
+from widget_containers.SimClock import INSTANT, SPEEDS
 
 class PlayandReset(qtw.QWidget, Ui_w_play_and_reset):
     """Control panel widget for starting/stopping and resetting the Go-Back-N simulation"""
@@ -13,6 +14,12 @@ class PlayandReset(qtw.QWidget, Ui_w_play_and_reset):
     # Signals emitted when user interacts with control buttons
     play_clicked = qtc.Signal()
     reset_clicked = qtc.Signal()
+    skip_clicked = qtc.Signal()
+    speed_changed = qtc.Signal(float)
+    save_trace_clicked = qtc.Signal()
+    open_trace_clicked = qtc.Signal()
+    flows_clicked = qtc.Signal()
+    replay_moved = qtc.Signal(float) # replay position as a fraction of the trace (0-1)
 
     def __init__(self):
         super().__init__()
@@ -22,6 +29,23 @@ class PlayandReset(qtw.QWidget, Ui_w_play_and_reset):
         # Connect button clicks to internal handlers that emit signals
         self.pb_play.clicked.connect(self.on_play_clicked)
         self.pb_reset.clicked.connect(self.on_reset_clicked)
+        self.pb_skip.clicked.connect(self.skip_clicked)
+        self.pb_save_trace.clicked.connect(self.save_trace_clicked)
+        self.pb_open_trace.clicked.connect(self.open_trace_clicked)
+        self.pb_flows.clicked.connect(self.flows_clicked)
+        self.sl_replay.valueChanged.connect(lambda value: self.replay_moved.emit(value / self.sl_replay.maximum()))
+        self.sl_replay.hide() # only shown while a trace is replayed
+
+        # Speed multiplier of the simulation clock
+        for speed in SPEEDS:
+            self.cb_speed.addItem("Instant" if speed == INSTANT else f"{speed:g}x", speed)
+        self.cb_speed.setCurrentIndex(SPEEDS.index(1.0))
+        self.cb_speed.currentIndexChanged.connect(lambda i: self.speed_changed.emit(self.cb_speed.itemData(i)))
+
+    def seed(self):
+        """Seed chosen for the next run, None for a random one"""
+        value = self.spin_seed.value()
+        return None if value == self.spin_seed.minimum() else value
 
     def on_play_clicked(self):
         """Handle play button click - starts the simulation and disables play button"""
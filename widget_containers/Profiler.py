@@ -0,0 +1,81 @@
+# Profiler times the GUI hot paths (frames, paints, protocol slots) and event-loop lag while it is enabled
+# Samples go to a bounded ring buffer, so the last seconds can be summarised live or dumped to a file
+
+import functools
+import json
+import time
+from collections import deque
+
+
+class Profiler:
+    """Ring buffer of timed samples, fed by the `profiled` decorator
+
+    A sample is (wall time in s at its end, name, duration in ms). While disabled a
+    profiled call costs one attribute check, so the decorators can stay on
+    the hot paths permanently.
+
+    Args:
+        max_samples: samples kept, the oldest are dropped first
+    """
+
+    def __init__(self, max_samples:int = 200000):
+        self.enabled = False
+        self.samples = deque(maxlen=max_samples)
+
+    def add(self, name:str, duration_ms:float):
+        """Record a sample that ends now"""
+        self.samples.append((time.perf_counter(), name, duration_ms))
+
+    def clear(self):
+        self.samples.clear()
+
+    def recent(self, seconds:float) -> list:
+        """Samples of the last `seconds`, oldest first"""
+        since = time.perf_counter() - seconds
+        out = []
+        for sample in reversed(self.samples):
+            if sample[0] < since:
+                break
+            out.append(sample)
+        out.reverse()
+        return out
+
+    def summary(self, seconds:float) -> dict:
+        """name -> count, total, mean, p95 and max (ms) over the last `seconds`"""
+        durations = {}
+        for _, name, duration in self.recent(seconds):
+            durations.setdefault(name, []).append(duration)
+        stats = {}
+        for name, values in durations.items():
+            values.sort()
+            stats[name] = {"count": len(values), "total_ms": sum(values), "mean_ms": sum(values) / len(values),
+                           "p95_ms": values[min(len(values) - 1, int(len(values) * .95))], "max_ms": values[-1]}
+        return stats
+
+    def dump(self, path:str, seconds:float, **extra):
+        """Write the summary and every sample of the last `seconds` to a JSON file"""
+        samples = self.recent(seconds)
+        start = samples[0][0] if samples else 0.0
+        with open(path, "w") as f:
+            json.dump({**extra, "seconds": seconds, "summary": self.summary(seconds),
+                       "samples": [{"t": round(t - start, 6), "name": name, "ms": round(ms, 4)}
+                                   for t, name, ms in samples]}, f, indent=1)
+
+
+PROFILER = Profiler() # shared by every profiled function of the GUI
+
+
+def profiled(name:str):
+    """Decorator recording the duration of each call in PROFILER under `name` while it is enabled"""
+    def wrap(function):
+        @functools.wraps(function)
+        def timed(*args, **kwargs):
+            if not PROFILER.enabled:
+                return function(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                PROFILER.add(name, (time.perf_counter() - start) * 1000)
+        return timed
+    return wrap
@@ -0,0 +1,119 @@
+# ProfilerOverlay floats over the main window and shows where GUI time goes while packets are in flight
+# Toggled with F12, it enables the shared Profiler only while it is visible
+
+import time
+
+from PySide6 import QtCore as qtc
+from PySide6 import QtWidgets as qtw
+from PySide6 import QtGui as qtg
+
+from widget_containers.Profiler import PROFILER
+
+REFRESH_MS = 500  # wall ms between overlay updates
+PROBE_MS = 20  # interval of the timer whose lateness measures event-loop lag
+WINDOW_S = 2.0  # seconds summarised on screen
+SLOTS = ("send_packet", "on_packet_arrived", "on_ACK_arrived", "on_timeout", "refresh_row", "draw_window", "update_rows")
+
+
+class ProfilerOverlay(qtw.QFrame):
+    """Translucent panel with frame time, paint time, work queued on the GUI and per-slot cost
+
+    Args:
+        panel: the SenderRecieverPanel whose packets and clock are inspected
+        parent: widget the overlay floats over, it sits in its top right corner
+    """
+
+    def __init__(self, panel:qtw.QWidget, parent:qtw.QWidget):
+        super().__init__(parent)
+        self.panel = panel
+        self.setAutoFillBackground(True)
+        self.setStyleSheet("ProfilerOverlay { background-color: rgba(20, 20, 20, 210); border-radius: 6px; }"
+                           "QLabel { color: #e0e0e0; font-family: monospace; }")
+
+        vbox = qtw.QVBoxLayout(self)
+        self.lb_stats = qtw.QLabel(self)
+        vbox.addWidget(self.lb_stats)
+        hbox = qtw.QHBoxLayout()
+        self.spin_seconds = qtw.QSpinBox(self)
+        self.spin_seconds.setRange(1, 600)
+        self.spin_seconds.setValue(30)
+        self.spin_seconds.setSuffix(" s")
+        self.pb_dump = qtw.QPushButton("Dump Profile", self)
+        self.pb_dump.clicked.connect(self.dump_clicked)
+        hbox.addWidget(self.spin_seconds)
+        hbox.addWidget(self.pb_dump)
+        vbox.addLayout(hbox)
+
+        self.refresh_timer = qtc.QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.probe = qtc.QTimer(self) # should fire every PROBE_MS, any extra delay is event-loop lag
+        self.probe.timeout.connect(self.on_probe)
+        self._last_probe = None
+        self.hide()
+
+    def toggle(self):
+        self.setVisible(not self.isVisible())
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        PROFILER.clear()
+        PROFILER.enabled = True
+        self._last_probe = None
+        self.probe.start(PROBE_MS)
+        self.refresh_timer.start(REFRESH_MS)
+        self.refresh()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        PROFILER.enabled = False
+        self.probe.stop()
+        self.refresh_timer.stop()
+
+    def on_probe(self):
+        now = time.perf_counter()
+        if self._last_probe is not None:
+            PROFILER.add("event_loop_lag", max(0.0, (now - self._last_probe) * 1000 - PROBE_MS))
+        self._last_probe = now
+
+    def place(self):
+        """Keep the overlay in the top right corner of its parent"""
+        self.adjustSize()
+        parent = self.parentWidget()
+        self.move(parent.width() - self.width() - 10, 10)
+        self.raise_()
+
+    def refresh(self):
+        stats = PROFILER.summary(WINDOW_S)
+        frames = [t for t, name, _ in PROFILER.recent(WINDOW_S) if name == "frame"]
+        intervals = [(b - a) * 1000 for a, b in zip(frames, frames[1:])]
+        timers = sum(1 for timer in self.window().findChildren(qtc.QTimer) if timer.isActive())
+
+        def line(label:str, name:str) -> str:
+            s = stats.get(name)
+            if not s:
+                return f"{label:18}      -"
+            return f"{label:18} {s['mean_ms']:7.3f} ms  p95 {s['p95_ms']:7.3f}  max {s['max_ms']:7.2f}  n {s['count']}"
+
+        lines = [
+            f"frame interval     {sum(intervals) / len(intervals):7.2f} ms  max {max(intervals):7.2f}" if intervals
+            else "frame interval          -",
+            line("frame (move)", "frame"),
+            line("paint", "paint"),
+            line("event-loop lag", "event_loop_lag"),
+            f"packets in flight  {len(self.panel.packets.packets):7}",
+            f"clock callbacks    {len(self.panel.clock.timers):7}",
+            f"active QTimers     {timers:7}",
+            "",
+        ] + [line(name, name) for name in SLOTS]
+        self.lb_stats.setText("\n".join(lines))
+        self.place()
+
+    def dump_clicked(self):
+        seconds = self.spin_seconds.value()
+        path, _ = qtw.QFileDialog.getSaveFileName(self, "Dump Profile", "profile.json", "JSON (*.json)")
+        if not path:
+            return
+        try:
+            PROFILER.dump(path, seconds, packets_in_flight=len(self.panel.packets.packets))
+        except OSError as e:
+            qtw.QMessageBox.warning(self, "Dump Profile", f"Could not write {path}: {e}")
@@ -1,221 +1,761 @@
-# SenderRecieverPanel manages the main Go-Back-N simulation display
+# SenderRecieverPanel manages the main ARQ simulation display (Go-Back-N by default)
 # Coordinates multiple sender-receiver pairs and implements protocol logic
 
+import random
+import shutil
+import tempfile
+from dataclasses import asdict
+
 from PySide6 import QtCore as qtc
 from PySide6 import QtWidgets as qtw
 from PySide6 import QtGui as qtg
 
-from widget_containers.SenderReciever import SenderReciever
-from widget_containers.Packet import Packet
+from widget_containers.SenderReciever import SenderReciever, PairStates, SenderState, RecieverState
+from widget_containers.PacketView import PacketView, FRAME_MS
+from widget_containers.Profiler import profiled
+from widget_containers.SimClock import SimClock
+from simulation.GoBackNProtocol import GoBackNProtocol
+from simulation.Link import Link
+from simulation.LossModel import loss_streams
+from simulation.Protocols import make_protocol
+from simulation.SimConfig import SimConfig
+from simulation.Simulator import (Simulator, SimResult, SEND, PKT_ARRIVE, PKT_DROP, ACK_ARRIVE, ACK_DROP,
+                                  TIMEOUT, WINDOW_SLIDE, USER_KILL, DROP_RANDOM, DROP_MANUAL, DROP_QUEUE)
+from simulation.Trace import TraceReader, TraceWriter, replay
+from simulation.Metrics import Metrics
+
+OVERSCAN = 2  # rows kept bound above and below the visible area for smooth scrolling
+RETRANSMIT = "retransmit"  # SimClock key of the window's retransmission timer, (RETRANSMIT, seq) for per-packet timers
 
 class SenderRecieverPanel(qtw.QWidget):
     """Main simulation panel managing multiple sender-receiver pairs for Go-Back-N protocol
-    
+
     This class orchestrates the entire Go-Back-N simulation, managing:
     - Sliding window visualization
     - Packet transmission coordination
     - ACK processing and window advancement
-    - Protocol state management
+
+    Protocol state lives in a GoBackNProtocol (or another protocol of
+    simulation.Protocols, see set_protocol()), the same state machine the
+    headless simulator drives, this panel only animates its decisions.
+
+    The panel scrolls itself and is virtualized: every packet has its state in
+    a PairStates store, but row widgets only exist for the rows near the visible area and are
+    recycled while scrolling. Positions are computed from the fixed row pitch
+    in content coordinates (the panel coordinates plus the scroll offset).
+
+    Every delay (animations, send staggering, the retransmission timer) runs
+    on a SimClock in simulated ms, so the speed multiplier scales them all.
+    With a bandwidth set, a simulation.Link replaces the send staggering:
+    packets wait for the link, then travel for the transmission plus the
+    propagation delay.
+
+    Each run draws its losses from a seeded generator and records every event
+    to a binary trace (a temporary file until it is saved). A saved trace can
+    be opened again and replayed at any time without simulating. The same
+    events feed a Metrics instance that the stats strip shows live.
     """
-    
+
+    run_finished = qtc.Signal() # every packet of the run is acknowledged
+
     def __init__(self, num_packets=10):
         super().__init__()
+        self.setSizePolicy(qtw.QSizePolicy.Expanding, qtw.QSizePolicy.Expanding)
+
+        # Row geometry, every sender-receiver pair has the same height
+        self.metrics = Metrics(0) # counters of the current run, replaced by start_run()
+        self.spare_rows = [self.new_row()] # unbound row widgets ready to be recycled
+        self.spare_rows[0].hide()
+        self.row_height = self.spare_rows[0].sizeHint().height()
+        self.row_margin = self.style().pixelMetric(qtw.QStyle.PM_LayoutTopMargin)
+        self.row_pitch = self.row_height + self.style().pixelMetric(qtw.QStyle.PM_LayoutVerticalSpacing)
+        self.rows = {} # packet index -> row widget currently showing it
+        self.states = PairStates() # state of every pair, indexed by packet
 
-        # Create layout for sender-receiver pairs
-        self.vbox = qtw.QVBoxLayout(self)
-        self.items = [] # list that will hold all the SenderReciever objects
-        
-        # Go-Back-N protocol state variables
-        self.cur_ACK = 1 # index of the current ACK that is being sent
-        self.base = 0 # base of the window (leftmost unacknowledged packet)
+        # Scroll bar for the virtual content
+        self.scrollbar = qtw.QScrollBar(qtc.Qt.Vertical, self)
+        self.scrollbar.valueChanged.connect(self.on_scrolled)
+
+        # Go-Back-N protocol state
         self.num_packets = num_packets  # Total packets to transmit
         self.windowSize = 10  # Sender window size (N in Go-Back-N)
-        
-        # Initialize packet UI elements
-        self.setPackets()
-        
+        self.protocol_name = "gbn"  # key of simulation.Protocols.PROTOCOLS
+        self.seq_bits = 0           # bits of the sequence number field, 0 for unbounded numbers
+        self.protocol = GoBackNProtocol(self.num_packets, self.windowSize)
+
+        # Simulated time base, holds the retransmission timer and every delayed protocol step
+        self.clock = SimClock(self)
+        self.next_departure = 0.0  # clock time (ms) the next queued packet may leave, see send_later()
+        self.speed = 1.0  # speed multiplier chosen by the user
+
+        # Reproducibility: seeded loss draws and the event trace of the current run
+        self.seed = None  # seed of the current run
+        self.rng = random.Random()  # loss draws of the current run
+        self.trace = None  # TraceWriter recording the current run
+        self.run_start = 0.0  # clock time (ms) the current run started, traces count from there
+        self.replay_trace = None  # TraceReader shown instead of a live run
+
+        # Overlay that animates every packet in flight
+        self.packets = PacketView(self, self.clock)
+
         # Simulation parameters (updated from settings)
         self.prop_delay = 0    # Propagation delay
         self.re_timer = 0      # Retransmission timer
         self.per_pkt_loss = 0  # Packet loss percentage
 
+        # Bottleneck link (set_link), a Link is built from them for every run
+        self.bandwidth = 0.0        # bytes per second, 0 for an unlimited link
+        self.packet_size = 1000     # bytes per data packet
+        self.queue_limit = 0        # packets waiting for the link, 0 for unbounded
+        self.queue_policy = "tail"  # "tail" drop or "red"
+        self.link = None            # Link of the current run, None on an unlimited link
+
+        # Loss models (set_loss), "" draws independent losses from self.rng at per_pkt_loss
+        self.data_loss = ""         # simulation.LossModel spec of data packets
+        self.ack_loss = ""          # spec of ACKs, "" for the same model as data packets
+        self.data_losses = None     # LossStream of the current run, None when drawn from self.rng
+        self.ack_losses = None
+
         # Create sliding window visualization overlay
         self.window = qtw.QWidget(self)
         self.window.setStyleSheet("border:4px solid yellow; background:transparent;")
         self.window.setAttribute(qtc.Qt.WA_TransparentForMouseEvents,True)  # Allow clicks through
         self.window.hide()  # Initially hidden
-        # Draw initial window after brief delay to ensure UI is ready
-        qtc.QTimer.singleShot(50, lambda: self.draw_window(self.base))
+        self.window_dirty = False  # the overlay no longer matches the window, a redraw is scheduled
+        self.window_timer = qtc.QTimer(self)  # coalesces redraw requests into at most one per frame
+        self.window_timer.setSingleShot(True)
+        self.window_timer.setInterval(FRAME_MS)
+        self.window_timer.timeout.connect(self.redraw_window)
+
+        # Initialize packet UI elements
+        self.setPackets()
+        self.schedule_window()  # first drawn once the panel has its size
+
+    @property
+    def base(self) -> int:
+        """Base of the window (leftmost unacknowledged packet)"""
+        return self.protocol.base
 
     def changeSliders(self, prop_delay:int, re_timer:int, per_pkt_loss:int, windowSize:int, num_packets:int):
         """Update simulation parameters from settings panel
-        
+
         Called whenever user modifies settings to keep simulation in sync
         """
+        # K and N only change before a run starts, so restart the protocol with them
+        resized = (num_packets, windowSize) != (self.num_packets, self.windowSize)
         self.prop_delay = prop_delay      # Animation speed
         self.re_timer = re_timer          # Timeout period
         self.per_pkt_loss = per_pkt_loss  # Loss probability
         self.windowSize = windowSize      # Go-Back-N window size
         self.num_packets = num_packets    # Total packet count
+        if resized or num_packets != self.protocol.num_packets:
+            self.protocol.resize(num_packets, windowSize)
+
+    def set_protocol(self, name:str):
+        """Switch to another protocol of simulation.Protocols, only before a run starts"""
+        self.protocol_name = name
+        self.protocol = make_protocol(name, self.num_packets, self.windowSize, self.seq_bits)
+
+    def set_seq_bits(self, seq_bits:int):
+        """Wrap sequence numbers at 2**seq_bits (0 for unbounded), only before a run starts
+
+        The window must already fit, see simulation.Protocols.max_window_size()
+        """
+        self.seq_bits = seq_bits
+        self.protocol.resize(self.num_packets, self.windowSize, seq_bits)
+        for index, row in self.rows.items():
+            row.bind(index + 1, self.states, self.wire_number(index))
+
+    def wire_number(self, index:int):
+        """Sequence number packet `index` carries, None while numbers are unbounded"""
+        return self.protocol.wire(index) if self.seq_bits else None
+
+    def set_link(self, bandwidth:float, packet_size:int, queue_limit:int, queue_policy:str):
+        """Change the bottleneck link, used from the next run on
+
+        Args:
+            bandwidth: bytes per second, 0 for an unlimited link
+            packet_size: bytes per data packet
+            queue_limit: packets that may wait for the link, 0 for unbounded
+            queue_policy: "tail" drop or "red"
+        """
+        self.bandwidth = bandwidth
+        self.packet_size = packet_size
+        self.queue_limit = queue_limit
+        self.queue_policy = queue_policy
+
+    def set_loss(self, data_loss:str, ack_loss:str):
+        """Change the loss models of data packets and ACKs (simulation.LossModel specs), used from the next run on"""
+        self.data_loss = data_loss
+        self.ack_loss = ack_loss
+
+    @property
+    def window_size(self) -> int:
+        """Window the protocol actually uses (Stop-and-Wait ignores the R setting)"""
+        return self.protocol.window_size
+
+    def config(self) -> SimConfig:
+        """The current settings in seconds"""
+        return SimConfig.from_sliders(self.prop_delay, self.re_timer, self.per_pkt_loss,
+                                      self.windowSize, self.num_packets, protocol=self.protocol_name,
+                                      bandwidth=self.bandwidth, packet_size=self.packet_size,
+                                      queue_limit=self.queue_limit, queue_policy=self.queue_policy,
+                                      data_loss=self.data_loss, ack_loss=self.ack_loss, seq_bits=self.seq_bits)
+
+    def reset(self):
+        """Return the protocol to its initial state and forget everything in flight"""
+        self.protocol.reset()
+        self.clear_active_packets()
+        self.close_trace()
+        self.metrics = Metrics(0)
+        self.link = None
+        self.data_losses = self.ack_losses = None
+        if self.replay_trace is not None:
+            self.replay_trace = None
+            self.clock.set_speed(self.speed)  # unfreeze the clock
 
     def setPackets(self):
         """Dynamically adjust the number of sender-receiver pairs based on packet count
-        
-        Creates or removes UI elements to match the desired number of packets
+
+        Creates or removes pair states to match the desired number of packets
         Each pair represents one packet in the Go-Back-N sequence
         """
 
-        # Clear any active packets before removing items to prevent orphaned animations
+        # Clear any active packets before removing pairs to prevent orphaned animations
         self.clear_active_packets()
-        
-        # Remove excess sender-receiver pairs if packet count decreased
-        while len(self.items) > self.num_packets:
-            item = self.items.pop() # remove last element in the list of items
-            # Mark as deleted and clean up UI element
-            item._is_deleted = True
-            item.setParent(None)
-            item.deleteLater()
-
-        # Add new sender-receiver pairs if packet count increased
-        while len(self.items) < self.num_packets:
-            item = SenderReciever() # create a new item
-            item.pb_sender.setText("Packet #"+str(len(self.items)+1))
-            
-            # Assign sequence numbers for Go-Back-N protocol
-            item.sender_num = len(self.items)+1
-            item.reciever_num = len(self.items)+1
-            
-            # Connect packet/ACK arrival signals to protocol handlers
-            item.pkt_arr.connect(self.on_packet_arrived)
-            item.ACK_arr.connect(self.on_ACK_arrived)
-            
-            # Add to UI and internal list
-            self.items.append(item)
-            self.vbox.addWidget(item)
 
+        # Remove excess pairs if packet count decreased, add new ones if it increased
+        self.states.resize(self.num_packets)
+
+        self.update_scroll_range()
+        self.update_rows()
+
+    # Virtual layout - rows are placed by index, only the visible ones have widgets
+
+    def row_top(self, index:int) -> int:
+        """Top of row `index` in content coordinates"""
+        return self.row_margin + index * self.row_pitch
+
+    def content_height(self) -> int:
+        return 2 * self.row_margin + max(0, len(self.states) * self.row_pitch - (self.row_pitch - self.row_height))
+
+    def row_width(self) -> int:
+        return self.width() - (self.scrollbar.width() if self.scrollbar.isVisible() else 0)
+
+    def update_scroll_range(self):
+        """Fit the scroll bar to the number of rows and the panel height"""
+        overflow = max(0, self.content_height() - self.height())
+        self.scrollbar.setRange(0, overflow)
+        self.scrollbar.setPageStep(self.height())
+        self.scrollbar.setSingleStep(self.row_pitch)
+        self.scrollbar.setVisible(overflow > 0)
+        self.scrollbar.setGeometry(self.width() - self.scrollbar.sizeHint().width(), 0,
+                                   self.scrollbar.sizeHint().width(), self.height())
+
+    @profiled("update_rows")
+    def update_rows(self):
+        """Bind row widgets to the rows near the visible area, recycling the others"""
+        offset = self.scrollbar.value()
+        first = max(0, (offset - self.row_margin) // self.row_pitch - OVERSCAN)
+        last = min(len(self.states) - 1, (offset + self.height() - self.row_margin) // self.row_pitch + OVERSCAN)
+
+        # Recycle rows that scrolled out of range
+        for index in [i for i in self.rows if i < first or i > last]:
+            row = self.rows.pop(index)
+            row.hide()
+            row.states = None
+            self.spare_rows.append(row)
+
+        created = False
+        width = self.row_width()
+        for index in range(first, last + 1):
+            row = self.rows.get(index)
+            if row is None:
+                if self.spare_rows:
+                    row = self.spare_rows.pop()
+                else:
+                    row = self.new_row()
+                    created = True
+                row.bind(index + 1, self.states, self.wire_number(index))
+                self.rows[index] = row
+            row.setGeometry(0, self.row_top(index) - offset, width, self.row_height)
+            row.show()
+
+        if created:
+            # new widgets stack above older siblings, keep the overlays on top
+            self.window.raise_()
+            self.packets.raise_()
+            self.scrollbar.raise_()
+
+    def new_row(self) -> SenderReciever:
+        row = SenderReciever(self)
+        row.loss_toggled.connect(self.on_loss_toggled)
+        return row
+
+    def on_loss_toggled(self, is_ack:bool):
+        self.metrics.loss_presets += 1
+
+    def pair_points(self, index:int) -> tuple[qtc.QPoint, qtc.QPoint]:
+        """Centers of the sender and receiver buttons of row `index` in content coordinates"""
+        row = next(iter(self.rows.values()), None)
+        if row is not None:
+            sender = row.pb_sender.geometry().center()
+            reciever = row.pb_reciever.geometry().center()
+        else:
+            sender = qtc.QPoint(0, self.row_height//2)
+            reciever = qtc.QPoint(self.row_width(), self.row_height//2)
+        top = self.row_top(index)
+        return qtc.QPoint(sender.x(), top + sender.y()), qtc.QPoint(reciever.x(), top + reciever.y())
+
+    @profiled("refresh_row")
+    def refresh_row(self, index:int):
+        """Repaint row `index` if it currently has a widget"""
+        row = self.rows.get(index)
+        if row is not None:
+            row.refresh()
+
+    def refresh_rows(self, indexes):
+        """refresh_row() for every index of `indexes` (a range or a list), looping over whichever is shorter"""
+        if len(indexes) > len(self.rows):
+            for index in [i for i in self.rows if i in indexes]:
+                self.refresh_row(index)
+        else:
+            for index in indexes:
+                self.refresh_row(index)
+
+    def on_scrolled(self, offset:int):
+        """Rebind rows and move the overlays with the content"""
+        self.update_rows()
+        self.packets.fit(self.rect(), offset)
+        self.draw_window(self.base)
+
+    def wheelEvent(self, event):
+        """Scroll the rows with the mouse wheel"""
+        qtw.QApplication.sendEvent(self.scrollbar, event)
+
+    def schedule_window(self):
+        """Mark the window overlay out of date, it is redrawn once on the next frame however often this is called"""
+        self.window_dirty = True
+        if not self.window_timer.isActive():
+            self.window_timer.start()
+
+    def redraw_window(self):
+        if self.window_dirty:
+            self.draw_window(self.base)
+
+    @profiled("draw_window")
     def draw_window(self, base:int):
         """Draw visual representation of Go-Back-N sliding window
-        
+
         The yellow border shows which packets are currently in the sender's window
-        and can be transmitted without waiting for ACKs
-        
+        and can be transmitted without waiting for ACKs. Most callers should use
+        schedule_window() instead, which coalesces a burst of changes.
+
         Args:
             base: Starting position of the sliding window (leftmost unACKed packet)
         """
+        self.window_dirty = False
         # Hide window if no packets or invalid window size
-        if not self.items or self.windowSize <= 0:
+        if not self.states or self.window_size <= 0:
             self.window.hide()
             return
-        
-        # Calculate window boundaries (ensure within valid range)
-        start = max(0, min(base, self.num_packets - self.windowSize)) # get the start of the window
-        end = min(start + self.windowSize - 1, len(self.items) - 1) # get the end of the window
 
-        # Get UI elements at window boundaries
-        first = self.items[start] # get the first item in the window
-        last = self.items[end] # get the last item in the window
+        # Calculate window boundaries (ensure within valid range)
+        start = max(0, min(base, self.num_packets - self.window_size)) # get the start of the window
+        end = min(start + self.window_size - 1, len(self.states) - 1) # get the end of the window
 
-        # Calculate window overlay position
-        top_left = first.mapTo(self, qtc.QPoint(0, 0)) # get the top left corner of the first item
-        bottom_right = last.mapTo(self, qtc.QPoint(last.width(), last.height())) # get the bottom right corner of the last item
+        # Calculate window overlay position from the row layout (rows outside the view have no widget)
+        top = self.row_top(start) - self.scrollbar.value() # top of the first row in the window
+        bottom = self.row_top(end) + self.row_height - self.scrollbar.value() # bottom of the last row in the window
 
         # Position and display the window overlay
-        rect = qtc.QRect(top_left, bottom_right).adjusted(-2, -2, 2, 2)  # tiny padding
-        self.window.setGeometry(rect)
-        self.window.show()
-        self.window.raise_()  # Bring to front
+        rect = qtc.QRect(0, top, self.row_width(), bottom - top).adjusted(-2, -2, 2, 2)  # tiny padding
+        if rect != self.window.geometry():
+            self.window.setGeometry(rect)
+        if self.window.isHidden():
+            # new rows raise the overlays themselves (update_rows), so the stacking only changes here
+            self.window.show()
+            self.window.raise_()  # Bring to front
+            self.packets.raise_()  # Packets travel above the window overlay
+            self.scrollbar.raise_()
+
+    def start_run(self, seed:int = None) -> int:
+        """Seed the loss draws, start recording the trace and send the first window
+
+        Returns the seed of the run, a random one when `seed` is None
+        """
+        self.seed = random.randrange(2**31) if seed is None else seed
+        self.rng = random.Random(self.seed)
+        self.run_start = self.clock.now()
+        self.close_trace()
+        self.metrics = Metrics(self.window_size, self.num_packets)
+        config = self.config()
+        self.link = Link.from_config(config, self.rng)
+        self.data_losses, self.ack_losses = loss_streams(config, self.seed)
+        self.trace = TraceWriter(tempfile.TemporaryFile(), {"source": "gui", "seed": self.seed,
+                                                            "config": asdict(config)})
+        self.clock.call_later(0, self.begin_run)
+        return self.seed
+
+    def begin_run(self):
+        """Send the first window from a clock callback, so every send is timed from the same instant"""
+        self.run_start = self.clock.now()
+        self.send_packets()
+
+    def run_time(self) -> float:
+        """Simulated seconds since the current run started"""
+        return (self.clock.now() - self.run_start) / 1000
+
+    def record(self, kind:int, seq:int, value:int = 0, cause:int = 0):
+        """Count an event of the current run and append it to its trace, stamped with the simulated time"""
+        time = self.run_time()
+        self.metrics(time, kind, seq, value, cause)
+        if self.trace is not None:
+            self.trace(time, kind, seq, value, cause)
+
+    def record_at(self, time:float, kind:int, seq:int, value:int = 0, cause:int = 0):
+        """record() for an event at an explicit run time (seconds), used by skip-to-end"""
+        self.metrics(time, kind, seq, value, cause)
+        if self.trace is not None:
+            self.trace(time, kind, seq, value, cause)
+
+    def save_trace(self, path:str) -> bool:
+        """Copy the trace recorded so far to `path`, False if no run was started"""
+        if self.trace is None:
+            return False
+        self.trace.flush()
+        recording = self.trace.file
+        position = recording.tell()
+        recording.seek(0)
+        with open(path, "wb") as out:
+            shutil.copyfileobj(recording, out)
+        recording.seek(position)
+        return True
+
+    def close_trace(self):
+        if self.trace is not None:
+            self.trace.close()
+            self.trace.file.close()  # temporary file, deleted on close
+            self.trace = None
+
+    def load_replay(self, path:str) -> TraceReader:
+        """Open a saved trace: apply its settings and freeze the clock, show_replay() picks the time"""
+        reader = TraceReader(path)
+        config = reader.config
+        self.reset()
+        self.set_seq_bits(0)  # any window fits while the trace's settings are applied
+        self.changeSliders(round(config.prop_delay*10), round(config.re_timer*10), config.per_pkt_loss,
+                           config.window_size, config.num_packets)
+        self.set_protocol(config.protocol)
+        self.set_seq_bits(config.seq_bits)
+        self.set_link(config.bandwidth, config.packet_size, config.queue_limit, config.queue_policy)
+        self.set_loss(config.data_loss, config.ack_loss)
+        self.setPackets()
+        self.seed = reader.metadata.get("seed")
+        self.replay_trace = reader
+        self.clock.set_speed(0)  # replayed packets stay where the trace puts them
+        return reader
+
+    def show_replay(self, time:float):
+        """Show the opened trace as it was `time` simulated seconds into the run"""
+        state = replay(self.replay_trace, time)
+        self.metrics = Metrics.from_trace(self.replay_trace, time)
+        self.protocol.base, self.protocol.expected = state.base, state.expected
+        self.states.set_progress(state.base, state.expected)
+        for index in self.rows:
+            self.refresh_row(index)
+        self.draw_window(self.base)
+
+        # packets on the link, placed where they were at that time
+        self.packets.clear()
+        duration = self.prop_delay*100
+        for pkt in state.in_flight:
+            sender, reciever = self.pair_points(pkt.seq)
+            elapsed = (state.time - pkt.departed) * 1000
+            if pkt.is_ack:
+                self.packets.spawn("ACK #"+str(pkt.value), reciever, sender, duration, elapsed=elapsed)
+            else:
+                self.packets.spawn(f"Packet#{pkt.seq+1}", sender, reciever, duration, elapsed=elapsed)
+        return state
 
     def send_packets(self):
         """Send all packets within the current Go-Back-N window
-        
+
         This implements the core Go-Back-N behavior: send up to N packets
         without waiting for ACKs, where N is the window size
         """
         # Validate simulation state
-        if not self.items or self.windowSize <= 0:
+        if not self.states or self.window_size <= 0:
             return
 
-        # Calculate current window boundaries
-        start = max(0, min(self.base, self.num_packets - self.windowSize)) # get the start of the sending window
-        end = min(start + self.windowSize - 1, len(self.items) - 1) # get the end of the sending window
+        # Send every packet of the window that is not acknowledged or already in flight
+        for i in self.protocol.sendable():
+            self.send_later(i)
+
+    def send_later(self, index:int):
+        """Schedule send_packet(index) 50 ms after the previously queued packet, simulating transmission delay
+
+        Packets leave in the order they are queued, like in simulation.Simulator. On a
+        link with a bandwidth the packet is handed over right away and the link spaces it
+        """
+        now = self.clock.now()
+        if self.link is not None:
+            departure = now
+        else:
+            departure = max(now, self.next_departure)
+            self.next_departure = departure + 50
+        self.clock.call_later(departure - now, lambda: self.send_packet(index))
+
+    @profiled("send_packet")
+    def send_packet(self, index:int):
+        """Send packet `index` from sender to receiver with Go-Back-N protocol behavior"""
+        states = self.states
+        if states.isActive[index]:
+            if not states.sending[index]:
+                states.sending[index] = 1
+                prop_delay = self.prop_delay *.1 # get proper propagation delay
+
+                # Go-Back-N runs one timer for the window, start it if nothing is outstanding yet
+                if self.protocol.per_packet_timers:
+                    self.start_timer(index)  # Selective Repeat times every packet on its own
+                elif not self.clock.active(RETRANSMIT):
+                    self.start_timer()
+
+                # A full link queue refuses the packet before it reaches the wire
+                wait = 0  # ms the packet queues for the link
+                duration = prop_delay*1000  # ms from leaving the queue to reaching the receiver
+                if self.link is not None:
+                    now = self.run_time()
+                    start = self.link.admit(now)
+                    if start is None:
+                        self.record(SEND, index)
+                        self.record(PKT_DROP, index, 0, DROP_QUEUE)
+                        return
+                    wait = (start - now)*1000
+                    duration += self.link.transmission_delay*1000
+
+                # Simulate packet loss based on user-defined probability or manual setting
+                if self.data_losses is not None:
+                    lost = self.data_losses() # next decision of the loss model
+                else:
+                    lost = self.rng.randint(1,100) <= self.per_pkt_loss
+                manual = states.pktLose[index]
+                should_drop = lost or manual # determine if the packet should be dropped
+                cause = DROP_MANUAL if manual else DROP_RANDOM
+                if should_drop:
+                    # Reset manual loss setting after packet is dropped
+                    if manual:
+                        self.clock.call_later(prop_delay*1000/3, lambda: self.setSenderBack(index))
+
+                # Launch the packet (propagation delay simulation), dropped packets die halfway along the wire
+                def launch():
+                    start, end = self.pair_points(index)
+                    self.packets.spawn(f"Packet#{index+1}", start, end, duration,
+                                       on_arrival=lambda pkt: self.packet_arrived(index, pkt),
+                                       drop_at=1 - prop_delay*500/duration if should_drop else None,
+                                       on_lost=lambda pkt: self.packet_lost(index, pkt, cause))
+                if wait:
+                    self.clock.call_later(wait, launch)
+                else:
+                    launch()
+                self.record(SEND, index)
+
+    def send_ACK(self, index:int, ack_num:int):
+        """Send ACK packet from receiver `index` back to its sender (Go-Back-N acknowledgment)
+
+        Args:
+            index: pair whose receiver answers
+            ack_num: Acknowledgment number being sent
+        """
+        states = self.states
+        states.sending[index] = 1
 
-        # Send all packets in the current window with staggered timing
-        for i in range(start, end + 1):
-            # Add small delay between each packet sent to simulate transmission delay
-            qtc.QTimer.singleShot((50 * (i % self.windowSize)), lambda i=i: self.items[i].send_packet(self.prop_delay, self.re_timer, self.per_pkt_loss))
-        
-                
+        # Update receiver appearance when sending ACK (only if not already completed)
+        if self.protocol.has_received(index):
+            if states.reciever[index] != RecieverState.DONE: # a finished receiver is only sending a duplicate ACK
+                states.reciever[index] = RecieverState.ACKED # turn reciever light blue to show it sent an ACK
+                self.refresh_row(index)
+
+        prop_delay = self.prop_delay *.1 # get proper propagation delay
+
+        # Simulate ACK loss (ACKs can also be lost in networks)
+        if self.ack_losses is not None:
+            lost = self.ack_losses() # next decision of the loss model
+        else:
+            lost = self.rng.randint(1,100) <= self.per_pkt_loss
+        manual = states.ACKLose[index]
+        should_drop = lost or manual # determine if the packet should be dropped
+        cause = DROP_MANUAL if manual else DROP_RANDOM
+        if should_drop:
+            # Reset manual ACK loss setting after ACK is dropped
+            if manual:
+                self.clock.call_later(prop_delay*1000/3, lambda: self.setReceiverBack(index))
+
+        # Launch the ACK (same timing as data packets), dropped ACKs die halfway
+        sender, reciever = self.pair_points(index)
+        self.packets.spawn("ACK #"+str(ack_num-1), reciever, sender, prop_delay*1000, # send the correct ACK
+                           on_arrival=lambda pkt: self.receivedACK(index, ack_num, pkt),
+                           drop_at=.5 if should_drop else None,
+                           on_lost=lambda pkt: self.ACK_lost(index, ack_num, pkt, cause))
+
+    def setReceiverBack(self, index:int):
+        """Reset receiver to normal state after manual ACK loss"""
+        states = self.states
+        states.ACKLose[index] = 0
+        if states.reciever[index] != RecieverState.ACKED:
+            states.reciever[index] = RecieverState.READY
+            self.refresh_row(index)
+
+    def setSenderBack(self, index:int):
+        """Reset sender to normal state after manual packet loss"""
+        states = self.states
+        states.pktLose[index] = 0
+        states.sender[index] = SenderState.READY
+        self.refresh_row(index)
+
+    def packet_arrived(self, index:int, pkt):
+        """Handle packet arrival at receiver - triggers ACK generation"""
+        if not pkt.killed:  # Only process if packet wasn't lost
+            self.on_packet_arrived(index+1)
+
+    def packet_lost(self, index:int, pkt, cause:int):
+        """Record a data packet that was dropped on the link or clicked away"""
+        if pkt.user_killed:
+            self.record(USER_KILL, index, 0)
+        else:
+            self.record(PKT_DROP, index, 0, cause)
+
+    def ACK_lost(self, index:int, ack_num:int, pkt, cause:int):
+        """Record an ACK that was dropped on the link or clicked away"""
+        if pkt.user_killed:
+            self.record(USER_KILL, index, 1)
+        else:
+            self.record(ACK_DROP, index, ack_num-1, cause)
+
+    def receivedACK(self, index:int, ack_num:int, pkt):
+        """Handle ACK arrival at sender - completes Go-Back-N handshake"""
+        if not pkt.killed:  # Only process if ACK wasn't lost
+            self.on_ACK_arrived(ack_num, index+1)
+
+    def start_timer(self, seq:int = None):
+        """(Re)start the retransmission timer for the oldest unacknowledged packet, or for packet `seq`"""
+        key = RETRANSMIT if seq is None else (RETRANSMIT, seq)
+        self.clock.call_later(self.re_timer*100, lambda: self.on_timeout(seq), key=key)
+
+    def stop_timer(self, seq:int = None):
+        """Stop the retransmission timer, nothing is outstanding (or packet `seq` is acknowledged)"""
+        self.clock.cancel(RETRANSMIT if seq is None else (RETRANSMIT, seq))
+
+    @profiled("on_timeout")
+    def on_timeout(self, seq:int = None):
+        """Handle the retransmission timer expiring - go back N and resend every outstanding packet
+
+        With per-packet timers `seq` is the packet whose timer expired, and only it is resent
+        """
+        self.record(TIMEOUT, self.base if seq is None else seq)
+        self.start_timer(seq)
+        for i in self.protocol.timeout(seq):
+            self.states.sending[i] = 0  # Reset sending state so the packet can go out again
+            self.send_later(i)
+
+    @profiled("on_packet_arrived")
     def on_packet_arrived(self, sender_num:int):
         """Handle packet arrival at receiver - implements Go-Back-N ACK logic
-        
+
         In Go-Back-N, receiver only accepts packets in order and ACKs
         the highest in-order packet received
-        
+
         Args:
             sender_num: Sequence number of the arrived packet
         """
-        # Go-Back-N: only advance expected ACK if packet is in order
-        if sender_num == self.cur_ACK:
-            self.cur_ACK += 1  # Advance to next expected packet
+        # Go-Back-N: the receiver only advances on the next in-order packet
+        expected = self.protocol.packet_arrived(sender_num-1)
+        self.record(PKT_ARRIVE, sender_num-1, expected)
         # Always ACK the highest in-order packet received (cumulative ACK)
-        self.items[sender_num-1].send_ACK(self.prop_delay, self.per_pkt_loss, self.cur_ACK)
-    
+        self.send_ACK(sender_num-1, expected+1)
+
+    @profiled("on_ACK_arrived")
     def on_ACK_arrived(self, ACK_num:int, sender_num:int):
         """Handle ACK arrival at sender - implements Go-Back-N window sliding
-        
+
         In Go-Back-N, ACKs are cumulative. An ACK for packet N acknowledges
         all packets up to and including N. Window slides forward accordingly.
-        
+
         Args:
             ACK_num: Acknowledgment number received
             sender_num: Sender that received the ACK
         """
-        # Check if this ACK advances the window (acknowledges packets)
-        if ACK_num >= sender_num + 1:
-            # Slide window forward (Go-Back-N window advancement)
-            if sender_num > self.base:
-                self.base = sender_num 
-            qtc.QTimer.singleShot(50, lambda: self.draw_window(self.base))  # Update window visualization
-            
-            # Mark acknowledged sender-receiver pairs as completed
-            for i in range(sender_num):
-                self.items[i].isActive = False
-                self.items[i].pb_sender.setStyleSheet(u"QPushButton#pb_sender {\n"
-    "    background-color: blue;\n"
-    "    border-style: outset;\n"
-    "    border-width: 2px;\n"
-    "    border-radius: 10px;\n"
-    "    border-color: beige;\n"
-    "    font: bold 14px;\n"
-    "    min-width: 10em;\n"
-    "    padding: 6px;\n"
-    "}\n"
-    "QPushButton#pb_sender:pressed {\n"
-    "    background-color: rgb(0, 224, 0);\n"
-    "    border-style: inset;\n"
-    "}")
-                self.items[i].pb_reciever.setStyleSheet(u"QPushButton#pb_reciever {\n"
-    "    background-color: blue;\n"
-    "    border-style: outset;\n"
-    "    border-width: 2px;\n"
-    "    border-radius: 10px;\n"
-    "    border-color: beige;\n"
-    "    font: bold 14px;\n"
-    "    min-width: 10em;\n"
-    "    padding: 6px;\n"
-    "}\n"
-    "")
+        self.record(ACK_ARRIVE, sender_num-1, ACK_num-1)
+        # Slide window forward if this ACK acknowledges new packets (Go-Back-N window advancement)
+        base = self.base
+        newly_acked = self.protocol.ack_arrived(ACK_num-1, sender_num-1)
+        if newly_acked:
+            slid = self.base != base  # Selective Repeat can acknowledge packets above the base
+            if slid:
+                self.record(WINDOW_SLIDE, self.base)
+            if self.protocol.done:
+                self.run_finished.emit()
+            self.schedule_window()  # Update window visualization, once for a burst of ACKs
+
+            # Mark acknowledged sender-receiver pairs as completed, only the newly acknowledged ones change
+            self.states.complete(newly_acked)
+            self.refresh_rows(newly_acked)
             # Send next packet(s) in the new window
-            self.send_packets()
-    
+            if slid:
+                self.send_packets()
+            # Restart the timer for the new oldest packet, or stop it once nothing is outstanding
+            if self.protocol.per_packet_timers:
+                for i in newly_acked:
+                    self.stop_timer(i)
+            elif self.protocol.timer_needed:
+                self.start_timer()
+            else:
+                self.stop_timer()
+
+    def set_speed(self, speed:float):
+        """Scale every animation and timer by `speed` (simulated seconds per real second)"""
+        self.speed = speed
+        if self.replay_trace is None:
+            self.clock.set_speed(speed)
+
+    def skip_to_end(self) -> SimResult:
+        """Finish the remaining run headlessly and show its final state
+
+        Packets in flight are abandoned and the Simulator resends them from the
+        current protocol state, using the panel's settings and a seed drawn from
+        the run's generator. Its events continue the trace. Returns None when
+        the run cannot finish (100% loss).
+        """
+        if self.protocol.done or not self.states or self.replay_trace is not None:
+            return None
+        simulator = Simulator(self.config(), seed=self.rng.randrange(2**31), protocol=self.protocol)
+        if max(simulator.loss_rates()) >= 1:
+            return None
+        self.clear_active_packets()
+        self.protocol.abandon_in_flight()
+        offset = (self.clock.now() - self.run_start) / 1000  # the simulator starts its clock at 0
+        simulator.observers.append(lambda time, kind, seq, value, cause: self.record_at(offset + time, kind, seq, value, cause))
+        result = simulator.run()
+
+        # every pair is acknowledged now
+        self.states.complete(range(len(self.states)))
+        for index in self.rows:
+            self.refresh_row(index)
+        self.draw_window(self.base)
+        self.run_finished.emit()
+        return result
+
     def clear_active_packets(self):
-        """Clean up any active packet animations before resetting simulation"""
-        # Find and delete all Packet widgets that are children of this panel
-        for child in self.findChildren(Packet):
-            child.deleteLater()
-    
+        """Clean up any active packet animations and pending timers before resetting simulation"""
+        self.clock.clear()
+        self.packets.clear()
+        self.next_departure = 0.0  # nothing is queued any more
+
     def resizeEvent(self, event):
-        """Handle window resize - redraw sliding window overlay to match new layout"""
+        """Handle window resize - re-layout the visible rows and redraw sliding window overlay"""
         super().resizeEvent(event)
-        # Redraw window after brief delay to ensure layout is complete
-        qtc.QTimer.singleShot(50, lambda: self.draw_window(self.base))
+        self.update_scroll_range()
+        self.update_rows()
+        self.packets.fit(self.rect(), self.scrollbar.value())  # Packet overlay always covers the whole panel
+        # The window is placed from the row pitch like the rows above, so it follows them in the same frame
+        self.draw_window(self.base)
@@ -6,6 +6,10 @@ from PySide6 import QtWidgets as qtw
 from PySide6 import QtGui as qtg
 
 from ui.settings_window_ui import Ui_w_settings
+from simulation.Protocols import PROTOCOLS, max_window_size
+
+QUEUE_POLICY_NAMES = {"tail": "Tail Drop", "red": "RED"}  # simulation.Link.QUEUE_POLICIES as shown in the box
+LOSS_MODEL_NAMES = {"independent": "Independent", "bursty": "Bursty (Gilbert-Elliott)", "trace": "Loss Trace"}
 
 class SettingsWindow(qtw.QWidget, Ui_w_settings):
     """Settings panel for configuring Go-Back-N simulation parameters"""
@@ -16,6 +20,10 @@ class SettingsWindow(qtw.QWidget, Ui_w_settings):
     changed_per_pkt_loss = qtc.Signal(int)  # Packet loss percentage changed
     changed_window_size = qtc.Signal(int)   # Sender window size changed
     changed_num_packets = qtc.Signal(int)   # Total packet count changed
+    changed_protocol = qtc.Signal(str)      # ARQ protocol changed (a key of PROTOCOLS)
+    changed_seq_bits = qtc.Signal(int)      # Bits of the sequence number field changed, 0 for unbounded
+    changed_link = qtc.Signal(float, int, int, str)  # Bandwidth (bytes/s), packet size, queue limit or policy changed
+    changed_loss = qtc.Signal(str, str)     # Data and ACK loss model specs (simulation.LossModel) changed
     
     def __init__(self):
         super().__init__()
@@ -47,7 +55,7 @@ class SettingsWindow(qtw.QWidget, Ui_w_settings):
         self.spin_K.setValue(10)  # Initial total packets (K)
 
         # Set valid ranges for protocol parameters
-        self.spin_K.setRange(1, 20) # allow user to have a maximum of 20 packets minimum of 1
+        self.spin_K.setRange(1, 999999) # the panel only builds visible rows, so K can go to six digits
         self.spin_R.setRange(1, 10) # initialize the max window range to the initial K value
 
         # Connect spinbox changes to validation and signal emission
@@ -55,6 +63,55 @@ class SettingsWindow(qtw.QWidget, Ui_w_settings):
         self.spin_K.valueChanged.connect(lambda: self.changed_num_packets.emit(self.spin_K.value()))
         self.spin_R.valueChanged.connect(lambda: self.changed_window_size.emit(self.spin_R.value()))
 
+        # Protocol choice, Go-Back-N first so it stays the default
+        for key, protocol in PROTOCOLS.items():
+            self.cb_protocol.addItem(protocol.name, key)
+        self.cb_protocol.currentIndexChanged.connect(self.update_spin_R_max)  # clamp R before the protocol sees it
+        self.cb_protocol.currentIndexChanged.connect(lambda: self.changed_protocol.emit(self.cb_protocol.currentData()))
+
+        # Sequence number field, unbounded by default
+        self.spin_seq_bits.setRange(0, 16)
+        self.spin_seq_bits.setSuffix(" bits")
+        self.spin_seq_bits.setSpecialValueText("Unbounded")
+        self.spin_seq_bits.valueChanged.connect(self.update_spin_R_max)
+        self.spin_seq_bits.valueChanged.connect(lambda: self.changed_seq_bits.emit(self.spin_seq_bits.value()))
+
+        # Bottleneck link, unlimited by default so packets keep their fixed send stagger
+        self.spin_bandwidth.setRange(0, 100000)
+        self.spin_bandwidth.setSuffix(" kB/s")
+        self.spin_bandwidth.setSpecialValueText("Unlimited")
+        self.spin_packet_size.setRange(1, 65535)
+        self.spin_packet_size.setSuffix(" B")
+        self.spin_packet_size.setValue(1000)
+        self.spin_queue_limit.setRange(0, 10000)
+        self.spin_queue_limit.setSpecialValueText("Unbounded")
+        for key, name in QUEUE_POLICY_NAMES.items():
+            self.cb_queue_policy.addItem(name, key)
+        self.cb_queue_policy.setEnabled(False)  # RED needs a queue limit
+        self.spin_bandwidth.valueChanged.connect(self.update_link)
+        self.spin_packet_size.valueChanged.connect(self.update_link)
+        self.spin_queue_limit.valueChanged.connect(self.update_link)
+        self.cb_queue_policy.currentIndexChanged.connect(self.update_link)
+
+        # Loss model, the loss slider sets its average rate
+        self.loss_trace_path = "" # file replayed by the Loss Trace model
+        for key, name in LOSS_MODEL_NAMES.items():
+            self.cb_loss_model.addItem(name, key)
+        self.spin_burst_length.setRange(1, 100)
+        self.spin_burst_length.setValue(4)
+        self.spin_burst_length.setPrefix("burst ")
+        self.spin_burst_length.setSuffix(" pkts")
+        self.spin_burst_length.setEnabled(False)  # only bursty losses have a burst length
+        self.spin_ack_loss.setRange(-1, 100)
+        self.spin_ack_loss.setValue(-1)
+        self.spin_ack_loss.setSuffix("%")
+        self.spin_ack_loss.setSpecialValueText("Same as data")
+        self.sl_pkt_loss_per.valueChanged.connect(self.update_loss)
+        self.cb_loss_model.currentIndexChanged.connect(self.update_loss)
+        self.spin_burst_length.valueChanged.connect(self.update_loss)
+        self.spin_ack_loss.valueChanged.connect(self.update_loss)
+        self.pb_loss_trace.clicked.connect(self.load_loss_trace)
+
     # Slider update functions - convert slider values to display format and emit signals
     
     def update_prop_delay(self):
@@ -78,14 +135,46 @@ class SettingsWindow(qtw.QWidget, Ui_w_settings):
         self.lbl_pkt_loss_per.setText(str(self.sl_pkt_loss_per.value())+"%")
         self.changed_per_pkt_loss.emit(self.sl_pkt_loss_per.value())
 
+    def update_link(self):
+        """Emit the link settings, an unbounded queue can only tail drop"""
+        self.cb_queue_policy.setEnabled(self.spin_queue_limit.value() > 0)
+        policy = self.cb_queue_policy.currentData() if self.spin_queue_limit.value() > 0 else "tail"
+        self.changed_link.emit(self.spin_bandwidth.value() * 1000, self.spin_packet_size.value(),
+                               self.spin_queue_limit.value(), policy)
+
+    def load_loss_trace(self):
+        """Pick a file of 0/1 loss decisions and switch to the Loss Trace model"""
+        path, _ = qtw.QFileDialog.getOpenFileName(self, "Load Loss Trace", "", "Loss traces (*.txt *.csv);;All files (*)")
+        if not path:
+            return
+        self.loss_trace_path = path
+        self.pb_loss_trace.setToolTip(path)
+        self.cb_loss_model.setCurrentIndex(self.cb_loss_model.findData("trace"))
+        self.update_loss()
+
+    def update_loss(self):
+        """Emit the loss model specs of data packets and ACKs"""
+        model = self.cb_loss_model.currentData()
+        self.spin_burst_length.setEnabled(model == "bursty")
+        if model == "bursty":
+            data = f"gilbert-elliott:{self.sl_pkt_loss_per.value()}:{self.spin_burst_length.value()}"
+        elif model == "trace" and self.loss_trace_path:
+            data = f"trace:{self.loss_trace_path}"
+        else:
+            data = "" # independent losses at the slider's rate
+        ack = "" if self.spin_ack_loss.value() < 0 else f"bernoulli:{self.spin_ack_loss.value()}"
+        self.changed_loss.emit(data, ack)
+
     def update_spin_R_max(self):
-        """Validate and update window size constraints when packet count changes
+        """Validate and update window size constraints when K, the protocol or the sequence bits change
         
-        In Go-Back-N protocol, window size (R) cannot exceed total packets (K)
+        In Go-Back-N protocol, window size (R) cannot exceed total packets (K), nor
+        2^k - 1 with k-bit sequence numbers (2^(k-1) for Selective Repeat)
         This function enforces that constraint and updates the UI accordingly
         """
-        # if changing the K value makes the current R value impossible, update it
-        if(self.spin_R.value() > self.spin_K.value()):
-            self.spin_R.setValue(self.spin_K.value())  # Clamp R to valid range
-        self.spin_R.setMaximum(self.spin_K.value()) # change window max size to the number of packets in the sim
+        limit = max_window_size(self.cb_protocol.currentData() or "gbn", self.spin_K.value(), self.spin_seq_bits.value())
+        # if the new limit makes the current R value impossible, update it
+        if(self.spin_R.value() > limit):
+            self.spin_R.setValue(limit)  # Clamp R to valid range
+        self.spin_R.setMaximum(limit) # change window max size to what the settings allow
         
@@ -0,0 +1,104 @@
+# SimClock is the simulated time base of the GUI, every animation and protocol timer reads it
+# Changing the speed multiplier rescales all pending durations at once instead of per QTimer
+
+import itertools
+import math
+
+from PySide6 import QtCore as qtc
+
+from simulation.TimerManager import TimerManager
+
+INSTANT = 1e6  # speed multiplier used for "instant": every delay collapses to the next event loop pass
+SPEEDS = (0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 25.0, 100.0, INSTANT)  # choices offered by the speed box
+
+
+class SimClock(qtc.QObject):
+    """Scaled clock and callback scheduler for the GUI simulation
+
+    Simulated time (in ms) runs `speed` times faster than wall time. Delayed
+    callbacks are kept in a TimerManager keyed on simulated deadlines and a
+    single QTimer is armed for the earliest one, so a speed change re-arms
+    one timer and every pending delay follows the new multiplier.
+
+    While a callback runs, now() is its deadline rather than the wall clock,
+    so whatever it records or schedules is exact in simulated time even when
+    the event loop runs it late (which at high speeds is many simulated ms).
+    """
+
+    def __init__(self, parent:qtc.QObject = None):
+        super().__init__(parent)
+        self.speed = 1.0 # simulated ms per wall ms
+        self.wall = qtc.QElapsedTimer()
+        self.wall.start()
+        self._origin_wall = 0.0 # wall ms of the last speed change
+        self._origin_sim = 0.0 # simulated ms of the last speed change
+        self._event_time = None # deadline of the callback running right now
+
+        self.timers = TimerManager() # pending callbacks, deadlines in simulated ms
+        self._callbacks = {} # timer key -> callable
+        self._keys = itertools.count()
+        self._timer = qtc.QTimer(self) # one Qt timer armed for the earliest deadline
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._fire)
+
+    def now(self) -> float:
+        """Current simulated time in ms"""
+        if self._event_time is not None:
+            return self._event_time
+        return self._origin_sim + (self.wall.nsecsElapsed() / 1e6 - self._origin_wall) * self.speed
+
+    def set_speed(self, speed:float):
+        """Change the multiplier without making simulated time jump, 0 freezes the clock"""
+        now = self.now()
+        self._origin_wall = self.wall.nsecsElapsed() / 1e6
+        self._origin_sim = now
+        self.speed = speed
+        self._arm()
+
+    def call_later(self, delay:float, callback, key=None):
+        """Run `callback` after `delay` simulated ms and return its key
+
+        Passing the key of a pending callback replaces it (restarts the timer)
+        """
+        if key is None:
+            key = next(self._keys)
+        self.timers.start(key, self.now() + delay)
+        self._callbacks[key] = callback
+        self._arm()
+        return key
+
+    def active(self, key) -> bool:
+        return self.timers.active(key)
+
+    def cancel(self, key):
+        """Drop a pending callback if it has not run yet"""
+        self.timers.cancel(key)
+        self._callbacks.pop(key, None)
+        self._arm()
+
+    def clear(self):
+        """Drop every pending callback"""
+        self.timers.clear()
+        self._callbacks.clear()
+        self._timer.stop()
+
+    def _arm(self):
+        deadline = self.timers.next_deadline()
+        if deadline is None or self.speed == 0:
+            self._timer.stop()
+        else:
+            self._timer.start(max(0, math.ceil((deadline - self.now()) / self.speed)))
+
+    def _fire(self):
+        """Run the callbacks that are due, earliest first, each at its own deadline, then re-arm"""
+        now = self.now()
+        while (due := self.timers.pop_next(now)) is not None:
+            key, deadline = due
+            callback = self._callbacks.pop(key, None)
+            if callback is not None:
+                self._event_time = deadline
+                try:
+                    callback()
+                finally:
+                    self._event_time = None
+        self._arm()
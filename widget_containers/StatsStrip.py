@@ -0,0 +1,93 @@
+# StatsStrip shows the live counters of the current run above the simulation panel, next to the model's prediction
+# It polls the panel's Metrics a few times per second instead of reacting to every event
+
+from PySide6 import QtCore as qtc
+from PySide6 import QtWidgets as qtw
+from PySide6 import QtGui as qtg
+
+from simulation.Analytics import compare
+
+REFRESH_MS = 250  # wall ms between refreshes, counters are only read, never pushed
+MODEL_STYLE = 'QLabel[diverges="true"] { color: #c0392b; font-weight: bold; }'
+
+
+class StatsStrip(qtw.QWidget):
+    """Summary of the run's Metrics with an export button
+
+    A second line shows the goodput and retransmission cost the analytical
+    model predicts for the current settings, and turns red once the run has
+    settled and diverges from it.
+
+    Args:
+        panel: the SenderRecieverPanel whose `metrics` are shown
+    """
+
+    export_clicked = qtc.Signal()
+
+    def __init__(self, panel:qtw.QWidget, parent:qtw.QWidget = None):
+        super().__init__(parent)
+        self.panel = panel
+        self._shown = None # (metrics, events, config) last drawn, skips refreshes when nothing changed
+
+        grid = qtw.QGridLayout(self)
+        grid.setContentsMargins(0, 0, 0, 0)
+        self.lb_stats = qtw.QLabel(self)
+        self.lb_stats.setTextInteractionFlags(qtc.Qt.TextSelectableByMouse)
+        self.lb_model = qtw.QLabel(self)
+        self.lb_model.setStyleSheet(MODEL_STYLE)
+        self.pb_export = qtw.QPushButton("Export Metrics", self)
+        self.pb_export.clicked.connect(self.export_clicked)
+        grid.addWidget(self.lb_stats, 0, 0)
+        grid.addWidget(self.lb_model, 1, 0)
+        grid.addWidget(self.pb_export, 0, 1, 2, 1)
+        grid.setColumnStretch(0, 1)
+
+        self.timer = qtc.QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(REFRESH_MS)
+        panel.run_finished.connect(self.refresh) # final numbers without waiting for the next tick
+        self.refresh()
+
+    def refresh(self):
+        m = self.panel.metrics
+        config = self.panel.config()
+        if self._shown == (m, m.events, config):
+            return
+        self._shown = (m, m.events, config)
+        drops = lambda d: f"{d['random']}/{d['manual']}/{d['user']}"
+        rtt = f"{m.rtt.mean:.2f}s (p95 {m.rtt.percentile(95):.2f}s)" if m.rtt.count else "-"
+        link = self.panel.link
+        link_text = "" if link is None else (
+            f"   link {link.utilisation(m.now):.0%} busy, queue delay {link.mean_queue_delay:.2f}s"
+            f" (max {link.max_queue_delay:.2f}s)")
+        self.lb_stats.setText(
+            f"t {m.elapsed:.1f}s   sent {m.sends} (retx {m.retransmissions})   "
+            f"delivered {m.deliveries} (dup {m.duplicates}, ooo {m.out_of_order})   "
+            f"drops pkt {drops(m.pkt_drops)}/{m.pkt_drops['queue']} ack {drops(m.ack_drops)}   "
+            f"timeouts {m.timeouts}   RTT {rtt}   "
+            f"goodput {m.goodput:.2f}/s   window {m.utilisation:.0%}" + link_text)
+        self.lb_stats.setToolTip("drops are random/manual/user (/queue for packets), ooo: discarded out of order")
+        self.show_model(config, m)
+
+    def show_model(self, config, metrics):
+        """Predicted against observed goodput and transmissions per packet"""
+        try:
+            config.validate()
+            c = compare(config, metrics)
+        except ValueError:
+            self.lb_model.setText("model: -")
+            self.lb_model.setProperty("diverges", False)
+            self.lb_model.style().polish(self.lb_model)
+            return
+        p = c.predicted
+        text = f"model goodput {p.goodput:.2f}/s ({p.efficiency:.0%} of lossless), {p.transmissions:.2f} sends per packet"
+        if c.settled:
+            text += f"   observed {c.goodput:.2f}/s, {c.transmissions:.2f} sends per packet ({-c.error:+.0%})"
+        if not p.valid:
+            text += "   timer shorter than a round trip, outside the model"
+        elif c.diverges:
+            text += "   diverges from theory"
+        self.lb_model.setText(text)
+        if self.lb_model.property("diverges") != c.diverges:
+            self.lb_model.setProperty("diverges", c.diverges)
+            self.lb_model.style().polish(self.lb_model)